@@ -0,0 +1,145 @@
+"""
+Registro de accesos estructurado y con búfer para los servidores del apartado 2a.
+
+BaseHTTPRequestHandler.log_message formatea una línea y la escribe en stderr
+en el mismo hilo que atiende la petición. AccessLog, en cambio, solo añade un
+registro (método, ruta, estado, bytes, duración en microsegundos) a un búfer
+en memoria de tamaño fijo; un hilo en segundo plano lo vacía por lotes y
+escribe cada lote con una sola llamada, una línea JSON por petición.
+
+- Si el búfer está lleno, el registro se descarta y se cuenta en 'dropped':
+  la petición nunca espera a que se escriba el registro.
+- Con sample_rate < 1 solo se guarda esa fracción de las respuestas
+  correctas; las respuestas con error (>= 400) se guardan siempre.
+"""
+
+import atexit
+import collections
+import json
+import os
+import random
+import sys
+import threading
+import time
+
+
+class AccessLog:
+    """
+    Registro de accesos con búfer circular y escritura por lotes en segundo plano.
+
+    Se activa pasando una instancia (o True) a make_server(access_log=...).
+    Los procesos hijos del modo processes=N arrancan su propio hilo de
+    escritura la primera vez que registran una petición.
+    """
+
+    def __init__(self, stream=None, capacity=10000, batch_size=512,
+                 flush_interval=0.5, sample_rate=1.0):
+        self.stream = stream if stream is not None else sys.stderr
+        self.capacity = capacity
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.sample_rate = sample_rate
+        self.written = 0
+        self.dropped = 0
+        self.sampled_out = 0
+        self._pid = None
+        self._random = random.Random()
+        # Las primeras peticiones pueden llegar a la vez por varios hilos: solo
+        # uno debe crear el búfer y el hilo de escritura
+        self._start_lock = threading.Lock()
+        if hasattr(os, 'register_at_fork'):
+            os.register_at_fork(after_in_child=self._after_fork)
+        atexit.register(self.close)
+
+    def _after_fork(self):
+        # El cerrojo puede haberse copiado tomado por otro hilo del padre
+        self._start_lock = threading.Lock()
+
+    def _start(self):
+        """
+        Crea el búfer y el hilo de escritura del proceso actual
+        """
+        self._buffer = collections.deque()
+        self._wakeup = threading.Event()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name='access-log', daemon=True)
+        self._thread.start()
+        # El último: los demás hilos no usan el búfer hasta que _pid es el del proceso
+        self._pid = os.getpid()
+
+    def record(self, client, method, path, status, size, duration_us):
+        """
+        Añade el registro de una petición al búfer, sin bloquear
+        """
+        if self._pid != os.getpid():
+            with self._start_lock:
+                if self._pid != os.getpid():
+                    self._start()
+        if status < 400 and self.sample_rate < 1 and self._random.random() >= self.sample_rate:
+            self.sampled_out += 1
+            return
+        if len(self._buffer) >= self.capacity:
+            self.dropped += 1
+            return
+        self._buffer.append((time.time(), client, method, path, status, size, duration_us))
+        if len(self._buffer) >= self.batch_size:
+            self._wakeup.set()
+
+    def _run(self):
+        while not self._closed:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            self.flush()
+
+    def flush(self):
+        """
+        Escribe todos los registros pendientes, por lotes de batch_size
+        """
+        if self._pid != os.getpid():
+            return
+        buffer = self._buffer
+        while buffer:
+            lines = []
+            while buffer and len(lines) < self.batch_size:
+                lines.append(self.format(*buffer.popleft()))
+            try:
+                self.stream.write(''.join(lines))
+                self.stream.flush()
+            except (OSError, ValueError):
+                # Flujo cerrado: se descartan los registros de este lote
+                self.dropped += len(lines)
+                continue
+            self.written += len(lines)
+
+    def format(self, timestamp, client, method, path, status, size, duration_us):
+        """
+        Convierte un registro en una línea JSON
+        """
+        return json.dumps({
+            'time': time.strftime('%Y-%m-%dT%H:%M:%S', time.gmtime(timestamp)) + f'.{int(timestamp % 1 * 1000):03d}Z',
+            'client': client,
+            'method': method,
+            'path': path,
+            'status': status,
+            'bytes': size,
+            'duration_us': duration_us,
+        }, separators=(',', ':')) + '\n'
+
+    def stats(self):
+        """
+        Contadores del registro: escritos, pendientes, descartados y no muestreados
+        """
+        pending = len(self._buffer) if self._pid == os.getpid() else 0
+        return {'written': self.written, 'pending': pending,
+                'dropped': self.dropped, 'sampled_out': self.sampled_out}
+
+    def close(self):
+        """
+        Detiene el hilo de escritura y escribe los registros pendientes
+        """
+        if self._pid != os.getpid() or self._closed:
+            return
+        self._closed = True
+        self._wakeup.set()
+        self._thread.join(1)
+        self.flush()
@@ -0,0 +1,80 @@
+import io
+import json
+import threading
+import time
+from access_log import AccessLog
+
+
+def test_records_are_written_as_json_lines():
+    """
+    Cada petición se escribe como una línea JSON al vaciar el búfer
+    """
+    stream = io.StringIO()
+    log = AccessLog(stream=stream, flush_interval=60)
+    log.record("127.0.0.1", "GET", "/product/1", 200, 39, 120)
+    assert stream.getvalue() == ""
+    log.close()
+    entry = json.loads(stream.getvalue())
+    assert entry["method"] == "GET"
+    assert entry["path"] == "/product/1"
+    assert entry["status"] == 200
+    assert entry["bytes"] == 39
+    assert entry["duration_us"] == 120
+    assert log.stats()["written"] == 1
+
+
+def test_full_buffer_drops_records():
+    """
+    Con el búfer lleno los registros nuevos se descartan y se cuentan
+    """
+    stream = io.StringIO()
+    log = AccessLog(stream=stream, capacity=3, batch_size=100, flush_interval=60)
+    for i in range(5):
+        log.record("127.0.0.1", "GET", f"/{i}", 200, 0, 1)
+    assert log.stats()["dropped"] == 2
+    log.close()
+    assert len(stream.getvalue().splitlines()) == 3
+
+
+def test_sampling_keeps_errors():
+    """
+    Con sample_rate = 0 solo se registran las respuestas con error
+    """
+    stream = io.StringIO()
+    log = AccessLog(stream=stream, sample_rate=0, flush_interval=60)
+    log.record("127.0.0.1", "GET", "/", 200, 11, 1)
+    log.record("127.0.0.1", "GET", "/nada", 404, 19, 1)
+    log.close()
+    lines = stream.getvalue().splitlines()
+    assert [json.loads(line)["status"] for line in lines] == [404]
+    assert log.stats()["sampled_out"] == 1
+
+
+def test_first_records_from_several_threads():
+    """
+    Si las primeras peticiones llegan a la vez por varios hilos, solo se crea
+    un búfer y no se pierde ningún registro
+    """
+    class SlowStart(AccessLog):
+        # Alarga el arranque para que los hilos coincidan en él
+        def _start(self):
+            time.sleep(0.01)
+            super()._start()
+
+    stream = io.StringIO()
+    log = SlowStart(stream=stream, flush_interval=60)
+    barrier = threading.Barrier(16)
+
+    def worker():
+        barrier.wait()
+        for _ in range(100):
+            log.record("127.0.0.1", "GET", "/", 200, 1, 1)
+
+    threads = [threading.Thread(target=worker) for _ in range(16)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    log.close()
+    assert log.stats()["written"] == 1600
+    assert len(stream.getvalue().splitlines()) == 1600
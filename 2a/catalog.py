@@ -0,0 +1,171 @@
+"""
+Catálogo de productos con índice por id para las APIs del apartado 2a.
+
+El catálogo envuelve la lista de productos del ejercicio (que sigue siendo la
+fuente de los datos) y mantiene un diccionario id -> producto, de forma que
+buscar un producto cuesta lo mismo con 3 productos que con un millón.
+
+También guarda en caché la representación codificada (bytes) de cada producto,
+para no serializar de nuevo los productos más consultados en cada petición, y
+el ETag y la fecha de última modificación de cada versión de un producto para
+responder a las peticiones condicionales (304 Not Modified). Las versiones
+comprimidas (gzip, deflate) de cada representación se guardan igual.
+"""
+
+import hashlib
+import json
+import threading
+import time
+from compression import compress
+
+
+class ProductCatalog:
+    """
+    Lista de productos con un índice por id siempre sincronizado.
+
+    Las altas, cambios y bajas deben hacerse con add(), update() y remove(),
+    que actualizan a la vez la lista y el índice. Si la lista se modifica
+    directamente (por ejemplo con products.append), el índice detecta que el
+    número de productos no coincide y se reconstruye en la siguiente consulta.
+
+    Las representaciones codificadas de cada producto se guardan con encoded()
+    y se descartan al modificar o eliminar el producto. Si un producto se
+    modifica directamente (product['price'] = ...), hay que llamar a
+    invalidate() con su id.
+
+    Cada cambio crea una nueva versión del producto, con su propio ETag
+    (calculado a partir del contenido la primera vez que se pide) y su fecha
+    de última modificación.
+    """
+
+    def __init__(self, products):
+        self.products = products
+        self._lock = threading.Lock()
+        self._rebuild()
+
+    def _rebuild(self):
+        self._index = {product['id']: product for product in self.products}
+        self._encoded = {}
+        now = time.time()
+        self._modified = dict.fromkeys(self._index, now)
+
+    def _sync(self):
+        """
+        Reconstruye el índice si la lista se ha modificado sin pasar por el catálogo
+        """
+        if len(self._index) != len(self.products):
+            with self._lock:
+                self._rebuild()
+
+    def get(self, product_id):
+        """
+        Devuelve el producto con ese id, o None si no existe
+        """
+        self._sync()
+        return self._index.get(product_id)
+
+    def encoded(self, product_id, key, encoder):
+        """
+        Devuelve la representación 'key' del producto (bytes), o None si no existe.
+        La primera vez se genera con encoder(producto) y se guarda en caché.
+        """
+        cache = self._encoded.get(product_id)
+        if cache is not None:
+            data = cache.get(key)
+            if data is not None:
+                return data
+        self._sync()
+        with self._lock:
+            product = self._index.get(product_id)
+            if product is None:
+                return None
+            cache = self._encoded.setdefault(product_id, {})
+            data = cache.get(key)
+            if data is None:
+                data = cache[key] = encoder(product)
+            return data
+
+    def compressor(self, product_id, key, body):
+        """
+        Devuelve una función (codificación, nivel) -> bytes para send_body() y
+        send_conditional() que comprime 'body', la representación 'key' del
+        producto, una sola vez por versión del producto
+        """
+        def compressed(coding, level):
+            data = self.encoded(product_id, (key, coding, level), lambda product: compress(body, coding, level))
+            if data is None:
+                # El producto se ha eliminado mientras tanto: se comprime sin guardar
+                data = compress(body, coding, level)
+            return data
+        return compressed
+
+    def etag(self, product_id, variant):
+        """
+        Devuelve el ETag de la representación 'variant' de la versión actual del
+        producto, o None si no existe. El resumen del contenido se calcula una
+        sola vez por versión.
+        """
+        digest = self.encoded(product_id, 'digest', _content_digest)
+        if digest is None:
+            return None
+        return f'"{digest}-{variant}"'
+
+    def last_modified(self, product_id):
+        """
+        Devuelve el instante (segundos desde epoch) de la última modificación del producto
+        """
+        return self._modified.get(product_id)
+
+    def invalidate(self, product_id):
+        """
+        Descarta las representaciones en caché de un producto y le da una nueva versión
+        """
+        self._encoded.pop(product_id, None)
+        if product_id in self._index:
+            self._modified[product_id] = time.time()
+
+    def add(self, product):
+        """
+        Añade un producto nuevo; su id no puede existir ya
+        """
+        with self._lock:
+            if product['id'] in self._index:
+                raise ValueError(f"Ya existe un producto con id {product['id']}")
+            self.products.append(product)
+            self._index[product['id']] = product
+            self._modified[product['id']] = time.time()
+
+    def update(self, product_id, **fields):
+        """
+        Modifica los campos indicados de un producto existente y lo devuelve
+        """
+        with self._lock:
+            product = self._index[product_id]
+            product.update(fields)
+            self.invalidate(product_id)
+            return product
+
+    def remove(self, product_id):
+        """
+        Elimina un producto por su id y lo devuelve
+        """
+        with self._lock:
+            product = self._index.pop(product_id)
+            self.products.remove(product)
+            self._encoded.pop(product_id, None)
+            self._modified.pop(product_id, None)
+            return product
+
+    def __len__(self):
+        return len(self.products)
+
+    def __iter__(self):
+        return iter(self.products)
+
+
+def _content_digest(product):
+    """
+    Resumen del contenido de un producto, independiente del orden de sus campos
+    """
+    canonical = json.dumps(product, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha1(canonical.encode('utf-8')).hexdigest()[:16]
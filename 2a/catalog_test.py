@@ -0,0 +1,118 @@
+import gzip
+import json
+import pytest
+from catalog import ProductCatalog
+
+
+@pytest.fixture
+def products():
+    return [
+        {"id": 1, "name": "Laptop", "price": 999.99},
+        {"id": 2, "name": "Smartphone", "price": 699.99},
+    ]
+
+
+def test_get(products):
+    """
+    Busca productos por id en el índice
+    """
+    catalog = ProductCatalog(products)
+    assert catalog.get(2)["name"] == "Smartphone"
+    assert catalog.get(999) is None
+
+
+def test_add_update_remove_keep_list_and_index_in_sync(products):
+    """
+    Las modificaciones hechas con el catálogo actualizan la lista y el índice
+    """
+    catalog = ProductCatalog(products)
+    catalog.add({"id": 3, "name": "Tablet", "price": 349.99})
+    assert products[-1]["id"] == 3
+    assert catalog.get(3)["name"] == "Tablet"
+
+    catalog.update(3, price=299.99)
+    assert products[-1]["price"] == 299.99
+
+    catalog.remove(1)
+    assert [p["id"] for p in products] == [2, 3]
+    assert catalog.get(1) is None
+    assert len(catalog) == 2
+
+
+def test_add_duplicate_id(products):
+    """
+    No se puede añadir un producto con un id que ya existe
+    """
+    catalog = ProductCatalog(products)
+    with pytest.raises(ValueError):
+        catalog.add({"id": 1, "name": "Otro", "price": 1.0})
+
+
+def test_direct_list_changes_are_detected(products):
+    """
+    Si la lista se modifica directamente, el índice se reconstruye
+    """
+    catalog = ProductCatalog(products)
+    products.append({"id": 7, "name": "Monitor", "price": 199.99})
+    assert catalog.get(7)["name"] == "Monitor"
+    products.pop(0)
+    assert catalog.get(1) is None
+
+
+def test_encoded_is_cached_until_the_product_changes(products):
+    """
+    La representación codificada se genera una vez y se descarta al modificar el producto
+    """
+    catalog = ProductCatalog(products)
+    calls = []
+
+    def encoder(product):
+        calls.append(product["id"])
+        return str(product["price"]).encode()
+
+    assert catalog.encoded(1, "price", encoder) == b"999.99"
+    assert catalog.encoded(1, "price", encoder) == b"999.99"
+    assert calls == [1]
+
+    catalog.update(1, price=899.99)
+    assert catalog.encoded(1, "price", encoder) == b"899.99"
+
+    products[0]["price"] = 799.99
+    catalog.invalidate(1)
+    assert catalog.encoded(1, "price", encoder) == b"799.99"
+    assert calls == [1, 1, 1]
+
+    assert catalog.encoded(999, "price", encoder) is None
+
+
+def test_etag_changes_with_each_version(products):
+    """
+    El ETag depende del contenido y cambia al modificar el producto
+    """
+    catalog = ProductCatalog(products)
+    etag = catalog.etag(1, "json")
+    assert etag.startswith('"') and etag.endswith('-json"')
+    assert catalog.etag(1, "json") == etag
+    assert catalog.etag(1, "xml") != etag
+
+    modified = catalog.last_modified(1)
+    catalog.update(1, price=899.99)
+    assert catalog.etag(1, "json") != etag
+    assert catalog.last_modified(1) >= modified
+
+    catalog.update(1, price=999.99)
+    assert catalog.etag(1, "json") == etag, "El mismo contenido produce el mismo ETag."
+    assert catalog.etag(999, "json") is None
+
+
+def test_compressor_caches_until_the_product_changes(products):
+    """
+    Las versiones comprimidas se guardan por producto y se descartan al modificarlo
+    """
+    catalog = ProductCatalog(products)
+    body = catalog.encoded(1, "json", lambda product: json.dumps(product).encode())
+    compressed = catalog.compressor(1, "json", body)("gzip", 6)
+    assert gzip.decompress(compressed) == body
+    assert catalog.compressor(1, "json", b"otro")("gzip", 6) is compressed
+    catalog.update(1, price=899.99)
+    assert gzip.decompress(catalog.compressor(1, "json", b"nuevo")("gzip", 6)) == b"nuevo"
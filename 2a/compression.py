@@ -0,0 +1,72 @@
+"""
+Compresión de respuestas negociada con Accept-Encoding para las APIs del apartado 2a.
+
+Funciones puras, sin estado: elegir la codificación que acepta el cliente,
+decidir si un tipo de contenido merece comprimirse y comprimir un cuerpo. La
+integración con los manejadores (cabeceras Content-Encoding y Vary, umbral de
+tamaño y nivel de compresión) está en server_utils.KeepAliveHandler.
+"""
+
+import gzip
+import zlib
+
+# Codificaciones admitidas, por orden de preferencia del servidor
+CODINGS = ('gzip', 'deflate')
+
+# Nombres alternativos que algunos clientes siguen enviando
+_ALIASES = {'x-gzip': 'gzip'}
+
+_COMPRESSIBLE_TYPES = ('application/json', 'application/xml', 'application/javascript')
+
+
+def negotiate(accept_encoding):
+    """
+    Devuelve la codificación que se va a usar según la cabecera Accept-Encoding,
+    o None si el cliente no acepta ninguna de las admitidas (se envía sin comprimir)
+    """
+    if not accept_encoding:
+        return None
+    weights = {}
+    for item in accept_encoding.split(','):
+        name, _, params = item.partition(';')
+        name = name.strip().lower()
+        name = _ALIASES.get(name, name)
+        q = 1.0
+        for param in params.split(';'):
+            key, _, value = param.partition('=')
+            if key.strip().lower() == 'q':
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        weights[name] = q
+    wildcard = weights.get('*', 0.0)
+    best, best_q = None, 0.0
+    for coding in CODINGS:
+        q = weights.get(coding, wildcard)
+        if q > best_q:
+            best, best_q = coding, q
+    return best
+
+
+def is_compressible(content_type):
+    """
+    Indica si un tipo de contenido es texto que merece la pena comprimir
+    """
+    media_type = content_type.partition(';')[0].strip().lower()
+    return (media_type.startswith('text/') or media_type in _COMPRESSIBLE_TYPES
+            or media_type.endswith(('+json', '+xml')))
+
+
+def compress(body, coding, level=6):
+    """
+    Comprime el cuerpo con la codificación indicada ('gzip' o 'deflate').
+    La salida gzip no incluye la fecha, así que los mismos bytes producen
+    siempre el mismo resultado.
+    """
+    if coding == 'gzip':
+        return gzip.compress(body, compresslevel=level, mtime=0)
+    if coding == 'deflate':
+        # "deflate" en HTTP es el formato zlib (RFC 9110, 8.4.1.2)
+        return zlib.compress(body, level)
+    raise ValueError(f'Codificación no admitida: {coding}')
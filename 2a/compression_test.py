@@ -0,0 +1,39 @@
+import gzip
+import zlib
+import pytest
+from compression import negotiate, is_compressible, compress
+
+
+def test_negotiate():
+    """
+    Se elige la codificación admitida con mayor q; en caso de empate, gzip
+    """
+    assert negotiate("gzip, deflate, br") == "gzip"
+    assert negotiate("deflate, gzip;q=0.5") == "deflate"
+    assert negotiate("x-gzip") == "gzip"
+    assert negotiate("*;q=0.1, gzip;q=0") == "deflate"
+    assert negotiate("identity") is None
+    assert negotiate("gzip;q=0") is None
+    assert negotiate(None) is None
+
+
+def test_is_compressible():
+    """
+    Solo se comprimen los tipos de texto
+    """
+    assert is_compressible("application/json")
+    assert is_compressible("text/plain; charset=utf-8")
+    assert is_compressible("application/problem+json")
+    assert not is_compressible("image/png")
+
+
+def test_compress_round_trip():
+    """
+    Los cuerpos comprimidos se descomprimen igual y gzip es determinista
+    """
+    body = b'{"id":1,"name":"Laptop","price":999.99}' * 20
+    assert gzip.decompress(compress(body, "gzip")) == body
+    assert zlib.decompress(compress(body, "deflate", level=9)) == body
+    assert compress(body, "gzip") == compress(body, "gzip")
+    with pytest.raises(ValueError):
+        compress(body, "br")
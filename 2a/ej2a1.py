@@ -13,11 +13,37 @@ Tu tarea es completar la implementación de la clase MyHTTPRequestHandler.
 Nota: Si deseas cambiar el idioma del ejercicio, edita el archivo de test correspondiente (ej2a1_test.py).
 """
 
-from http.server import HTTPServer, BaseHTTPRequestHandler
+from compression import negotiate
+from server_utils import KeepAliveHandler, encode_static, encode_static_variants, make_server
 
-class MyHTTPRequestHandler(BaseHTTPRequestHandler):
+# Respuestas de cada ruta: (código, Content-Type, cuerpo). No cambian nunca, así
+# que se codifican una sola vez por servidor, con línea de estado y cabeceras.
+ROUTES = {
+    '/': (200, "text/plain", b"Hola mundo!"),
+}
+# Respuesta para otras rutas (error 404)
+NOT_FOUND = (404, "text/plain", b"Ruta no encontrada.")
+
+
+def encode_routes(server):
+    """
+    Codifica las respuestas fijas para 'server' la primera vez que se piden:
+    rutas (static_routes), 404 (static_not_found) y versiones comprimidas
+    (static_variants). Dependen de la configuración del servidor (compresión,
+    conexiones persistentes), así que se guardan en el propio servidor; así
+    el manejador funciona también con un HTTPServer creado sin create_server.
+    """
+    if not hasattr(server, 'static_variants'):
+        server.static_routes = {path: encode_static(server, *response) for path, response in ROUTES.items()}
+        server.static_not_found = encode_static(server, *NOT_FOUND)
+        # Se asigna la última: su presencia indica que las tablas están completas
+        server.static_variants = {path: encode_static_variants(server, *response)
+                                  for path, response in ROUTES.items()}
+    return server
+
+class MyHTTPRequestHandler(KeepAliveHandler):
     """
-    Manejador de peticiones HTTP personalizado
+    Manejador de peticiones HTTP personalizado (HTTP/1.1, conexiones persistentes)
     """
 
     def do_GET(self):
@@ -32,29 +58,30 @@ class MyHTTPRequestHandler(BaseHTTPRequestHandler):
         # 1. Verifica la ruta solicitada (self.path)
         # 2. Si la ruta es "/", envía una respuesta 200 con el mensaje "¡Hola mundo!"
         # 3. Si la ruta es cualquier otra, envía una respuesta 404
-        if self.path == '/':
-            # Configuramos la respuesta
-            self.send_response(200)  # Código HTTP 200 OK
-            self.send_header("Content-type", "text/plain")
-            self.end_headers()
-
-            # Enviamos mensaje
-            self.wfile.write(b"Hola mundo!")
-        else:
-            # Para otras rutas (error 404)
-            self.send_response(404)
-            self.send_header("Content-Type", "text/plain")
-            self.end_headers()
+        # Buscamos la respuesta ya codificada de la ruta; si no existe, la del 404
+        server = encode_routes(self.server)
+        status, data = server.static_routes.get(self.path, server.static_not_found)
+        # Si la ruta tiene versiones comprimidas y el cliente acepta alguna, se usa esa
+        variants = server.static_variants.get(self.path)
+        if variants:
+            status, data = variants.get(negotiate(self.headers.get("Accept-Encoding")), (status, data))
+        # Enviamos la respuesta completa con una sola escritura
+        self.send_raw(status, data)
 
-            self.wfile.write(b"Ruta no encontrada.")
 
-
-def create_server(host="localhost", port=8888):
+def create_server(host="localhost", port=8888, **options):
     """
     Crea y configura el servidor HTTP
+
+    Las opciones adicionales (workers, backlog, queue_size, backend, processes,
+    reuse_port) se pasan a server_utils.make_server para elegir el modo de
+    servicio; sin opciones se crea un HTTPServer que atiende las peticiones de
+    una en una.
     """
     server_address = (host, port)
-    httpd = HTTPServer(server_address, MyHTTPRequestHandler)
+    httpd = make_server(server_address, MyHTTPRequestHandler, **options)
+    # Tablas de respuestas ya codificadas, antes de atender la primera petición
+    encode_routes(httpd)
     return httpd
 
 def run_server(server):
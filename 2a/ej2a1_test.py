@@ -1,4 +1,6 @@
 import pytest
+import http.client
+import socket
 import threading
 import requests
 import time
@@ -42,3 +44,121 @@ def test_nonexistent_endpoint(server):
     """
     response = requests.get("http://localhost:8888/nonexistent")
     assert response.status_code == 404, "El código de estado debe ser 404 para rutas inexistentes."
+
+def test_date_header(server):
+    """
+    Las respuestas ya codificadas llevan la cabecera Date del momento del envío
+    """
+    response = requests.get("http://localhost:8888/")
+    assert "Date" in response.headers
+    assert response.headers["Date"].endswith(" GMT")
+
+def test_plain_http_server():
+    """
+    El manejador funciona también con un HTTPServer creado sin create_server
+    """
+    from http.server import HTTPServer
+    from ej2a1 import MyHTTPRequestHandler
+    server = HTTPServer(("localhost", 0), MyHTTPRequestHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        response = requests.get(f"http://localhost:{server.server_port}/")
+        assert response.status_code == 200
+        assert "Hola mundo" in response.text
+        assert requests.get(f"http://localhost:{server.server_port}/x").status_code == 404
+    finally:
+        server.shutdown()
+        server.server_close()
+        thread.join(1)
+
+@pytest.fixture
+def pool_server():
+    """
+    Servidor con grupo de hilos, que mantiene las conexiones persistentes
+    """
+    server = create_server(host="localhost", port=8895, workers=4)
+    thread = threading.Thread(target=server.serve_forever)
+    thread.daemon = True
+    thread.start()
+    time.sleep(0.5)
+
+    yield server
+
+    server.shutdown()
+    server.server_close()
+    thread.join(1)
+
+def test_keep_alive(pool_server):
+    """
+    Prueba que varias peticiones reutilizan la misma conexión HTTP/1.1
+    """
+    conn = http.client.HTTPConnection("localhost", 8895)
+    try:
+        conn.request("GET", "/")
+        response = conn.getresponse()
+        assert response.version == 11, "La respuesta debe ser HTTP/1.1."
+        assert response.getheader("Content-Length") == str(len(response.read()))
+        sock = conn.sock
+
+        conn.request("GET", "/nonexistent")
+        response = conn.getresponse()
+        assert response.status == 404
+        assert response.getheader("Content-Length") == str(len(response.read()))
+        assert conn.sock is sock, "La conexión debe mantenerse abierta entre peticiones."
+    finally:
+        conn.close()
+
+def test_pipelining(pool_server):
+    """
+    Prueba que las peticiones encadenadas se responden en orden
+    """
+    with socket.create_connection(("localhost", 8895)) as sock:
+        sock.sendall(b"GET /nonexistent HTTP/1.1\r\nHost: localhost\r\n\r\n"
+                     b"GET / HTTP/1.1\r\nHost: localhost\r\nConnection: close\r\n\r\n")
+        data = b""
+        while chunk := sock.recv(4096):
+            data += chunk
+    first = data.index(b"HTTP/1.1 404")
+    second = data.index(b"HTTP/1.1 200")
+    assert first < second, "Las respuestas deben llegar en el orden de las peticiones."
+    assert data.endswith(b"Hola mundo!")
+
+def test_static_routes_are_pre_encoded(server):
+    """
+    Las respuestas de cada ruta se codifican una sola vez al crear el servidor
+    (sin la cabecera Date, que se añade en cada envío)
+    """
+    status, data = server.static_routes["/"]
+    assert status == 200
+    assert data.startswith(b"HTTP/1.1 200 OK\r\n")
+    assert data.endswith(b"\r\n\r\nHola mundo!")
+
+    response = requests.get("http://localhost:8888/")
+    assert response.content == b"Hola mundo!"
+
+def test_single_threaded_server_closes_connection(server):
+    """
+    El HTTPServer por defecto cierra la conexión tras cada respuesta
+    """
+    response = requests.get("http://localhost:8888/")
+    assert response.headers["Connection"] == "close"
+    assert response.headers["Content-Length"] == str(len(response.content))
+
+def test_create_server_with_workers():
+    """
+    Prueba el modo con grupo de hilos de create_server
+    """
+    server = create_server(host="localhost", port=8892, workers=4, backlog=64, queue_size=16)
+    thread = threading.Thread(target=server.serve_forever)
+    thread.daemon = True
+    thread.start()
+    time.sleep(0.5)
+    try:
+        response = requests.get("http://localhost:8892/")
+        assert response.status_code == 200, "El código de estado debe ser 200."
+        assert "Hola mundo" in response.text, "El mensaje debe contener 'Hola mundo'."
+    finally:
+        server.shutdown()
+        server.server_close()
+        thread.join(1)
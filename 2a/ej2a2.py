@@ -18,21 +18,26 @@ Ejemplo:
 2. Una solicitud `GET /product/999` debe devolver un mensaje de error con código 404.
 """
 
-from http.server import HTTPServer, BaseHTTPRequestHandler
 import json
-import re
+from urllib.parse import parse_qs
+from server_utils import KeepAliveHandler, Router, make_server
 
-# Lista de productos predefinida
-products = [
-    {"id": 1, "name": "Laptop", "price": 999.99},
-    {"id": 2, "name": "Smartphone", "price": 699.99},
-    {"id": 3, "name": "Tablet", "price": 349.99}
-]
+# Lista de productos, catálogo (índice por id y caché) y codificación JSON
+# compartidos con ej2a3 y product_api
+from product_api import catalog, encode_product, products  # noqa: F401
 
+# Rutas de la API, compiladas una sola vez: ruta -> método del manejador
+ROUTES = Router()
+ROUTES.add('/product/<int:product_id>', 'get_product')
+ROUTES.add('/products', 'get_products')
 
-class ProductAPIHandler(BaseHTTPRequestHandler):
+# Número máximo de ids por defecto en GET /products?ids=...
+MAX_BATCH_IDS = 100
+
+
+class ProductAPIHandler(KeepAliveHandler):
     """
-    Manejador de peticiones HTTP para la API de productos
+    Manejador de peticiones HTTP para la API de productos (HTTP/1.1, conexiones persistentes)
     """
 
     def do_GET(self):
@@ -48,55 +53,96 @@ class ProductAPIHandler(BaseHTTPRequestHandler):
         # 4. Si el producto existe, devuélvelo en formato JSON con código 200
         # 5. Si el producto no existe, devuelve un mensaje de error con código 404
 
-        def busca_prod(self):
-            id_str = re.search(r'\d+', self.path)
-            if id_str != None:
-                return id_str.group(0)
-            else:
-                return
+        # Buscamos la ruta entre las rutas compiladas
+        endpoint, params = ROUTES.match(self.path)
+        if endpoint is None:
+            # Para otras rutas (error 404)
+            self.send_body(404, "text/plain", b"Ruta no encontrada. Error 404.")
+            return
+        getattr(self, endpoint)(**params)
 
-        id = busca_prod(self)
-        if id != None:
-            ruta = '/product/' + id
-        else:
-            ruta = ''
-        if self.path == ruta:
-            for product in products:
-                if int(id) == product['id']:
-                    # Configuramos la respuesta
-                    self.send_response(200)  # Código HTTP 200 OK
-                    self.send_header("Content-type", "application/json")
-                    self.end_headers()
-
-                    product_info = {
-                        "id": product['id'],
-                        "name": product['name'],
-                        "price": product['price']
-                    }
-
-                    # Enviamos mensaje
-                    self.wfile.write(json.dumps(product_info, indent=4).encode('utf-8'))
-                    return
-            
+    def get_product(self, product_id):
+        """
+        GET /product/<id>: devuelve el producto en JSON o un 404 si no existe
+        """
+        # Buscamos el producto en el catálogo, que guarda su JSON ya codificado
+        indent = self.server.json_indent
+        body = catalog.encoded(product_id, ('json', indent), lambda product: encode_product(product, indent))
+        if body is None:
             # Si el producto no existe (error 404)
-            self.send_response(404)
-            self.send_header("Content-Type", "text/plain")
-            self.end_headers()
-            self.wfile.write(b"Producto no encontrado.")
+            self.send_body(404, "text/plain", b"Producto no encontrado.")
+            return
+
+        # Enviamos mensaje con código HTTP 200 OK, o 304 si el cliente ya lo tiene
+        # Las versiones comprimidas también se guardan en el catálogo
+        etag = catalog.etag(product_id, 'json-pretty' if indent else 'json')
+        compressed = catalog.compressor(product_id, ('json', indent), body)
+        self.send_conditional("application/json", body, etag, catalog.last_modified(product_id), compressed=compressed)
+
+    def get_products(self):
+        """
+        GET /products?ids=1,2,3: devuelve en una sola respuesta los productos
+        encontrados y la lista de ids que no existen
+        """
+        ids = parse_ids(self.path.partition('?')[2], self.server.max_batch_ids)
+        if ids is None:
+            message = f"Indica entre 1 y {self.server.max_batch_ids} ids numéricos: /products?ids=1,2,3"
+            self.send_body(400, "text/plain; charset=utf-8", message.encode('utf-8'))
+            return
+
+        indent = self.server.json_indent
+        found, missing = [], []
+        for product_id in ids:
+            # Reutilizamos el JSON de cada producto guardado en el catálogo
+            body = catalog.encoded(product_id, ('json', indent), lambda product: encode_product(product, indent))
+            if body is None:
+                missing.append(product_id)
+            else:
+                found.append(body)
+        if indent:
+            # Con sangría no se pueden concatenar los JSON ya codificados
+            batch = {"products": [json.loads(body) for body in found], "missing": missing}
+            body = json.dumps(batch, indent=indent).encode('utf-8')
         else:
-            # Para otras rutas (error 404)
-            self.send_response(404)
-            self.send_header("Content-Type", "text/plain")
-            self.end_headers()
+            missing_json = json.dumps(missing, separators=(',', ':')).encode('utf-8')
+            body = b'{"products":[' + b','.join(found) + b'],"missing":' + missing_json + b'}'
+        self.send_body(200, "application/json", body)
+
+
+def parse_ids(query, limit):
+    """
+    Extrae la lista de ids (sin repetir, en orden) de la query string 'ids=1,2,3'.
+    Devuelve None si falta, no son números o hay más de 'limit'.
+    """
+    values = parse_qs(query).get('ids')
+    if not values:
+        return None
+    try:
+        ids = list(dict.fromkeys(int(value) for value in ','.join(values).split(',') if value))
+    except ValueError:
+        return None
+    if not ids or len(ids) > limit:
+        return None
+    return ids
 
-            self.wfile.write(b"Ruta no encontrada. Error 404.")
 
-def create_server(host="localhost", port=8889):
+def create_server(host="localhost", port=8889, pretty=False, max_batch_ids=MAX_BATCH_IDS, **options):
     """
     Crea y configura el servidor HTTP
+
+    Los productos se envían en JSON compacto; con pretty=True se envían con
+    sangría de 4 espacios. GET /products?ids=... admite como mucho
+    max_batch_ids ids por petición.
+
+    Las opciones adicionales (workers, backlog, queue_size, backend, processes,
+    reuse_port) se pasan a server_utils.make_server para elegir el modo de
+    servicio; sin opciones se crea un HTTPServer que atiende las peticiones de
+    una en una.
     """
     server_address = (host, port)
-    httpd = HTTPServer(server_address, ProductAPIHandler)
+    httpd = make_server(server_address, ProductAPIHandler, **options)
+    httpd.json_indent = 4 if pretty else None
+    httpd.max_batch_ids = max_batch_ids
     return httpd
 
 def run_server(server):
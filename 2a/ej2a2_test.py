@@ -3,7 +3,7 @@ import threading
 import requests
 import time
 import json
-from ej2a2 import create_server
+from ej2a2 import create_server, catalog
 
 @pytest.fixture
 def server():
@@ -67,3 +67,143 @@ def test_invalid_route(server):
     """
     response = requests.get("http://localhost:8889/invalid")
     assert response.status_code == 404, "El código de estado debe ser 404 para rutas inválidas."
+
+def test_compact_json(server):
+    """
+    Por defecto los productos se envían en JSON compacto
+    """
+    response = requests.get("http://localhost:8889/product/1")
+    assert response.content == b'{"id":1,"name":"Laptop","price":999.99}'
+
+def test_pretty_json():
+    """
+    Con pretty=True los productos se envían con sangría
+    """
+    server = create_server(host="localhost", port=8896, pretty=True)
+    thread = threading.Thread(target=server.serve_forever)
+    thread.daemon = True
+    thread.start()
+    time.sleep(0.5)
+    try:
+        response = requests.get("http://localhost:8896/product/1")
+        assert response.content == json.dumps({"id": 1, "name": "Laptop", "price": 999.99}, indent=4).encode()
+    finally:
+        server.shutdown()
+        server.server_close()
+        thread.join(1)
+
+def test_conditional_get_if_none_match(server):
+    """
+    Prueba que un cliente con el ETag actual recibe 304 sin cuerpo
+    """
+    response = requests.get("http://localhost:8889/product/2")
+    etag = response.headers["ETag"]
+    assert "Last-Modified" in response.headers
+
+    response = requests.get("http://localhost:8889/product/2", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["ETag"] == etag
+
+    response = requests.get("http://localhost:8889/product/2", headers={"If-None-Match": '"otro"'})
+    assert response.status_code == 200
+
+def test_conditional_get_if_modified_since(server):
+    """
+    Prueba If-Modified-Since con la fecha de Last-Modified
+    """
+    response = requests.get("http://localhost:8889/product/3")
+    last_modified = response.headers["Last-Modified"]
+    response = requests.get("http://localhost:8889/product/3", headers={"If-Modified-Since": last_modified})
+    assert response.status_code == 304
+
+def test_etag_changes_when_product_changes(server):
+    """
+    Prueba que al modificar un producto cambia su ETag y se devuelven los datos nuevos
+    """
+    etag = requests.get("http://localhost:8889/product/1").headers["ETag"]
+    catalog.update(1, price=899.99)
+    try:
+        response = requests.get("http://localhost:8889/product/1", headers={"If-None-Match": etag})
+        assert response.status_code == 200
+        assert response.json()["price"] == 899.99
+        assert response.headers["ETag"] != etag
+    finally:
+        catalog.update(1, price=999.99)
+
+def test_compressed_response():
+    """
+    Prueba que con Accept-Encoding se envía el producto comprimido, con Vary y un ETag propio
+    """
+    server = create_server(host="localhost", port=8897, compress_min_size=0)
+    thread = threading.Thread(target=server.serve_forever)
+    thread.daemon = True
+    thread.start()
+    time.sleep(0.5)
+    try:
+        response = requests.get("http://localhost:8897/product/1", headers={"Accept-Encoding": "gzip"})
+        assert response.headers["Content-Encoding"] == "gzip"
+        assert response.headers["Vary"] == "Accept-Encoding"
+        assert response.json()["name"] == "Laptop"
+        gzip_etag = response.headers["ETag"]
+
+        response = requests.get("http://localhost:8897/product/1", headers={"Accept-Encoding": "identity"})
+        assert "Content-Encoding" not in response.headers
+        assert response.headers["Vary"] == "Accept-Encoding"
+        assert response.headers["ETag"] != gzip_etag
+
+        response = requests.get("http://localhost:8897/product/1",
+                                headers={"Accept-Encoding": "gzip", "If-None-Match": gzip_etag})
+        assert response.status_code == 304
+    finally:
+        server.shutdown()
+        server.server_close()
+        thread.join(1)
+
+def test_get_products_batch(server):
+    """
+    Prueba que GET /products?ids=... devuelve los productos encontrados y los ids que faltan
+    """
+    response = requests.get("http://localhost:8889/products?ids=2,999,1,2")
+    assert response.status_code == 200
+    assert response.json() == {
+        "products": [{"id": 2, "name": "Smartphone", "price": 699.99}, {"id": 1, "name": "Laptop", "price": 999.99}],
+        "missing": [999],
+    }
+
+def test_get_products_batch_invalid(server):
+    """
+    Prueba que sin ids, con ids no numéricos o con demasiados ids se devuelve 400
+    """
+    assert requests.get("http://localhost:8889/products").status_code == 400
+    assert requests.get("http://localhost:8889/products?ids=1,x").status_code == 400
+    ids = ",".join(str(i) for i in range(server.max_batch_ids + 1))
+    assert requests.get("http://localhost:8889/products?ids=" + ids).status_code == 400
+
+def test_content_length(server):
+    """
+    Prueba que todas las respuestas, incluidos los 404, llevan Content-Length
+    """
+    for path in ("/product/1", "/product/999", "/invalid"):
+        response = requests.get("http://localhost:8889" + path)
+        assert response.headers["Content-Length"] == str(len(response.content))
+
+def test_asyncio_backend():
+    """
+    Prueba la API de productos servida con el backend asyncio
+    """
+    server = create_server(host="localhost", port=8894, backend="asyncio")
+    thread = threading.Thread(target=server.serve_forever)
+    thread.daemon = True
+    thread.start()
+    time.sleep(0.5)
+    try:
+        response = requests.get("http://localhost:8894/product/3")
+        assert response.status_code == 200
+        assert response.json()["name"] == "Tablet"
+        response = requests.get("http://localhost:8894/product/999")
+        assert response.status_code == 404
+    finally:
+        server.shutdown()
+        server.server_close()
+        thread.join(1)
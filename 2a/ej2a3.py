@@ -18,17 +18,13 @@ Ejemplo:
 2. Una solicitud `GET /product/999` debe devolver un mensaje de error con código 404.
 """
 
-from http.server import HTTPServer, BaseHTTPRequestHandler
 import re
 import xml.etree.ElementTree as ET
-from xml.dom import minidom
+from server_utils import KeepAliveHandler, make_server
+from xml_writer import serialize
 
-# Lista de productos predefinida
-products = [
-    {"id": 1, "name": "Laptop", "price": 999.99},
-    {"id": 2, "name": "Smartphone", "price": 699.99},
-    {"id": 3, "name": "Tablet", "price": 349.99}
-]
+# Lista de productos y catálogo (índice por id y caché) compartidos con ej2a2 y product_api
+from product_api import catalog, products  # noqa: F401
 
 def dict_to_xml(tag, d):
     """
@@ -44,13 +40,12 @@ def prettify(elem):
     """
     Devuelve una cadena XML formateada bonita
     """
-    rough_string = ET.tostring(elem, 'utf-8')
-    reparsed = minidom.parseString(rough_string)
-    return reparsed.toprettyxml(indent="  ").encode()
+    # Mismo documento que minidom.toprettyxml(indent="  "), escrito en una sola pasada
+    return serialize(elem, indent="  ")
 
-class ProductAPIHandler(BaseHTTPRequestHandler):
+class ProductAPIHandler(KeepAliveHandler):
     """
-    Manejador de peticiones HTTP para la API de productos en XML
+    Manejador de peticiones HTTP para la API de productos en XML (HTTP/1.1, conexiones persistentes)
     """
 
     def do_GET(self):
@@ -72,18 +67,14 @@ class ProductAPIHandler(BaseHTTPRequestHandler):
 
         if match:
             id = int(match.group(1))
-            product = next((p for p in products if p["id"] == id), None)
-            # Configuramos la respuesta
-            self.send_response(200 if product else 404)
-            self.send_header('Content-type', 'application/xml')
-            self.end_headers()
+            # Buscamos el producto en el catálogo, que guarda su XML ya generado
+            product_xml = catalog.encoded(id, 'xml', lambda product: prettify(dict_to_xml('product', product)))
 
-            if product:
-                # Creamos el elemento raíz y convertimos el diccionario
-                elem = dict_to_xml('product', product)
-                product_xml = prettify(elem)
-                # Enviamos mensaje
-                self.wfile.write(product_xml)
+            if product_xml:
+                # Enviamos mensaje con código 200, o 304 si el cliente ya lo tiene
+                etag = catalog.etag(id, 'xml')
+                compressed = catalog.compressor(id, 'xml', product_xml)
+                self.send_conditional('application/xml', product_xml, etag, catalog.last_modified(id), compressed=compressed)
             else:
                 # creamos el diccionario con el mensaje de error
                 product_error = {'message': 'Product not found'}
@@ -91,26 +82,28 @@ class ProductAPIHandler(BaseHTTPRequestHandler):
                 elem = dict_to_xml('error', product_error)
                 product_error_xml = prettify(elem)
                 # Enviamos mensaje
-                self.wfile.write(product_error_xml)
+                self.send_body(404, 'application/xml', product_error_xml)
         else:
             # Para otras rutas (error 404)
-            self.send_response(404)
-            self.send_header("Content-Type", "application/xml")
-            self.end_headers()
             # creamos el diccionario con el mensaje de error
             route_error = {'message': 'Endpoint not found'}
             # Creamos el elemento raíz y convertimos el diccionario
             elem = dict_to_xml('error', route_error)
             route_error_xml = prettify(elem)
             # Enviamos mensaje
-            self.wfile.write(route_error_xml)
+            self.send_body(404, "application/xml", route_error_xml)
         
-def create_server(host="localhost", port=8890):
+def create_server(host="localhost", port=8890, **options):
     """
     Crea y configura el servidor HTTP
+
+    Las opciones adicionales (workers, backlog, queue_size, backend, processes,
+    reuse_port) se pasan a server_utils.make_server para elegir el modo de
+    servicio; sin opciones se crea un HTTPServer que atiende las peticiones de
+    una en una.
     """
     server_address = (host, port)
-    httpd = HTTPServer(server_address, ProductAPIHandler)
+    httpd = make_server(server_address, ProductAPIHandler, **options)
     return httpd
 
 def run_server(server):
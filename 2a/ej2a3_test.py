@@ -87,3 +87,14 @@ def test_invalid_route(server):
 
     # Verificar que sea un XML de error
     assert "<error>" in response.text, "El XML debe contener un elemento 'error'"
+
+
+def test_conditional_get(server):
+    """
+    Prueba que un cliente con el ETag actual recibe 304 sin cuerpo
+    """
+    response = requests.get("http://localhost:8890/product/1")
+    etag = response.headers["ETag"]
+    response = requests.get("http://localhost:8890/product/1", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.content == b""
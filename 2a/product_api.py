@@ -0,0 +1,181 @@
+"""
+API de productos con negociación de contenido (JSON o XML según Accept).
+
+La lista de productos y su catálogo (índice por id y caché de
+representaciones) se definen aquí una sola vez y los comparten ej2a2 (JSON),
+ej2a3 (XML) y el manejador de este módulo. Cada formato se registra en
+FORMATS con su clave de caché y su codificador, así que añadir un formato no
+añade otra búsqueda ni otro serializador: el producto se busca en el índice y
+se codifica una sola vez por versión y tipo de contenido.
+
+`GET /product/<id>` devuelve el producto en el formato que prefiera el
+cliente (JSON por defecto), 404 si no existe y 406 si el cliente no acepta
+ninguno de los formatos disponibles.
+"""
+
+import json
+import xml.etree.ElementTree as ET
+from catalog import ProductCatalog
+from server_utils import KeepAliveHandler, Router, make_server
+from xml_writer import serialize
+
+# Lista de productos predefinida, compartida por las APIs del apartado 2a
+products = [
+    {"id": 1, "name": "Laptop", "price": 999.99},
+    {"id": 2, "name": "Smartphone", "price": 699.99},
+    {"id": 3, "name": "Tablet", "price": 349.99}
+]
+
+# Catálogo con índice por id sobre la lista de productos
+catalog = ProductCatalog(products)
+
+
+def encode_product(product, indent=None):
+    """
+    Codifica un producto en JSON: compacto por defecto, con sangría si se indica indent
+    """
+    product_info = {
+        "id": product['id'],
+        "name": product['name'],
+        "price": product['price']
+    }
+    separators = None if indent else (',', ':')
+    return json.dumps(product_info, indent=indent, separators=separators).encode('utf-8')
+
+
+def encode_xml(tag, d):
+    """
+    Codifica un diccionario como documento XML con un elemento por clave
+    """
+    elem = ET.Element(tag)
+    for key, val in d.items():
+        ET.SubElement(elem, key).text = str(val)
+    return serialize(elem, indent="  ")
+
+
+class ProductFormat:
+    """
+    Representación de los productos en un tipo de contenido.
+
+    cache_key es la clave con la que el catálogo guarda los bytes de cada
+    producto (la misma que usan ej2a2 y ej2a3, así que la caché se comparte)
+    y etag_variant distingue el ETag de cada formato.
+    """
+
+    def __init__(self, media_type, cache_key, etag_variant, encode, encode_error):
+        self.media_type = media_type
+        self.cache_key = cache_key
+        self.etag_variant = etag_variant
+        self.encode = encode
+        self.encode_error = encode_error
+
+
+# Formatos disponibles, por orden de preferencia del servidor
+FORMATS = [
+    ProductFormat('application/json', ('json', None), 'json', encode_product,
+                  lambda message: json.dumps({'error': message}).encode('utf-8')),
+    ProductFormat('application/xml', 'xml', 'xml', lambda product: encode_xml('product', product),
+                  lambda message: encode_xml('error', {'message': message})),
+]
+
+ROUTES = Router()
+ROUTES.add('/product/<int:product_id>', 'get_product')
+
+
+def negotiate_format(accept, formats=FORMATS):
+    """
+    Elige el formato según la cabecera Accept (con valores q y comodines).
+    Sin cabecera se usa el primer formato; devuelve None si no se acepta ninguno.
+    """
+    if not accept:
+        return formats[0]
+    ranges = []
+    for item in accept.split(','):
+        media_range, _, params = item.partition(';')
+        media_range = media_range.strip().lower()
+        q = 1.0
+        for param in params.split(';'):
+            key, _, value = param.partition('=')
+            if key.strip().lower() == 'q':
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        ranges.append((media_range, q))
+
+    best, best_q = None, 0.0
+    for product_format in formats:
+        main_type = product_format.media_type.partition('/')[0]
+        # El rango más específico que coincide es el que decide su q
+        q, specificity = 0.0, -1
+        for media_range, range_q in ranges:
+            if media_range == product_format.media_type:
+                level = 2
+            elif media_range == f'{main_type}/*':
+                level = 1
+            elif media_range == '*/*':
+                level = 0
+            else:
+                continue
+            if level > specificity:
+                q, specificity = range_q, level
+        if q > best_q:
+            best, best_q = product_format, q
+    return best
+
+
+class ProductAPIHandler(KeepAliveHandler):
+    """
+    Manejador de la API de productos que responde en JSON o en XML según Accept
+    """
+
+    def do_GET(self):
+        product_format = negotiate_format(self.headers.get("Accept"))
+        if product_format is None:
+            available = ", ".join(f.media_type for f in FORMATS)
+            self.send_body(406, "text/plain", f"Formatos disponibles: {available}".encode('utf-8'),
+                           {"Vary": "Accept"})
+            return
+        endpoint, params = ROUTES.match(self.path)
+        if endpoint is None:
+            self.send_error_message(404, product_format, "Endpoint not found")
+            return
+        getattr(self, endpoint)(product_format, **params)
+
+    def get_product(self, product_format, product_id):
+        """
+        GET /product/<id>: devuelve el producto en el formato negociado o un 404 si no existe
+        """
+        body = catalog.encoded(product_id, product_format.cache_key, product_format.encode)
+        if body is None:
+            self.send_error_message(404, product_format, "Product not found")
+            return
+        etag = catalog.etag(product_id, product_format.etag_variant)
+        compressed = catalog.compressor(product_id, product_format.cache_key, body)
+        self.send_conditional(product_format.media_type, body, etag, catalog.last_modified(product_id),
+                              {"Vary": "Accept"}, compressed=compressed)
+
+    def send_error_message(self, status, product_format, message):
+        self.send_body(status, product_format.media_type, product_format.encode_error(message),
+                       {"Vary": "Accept"})
+
+
+def create_server(host="localhost", port=8898, **options):
+    """
+    Crea y configura el servidor HTTP
+
+    Las opciones adicionales se pasan a server_utils.make_server para elegir
+    el modo de servicio, igual que en ej2a1, ej2a2 y ej2a3.
+    """
+    server_address = (host, port)
+    return make_server(server_address, ProductAPIHandler, **options)
+
+
+if __name__ == '__main__':
+    server = create_server()
+    print(f"Servidor iniciado en http://{server.server_address[0]}:{server.server_port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print('Servidor detenido por el usuario.')
+        server.server_close()
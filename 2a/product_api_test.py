@@ -0,0 +1,70 @@
+import pytest
+import threading
+import requests
+import time
+import xml.etree.ElementTree as ET
+from product_api import create_server, negotiate_format, catalog
+import ej2a2
+import ej2a3
+
+
+@pytest.fixture
+def server():
+    """
+    Fixture para iniciar y detener el servidor HTTP durante las pruebas
+    """
+    server = create_server(host="localhost", port=8898)
+    thread = threading.Thread(target=server.serve_forever)
+    thread.daemon = True
+    thread.start()
+    time.sleep(0.5)
+    yield server
+    server.shutdown()
+    server.server_close()
+    thread.join(1)
+
+
+def test_negotiate_format():
+    """
+    Se elige el formato con mayor q; sin Accept, JSON
+    """
+    assert negotiate_format(None).media_type == "application/json"
+    assert negotiate_format("application/xml").media_type == "application/xml"
+    assert negotiate_format("application/json;q=0.5, application/xml").media_type == "application/xml"
+    assert negotiate_format("text/html, */*;q=0.1").media_type == "application/json"
+    assert negotiate_format("application/*, application/json;q=0").media_type == "application/xml"
+    assert negotiate_format("text/html") is None
+
+
+def test_json_and_xml(server):
+    """
+    El mismo producto se devuelve en JSON o en XML según Accept
+    """
+    response = requests.get("http://localhost:8898/product/1", headers={"Accept": "application/json"})
+    assert response.headers["Content-Type"] == "application/json"
+    assert response.json() == {"id": 1, "name": "Laptop", "price": 999.99}
+    assert "Accept" in response.headers["Vary"]
+
+    response = requests.get("http://localhost:8898/product/1", headers={"Accept": "application/xml"})
+    assert response.headers["Content-Type"] == "application/xml"
+    assert ET.fromstring(response.content).find("name").text == "Laptop"
+
+
+def test_not_found_and_not_acceptable(server):
+    """
+    Los errores llegan en el formato negociado; sin formato aceptable, 406
+    """
+    response = requests.get("http://localhost:8898/product/999", headers={"Accept": "application/xml"})
+    assert response.status_code == 404
+    assert ET.fromstring(response.content).tag == "error"
+
+    response = requests.get("http://localhost:8898/product/1", headers={"Accept": "image/png"})
+    assert response.status_code == 406
+
+
+def test_catalog_is_shared():
+    """
+    ej2a2, ej2a3 y product_api usan el mismo catálogo
+    """
+    assert ej2a2.catalog is catalog
+    assert ej2a3.catalog is catalog
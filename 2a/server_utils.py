@@ -0,0 +1,924 @@
+"""
+Utilidades compartidas por los servidores http.server del apartado 2a.
+
+Cada ejercicio (ej2a1, ej2a2, ej2a3) define su propio manejador de peticiones y
+delega en make_server() la construcción del servidor, de forma que todos ellos
+admiten los mismos modos de servicio:
+
+- Por defecto: un HTTPServer clásico que atiende las peticiones de una en una.
+- workers=N: un grupo fijo de N hilos que atienden las conexiones aceptadas,
+  con una cola de espera acotada (queue_size) y un backlog de escucha
+  configurable (backlog).
+- backend="asyncio": un bucle de eventos asyncio que mantiene miles de
+  conexiones abiertas sin un hilo por conexión. Ejecuta los mismos manejadores
+  BaseHTTPRequestHandler y admite además rutas asíncronas nativas.
+- processes=N: N procesos hijos que comparten el puerto de escucha, cada uno
+  con su propio servidor de cualquiera de los modos anteriores. Así las rutas
+  que consumen CPU usan varios núcleos a pesar del GIL.
+
+Los manejadores heredan de KeepAliveHandler, que habla HTTP/1.1 con conexiones
+persistentes, envía siempre Content-Length y comprime las respuestas de texto
+con gzip o deflate cuando el cliente lo acepta (compress_level y
+compress_min_size en make_server). Con make_server(access_log=...) las
+peticiones se registran con access_log.AccessLog en lugar de log_message.
+"""
+
+from http.server import HTTPServer, BaseHTTPRequestHandler
+import asyncio
+import email.utils
+import http.client
+import io
+import queue
+import os
+import re
+import signal
+import socket
+import threading
+import time
+import traceback
+from access_log import AccessLog
+from compression import CODINGS, compress, is_compressible, negotiate
+
+
+class KeepAliveHandler(BaseHTTPRequestHandler):
+    """
+    Manejador base HTTP/1.1 con conexiones persistentes.
+
+    La conexión se mantiene abierta entre peticiones salvo que el cliente pida
+    cerrarla (o hable HTTP/1.0) y se cierra si pasan 'timeout' segundos sin
+    recibir la siguiente petición. Las peticiones encadenadas (pipelining) se
+    leen del búfer de entrada y se responden en el mismo orden.
+
+    Solo los servidores que atienden varias conexiones a la vez (los que tienen
+    persistent_connections = True) mantienen la conexión abierta: en un
+    HTTPServer que atiende de una en una, un cliente inactivo bloquearía a todos
+    los demás, así que se responde con "Connection: close".
+
+    La salida va a un búfer que se vacía al terminar cada petición, así que
+    cabeceras y cuerpo salen del servidor en una sola escritura; por eso se
+    desactiva el algoritmo de Nagle, que retrasaría las respuestas encadenadas.
+
+    El cuerpo de la petición (Content-Length) que el manejador no lea se
+    descarta al terminar, para que no se lea como la petición siguiente; si
+    quedan más de max_unread_body bytes sin leer, o el cuerpo va con
+    Transfer-Encoding: chunked, se cierra la conexión.
+    """
+
+    protocol_version = 'HTTP/1.1'
+    # Segundos de inactividad antes de cerrar una conexión persistente
+    timeout = 5
+    wbufsize = -1
+    disable_nagle_algorithm = True
+    # Bytes del cuerpo sin leer que se descartan para mantener la conexión
+    max_unread_body = 64 * 1024
+
+    def parse_request(self):
+        self._request_start = time.perf_counter()
+        self._response_size = None
+        if not super().parse_request():
+            return False
+        if 'chunked' in self.headers.get('Transfer-Encoding', '').lower():
+            # No se sabe dónde acaba el cuerpo: la conexión no se reutiliza
+            self.close_connection = True
+            return True
+        length = self.headers.get('Content-Length')
+        if length is None:
+            return True
+        length = _content_length(length)
+        if length is None:
+            self.send_error(400, "Content-Length no válido")
+            return False
+        if length:
+            self.rfile = _RequestBody(self.rfile, length)
+        return True
+
+    def handle_one_request(self):
+        """
+        Atiende una petición y, si el servidor tiene access_log, la registra
+        con su estado, bytes enviados y duración
+        """
+        self._log_status = None
+        super().handle_one_request()
+        if isinstance(self.rfile, _RequestBody):
+            body, self.rfile = self.rfile, self.rfile.raw
+            if body.remaining > self.max_unread_body:
+                self.close_connection = True
+            elif not self.close_connection:
+                body.discard()
+        if self._log_status is not None:
+            duration_us = int((time.perf_counter() - self._request_start) * 1e6)
+            self.server.access_log.record(self.client_address[0], self.command, self.path,
+                                          self._log_status, self._response_size, duration_us)
+
+    def log_request(self, code='-', size='-'):
+        """
+        Sin access_log en el servidor escribe la línea habitual en stderr; con
+        access_log guarda el estado y el registro se hace al terminar la petición
+        """
+        if getattr(self.server, 'access_log', None) is None:
+            super().log_request(code, size)
+            return
+        self._log_status = int(code)
+        if size != '-':
+            self._response_size = size
+
+    def send_body(self, status, content_type, body, headers=None, compressed=None):
+        """
+        Envía una respuesta completa con Content-Type y Content-Length.
+
+        El cuerpo se comprime si el cliente lo acepta (ver choose_encoding).
+        'compressed' es una función opcional (codificación, nivel) -> bytes que
+        devuelve el cuerpo ya comprimido desde una caché.
+        """
+        coding, vary = self.choose_encoding(content_type, body)
+        if vary:
+            headers = _add_vary(headers, "Accept-Encoding")
+        self._send_encoded(status, content_type, body, headers, coding, compressed)
+
+    def send_conditional(self, content_type, body, etag, last_modified, headers=None, compressed=None):
+        """
+        Envía una respuesta 200 con ETag y Last-Modified, o un 304 sin cuerpo si
+        la copia que ya tiene el cliente (If-None-Match / If-Modified-Since)
+        sigue siendo válida. Cada codificación del cuerpo tiene su propio ETag.
+        """
+        coding, vary = self.choose_encoding(content_type, body)
+        if coding:
+            etag = f'{etag[:-1]}-{coding}"'
+        validators = {"ETag": etag, "Last-Modified": self.date_time_string(last_modified)}
+        if headers:
+            validators.update(headers)
+        if vary:
+            validators = _add_vary(validators, "Accept-Encoding")
+        if self.not_modified(etag, last_modified):
+            self.send_response(304)
+            for name, value in validators.items():
+                self.send_header(name, value)
+            if not getattr(self.server, 'persistent_connections', False):
+                self.send_header("Connection", "close")
+            self.end_headers()
+            self._response_size = 0
+        else:
+            self._send_encoded(200, content_type, body, validators, coding, compressed)
+
+    def choose_encoding(self, content_type, body):
+        """
+        Devuelve (codificación, vary): la codificación negociada con
+        Accept-Encoding (None para enviar sin comprimir) y si la respuesta
+        depende de Accept-Encoding. Solo se comprimen los tipos de texto con
+        al menos server.compress_min_size bytes, y nunca si el servidor tiene
+        compress_level = 0.
+        """
+        if not _should_compress(self.server, content_type, body):
+            return None, False
+        return negotiate(self.headers.get("Accept-Encoding")), True
+
+    def _send_encoded(self, status, content_type, body, headers, coding, compressed):
+        if coding:
+            level = self.server.compress_level
+            body = compressed(coding, level) if compressed else compress(body, coding, level)
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        if coding:
+            self.send_header("Content-Encoding", coding)
+        if headers:
+            for name, value in headers.items():
+                self.send_header(name, value)
+        if not getattr(self.server, 'persistent_connections', False):
+            self.send_header("Connection", "close")
+        self.end_headers()
+        self.wfile.write(body)
+        self._response_size = len(body)
+
+    def not_modified(self, etag, last_modified):
+        """
+        Indica si la copia del cliente sigue siendo válida. If-None-Match tiene
+        prioridad sobre If-Modified-Since, como indica RFC 9110.
+        """
+        if_none_match = self.headers.get("If-None-Match")
+        if if_none_match is not None:
+            tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+            return "*" in tags or etag.removeprefix("W/") in tags
+        if_modified_since = self.headers.get("If-Modified-Since")
+        if if_modified_since is not None:
+            try:
+                since = email.utils.parsedate_to_datetime(if_modified_since).timestamp()
+            except (TypeError, ValueError):
+                return False
+            return int(last_modified) <= since
+        return False
+
+    def send_raw(self, status, data):
+        """
+        Envía una respuesta ya codificada con encode_static(), en una sola
+        escritura, añadiendo la cabecera Date del momento del envío
+        """
+        self.log_request(status, len(data))
+        if not getattr(self.server, 'persistent_connections', False):
+            self.close_connection = True
+        status_line, _, rest = data.partition(b'\r\n')
+        self.wfile.write(b''.join((status_line, b'\r\n', _date_header(), rest)))
+
+
+class _RequestBody:
+    """
+    Entrada de una petición con cuerpo: no deja leer más allá de los
+    Content-Length bytes del cuerpo y cuenta los que quedan por leer
+    """
+
+    def __init__(self, raw, length):
+        self.raw = raw
+        self.remaining = length
+
+    def read(self, size=-1):
+        if size is None or size < 0 or size > self.remaining:
+            size = self.remaining
+        data = self.raw.read(size)
+        self.remaining -= len(data)
+        return data
+
+    def readline(self, size=-1):
+        if size is None or size < 0 or size > self.remaining:
+            size = self.remaining
+        data = self.raw.readline(size)
+        self.remaining -= len(data)
+        return data
+
+    def discard(self):
+        while self.remaining and self.read(min(self.remaining, 16 * 1024)):
+            pass
+
+
+class ThreadPoolHTTPServer(HTTPServer):
+    """
+    HTTPServer que atiende las conexiones con un número fijo de hilos.
+
+    El hilo que ejecuta serve_forever() solo acepta conexiones y las deja en una
+    cola acotada; los hilos del grupo las van sacando y procesando. Cuando la
+    cola está llena, el hilo aceptador se bloquea y las nuevas conexiones esperan
+    en el backlog del sistema operativo, de modo que la memoria usada no crece
+    aunque lleguen más clientes de los que se pueden atender.
+    """
+
+    daemon_threads = True
+    persistent_connections = True
+
+    def __init__(self, server_address, RequestHandlerClass, workers=8,
+                 queue_size=64, bind_and_activate=True):
+        self.workers = workers
+        self._connections = queue.Queue(maxsize=queue_size)
+        self._threads = []
+        super().__init__(server_address, RequestHandlerClass, bind_and_activate)
+        for i in range(workers):
+            thread = threading.Thread(target=self._worker, name=f'http-worker-{i}')
+            thread.daemon = self.daemon_threads
+            thread.start()
+            self._threads.append(thread)
+
+    def process_request(self, request, client_address):
+        """
+        Encola la conexión aceptada para que la atienda un hilo del grupo
+        """
+        self._connections.put((request, client_address))
+
+    def _worker(self):
+        """
+        Bucle de cada hilo del grupo: atiende conexiones hasta recibir None
+        """
+        while True:
+            item = self._connections.get()
+            if item is None:
+                return
+            request, client_address = item
+            try:
+                self.finish_request(request, client_address)
+            except Exception:
+                self.handle_error(request, client_address)
+            finally:
+                self.shutdown_request(request)
+
+    def server_close(self):
+        """
+        Cierra el socket de escucha y detiene los hilos del grupo
+        """
+        super().server_close()
+        for _ in self._threads:
+            self._connections.put(None)
+        # Se espera como mucho un segundo en total: los hilos ocupados con una
+        # conexión persistente terminan solos al vencer su timeout
+        deadline = time.monotonic() + 1
+        for thread in self._threads:
+            thread.join(max(0, deadline - time.monotonic()))
+        self._threads = []
+
+
+class AsyncRequest:
+    """
+    Petición HTTP recibida por una ruta asíncrona de AsyncioHTTPServer
+    """
+
+    def __init__(self, method, path, headers, body, client_address):
+        self.method = method
+        self.path = path
+        self.headers = headers
+        self.body = body
+        self.client_address = client_address
+
+
+class AsyncioHTTPServer:
+    """
+    Servidor HTTP sobre un bucle de eventos asyncio.
+
+    Tiene la misma interfaz que HTTPServer (serve_forever, shutdown,
+    server_close, server_address, server_port), así que se puede usar con
+    run_server y con los tests existentes.
+
+    Las peticiones se leen de forma asíncrona y se entregan completas al
+    manejador BaseHTTPRequestHandler, que escribe la respuesta en memoria; el
+    manejador no necesita ningún cambio. Las conexiones inactivas no ocupan
+    ningún hilo, solo una corrutina esperando datos.
+
+    Para rutas nuevas se pueden registrar corrutinas con route(); reciben un
+    AsyncRequest y devuelven (estado, cabeceras, cuerpo).
+    """
+
+    address_family = socket.AF_INET
+    request_queue_size = 5
+    allow_reuse_address = True
+    persistent_connections = True
+    # Segundos que se mantiene abierta una conexión sin recibir peticiones,
+    # si el manejador no define su propio timeout
+    idle_timeout = 15
+
+    def __init__(self, server_address, RequestHandlerClass, bind_and_activate=True):
+        self.server_address = server_address
+        self.RequestHandlerClass = RequestHandlerClass
+        self.socket = socket.socket(self.address_family, socket.SOCK_STREAM)
+        self.routes = {}
+        self._loop = None
+        self._stop = None
+        self._tasks = set()
+        self._started = threading.Event()
+        self._stopped = threading.Event()
+        if bind_and_activate:
+            try:
+                self.server_bind()
+                self.server_activate()
+            except BaseException:
+                self.server_close()
+                raise
+
+    def server_bind(self):
+        if self.allow_reuse_address:
+            self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self.socket.bind(self.server_address)
+        self.server_address = self.socket.getsockname()
+        host, port = self.server_address[:2]
+        self.server_name = socket.getfqdn(host)
+        self.server_port = port
+
+    def server_activate(self):
+        self.socket.listen(self.request_queue_size)
+        self.socket.setblocking(False)
+
+    def route(self, path, method='GET'):
+        """
+        Decorador para registrar una corrutina como manejador de una ruta
+        """
+        def decorator(func):
+            self.routes[(method, path)] = func
+            return func
+        return decorator
+
+    def serve_forever(self, poll_interval=None):
+        """
+        Ejecuta el bucle de eventos hasta que se llame a shutdown()
+        """
+        self._stopped.clear()
+        self._loop = asyncio.new_event_loop()
+        try:
+            self._loop.run_until_complete(self._serve())
+        finally:
+            self._loop.close()
+            self._stopped.set()
+
+    def shutdown(self):
+        """
+        Detiene serve_forever() desde otro hilo y espera a que termine
+        """
+        if not self._started.is_set():
+            return
+        self._loop.call_soon_threadsafe(self._stop.set)
+        self._stopped.wait()
+        self._started.clear()
+
+    def server_close(self):
+        self.socket.close()
+
+    async def _serve(self):
+        self._stop = asyncio.Event()
+        server = await asyncio.start_server(self._handle_connection, sock=self.socket)
+        self._started.set()
+        await self._stop.wait()
+        server.close()
+        for task in list(self._tasks):
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        await server.wait_closed()
+
+    async def _handle_connection(self, reader, writer):
+        """
+        Atiende todas las peticiones de una conexión, en orden
+        """
+        self._tasks.add(asyncio.current_task())
+        client_address = writer.get_extra_info('peername')
+        idle_timeout = self.RequestHandlerClass.timeout or self.idle_timeout
+        try:
+            while True:
+                try:
+                    head = await asyncio.wait_for(reader.readuntil(b'\r\n\r\n'), idle_timeout)
+                except (asyncio.IncompleteReadError, asyncio.LimitOverrunError,
+                        asyncio.TimeoutError, ConnectionError):
+                    break
+                request_line, _, header_lines = head.partition(b'\r\n')
+                headers = http.client.parse_headers(io.BytesIO(header_lines))
+                if 'chunked' in headers.get('Transfer-Encoding', '').lower():
+                    # Los cuerpos con chunked no se admiten: se responde y se cierra
+                    writer.write(encode_response(411, {'Connection': 'close'}, b''))
+                    break
+                length = _content_length(headers.get('Content-Length', '0'))
+                if length is None:
+                    # Sin una longitud válida no se sabe dónde acaba el cuerpo
+                    writer.write(encode_response(400, {'Connection': 'close'}, b''))
+                    break
+                body = await reader.readexactly(length)
+
+                parts = request_line.decode('iso-8859-1').split()
+                route = self.routes.get((parts[0], parts[1].partition('?')[0])) if len(parts) == 3 else None
+                if route is not None:
+                    request = AsyncRequest(parts[0], parts[1], headers, body, client_address)
+                    try:
+                        status, response_headers, response_body = await route(request)
+                    except Exception:
+                        status, response_headers, response_body = 500, {}, b''
+                    close = _wants_close(parts[2], headers)
+                    response_headers = dict(response_headers)
+                    if close:
+                        response_headers['Connection'] = 'close'
+                    data = encode_response(status, response_headers, response_body)
+                else:
+                    data, close = self._run_handler(head + body, client_address)
+
+                writer.write(data)
+                await writer.drain()
+                if close:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self._tasks.discard(asyncio.current_task())
+            writer.close()
+
+    def _run_handler(self, data, client_address):
+        """
+        Ejecuta el manejador BaseHTTPRequestHandler sobre una petición completa.
+        Devuelve los bytes de la respuesta y si hay que cerrar la conexión.
+        """
+        handler = self.RequestHandlerClass.__new__(self.RequestHandlerClass)
+        handler.server = self
+        handler.request = None
+        handler.client_address = client_address
+        handler.rfile = io.BytesIO(data)
+        handler.wfile = io.BytesIO()
+        handler.close_connection = True
+        handler.handle_one_request()
+        return handler.wfile.getvalue(), handler.close_connection
+
+
+class PreforkHTTPServer:
+    """
+    Servidor HTTP con varios procesos hijos que comparten el puerto de escucha.
+
+    El proceso padre crea el socket y, en serve_forever(), arranca 'processes'
+    hijos con fork. Cada hijo ejecuta su propio servidor (server_class, con
+    server_kwargs) sobre el socket heredado, de modo que el sistema operativo
+    reparte las conexiones entre ellos. Con reuse_port=True cada hijo abre su
+    propio socket con SO_REUSEPORT en el mismo puerto y es el núcleo quien
+    reparte las conexiones de forma equilibrada.
+
+    El padre solo supervisa: vuelve a arrancar los hijos que terminan
+    inesperadamente y, al recibir SIGTERM (o SIGINT) o al llamar a shutdown(),
+    envía SIGTERM a los hijos, que dejan de aceptar conexiones y terminan.
+
+    Tiene la misma interfaz que HTTPServer (serve_forever, shutdown,
+    server_close, server_address, server_port). Los atributos que se añadan al
+    servidor antes de serve_forever() (por ejemplo la tabla de rutas de ej2a1)
+    se copian al servidor de cada hijo.
+    """
+
+    address_family = socket.AF_INET
+    request_queue_size = 5
+    allow_reuse_address = True
+    # Segundos que se espera a que los hijos terminen antes de matarlos
+    shutdown_timeout = 5
+    # Un hijo que termina antes de este número de segundos se vuelve a
+    # arrancar con este mismo retraso, para no entrar en un bucle de forks
+    restart_delay = 1
+
+    def __init__(self, server_address, RequestHandlerClass, processes=2, reuse_port=False,
+                 server_class=HTTPServer, server_kwargs=None, bind_and_activate=True):
+        if not hasattr(os, 'fork'):
+            raise ValueError('El modo con varios procesos necesita os.fork')
+        if reuse_port and not hasattr(socket, 'SO_REUSEPORT'):
+            raise ValueError('SO_REUSEPORT no está disponible en este sistema')
+        self.server_address = server_address
+        self.RequestHandlerClass = RequestHandlerClass
+        self.processes = processes
+        self.reuse_port = reuse_port
+        self.server_class = server_class
+        self.server_kwargs = server_kwargs or {}
+        self.persistent_connections = getattr(server_class, 'persistent_connections', False)
+        self.restarts = 0
+        self.socket = socket.socket(self.address_family, socket.SOCK_STREAM)
+        self._workers = {}
+        self._pending = {}
+        self._running = threading.Event()
+        self._stop = threading.Event()
+        self._stopped = threading.Event()
+        self._own_attributes = set(vars(self))
+        if bind_and_activate:
+            try:
+                self.server_bind()
+                self.server_activate()
+            except BaseException:
+                self.server_close()
+                raise
+
+    def server_bind(self):
+        if self.allow_reuse_address:
+            self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        if self.reuse_port:
+            self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+        self.socket.bind(self.server_address)
+        self.server_address = self.socket.getsockname()
+        host, port = self.server_address[:2]
+        self.server_name = socket.getfqdn(host)
+        self.server_port = port
+
+    def server_activate(self):
+        # Con SO_REUSEPORT el padre solo reserva el puerto; escuchan los hijos
+        if not self.reuse_port:
+            self.socket.listen(self.request_queue_size)
+
+    def fileno(self):
+        return self.socket.fileno()
+
+    @property
+    def worker_pids(self):
+        """
+        Identificadores de los procesos hijos en ejecución
+        """
+        return list(self._workers)
+
+    def serve_forever(self, poll_interval=0.5):
+        """
+        Arranca los hijos y los supervisa hasta que se llame a shutdown() o
+        llegue SIGTERM
+        """
+        self._stop.clear()
+        self._stopped.clear()
+        previous_handler = None
+        if threading.current_thread() is threading.main_thread():
+            previous_handler = signal.signal(signal.SIGTERM, lambda signum, frame: self._stop.set())
+        self._running.set()
+        try:
+            for slot in range(self.processes):
+                self._spawn(slot)
+            while not self._stop.wait(poll_interval):
+                self._reap()
+                now = time.monotonic()
+                for slot, due in list(self._pending.items()):
+                    if due <= now:
+                        del self._pending[slot]
+                        self._spawn(slot)
+        finally:
+            self._terminate_workers()
+            if previous_handler is not None:
+                signal.signal(signal.SIGTERM, previous_handler)
+            self._running.clear()
+            self._stopped.set()
+
+    def shutdown(self):
+        """
+        Detiene serve_forever() desde otro hilo y espera a que terminen los hijos
+        """
+        if not self._running.is_set():
+            return
+        self._stop.set()
+        self._stopped.wait()
+
+    def server_close(self):
+        self.socket.close()
+
+    def _spawn(self, slot):
+        """
+        Arranca el hijo que ocupa la posición 'slot'
+        """
+        pid = os.fork()
+        if pid == 0:
+            status = 1
+            try:
+                self._run_worker()
+                status = 0
+            except BaseException:
+                traceback.print_exc()
+            finally:
+                os._exit(status)
+        self._workers[pid] = (slot, time.monotonic())
+
+    def _run_worker(self):
+        """
+        Cuerpo de cada hijo: sirve peticiones hasta recibir SIGTERM
+        """
+        # Ctrl+C llega a todo el grupo de procesos; la parada la coordina el padre
+        signal.signal(signal.SIGINT, signal.SIG_IGN)
+        server = self.server_class(self.server_address, self.RequestHandlerClass,
+                                   bind_and_activate=False, **self.server_kwargs)
+        if self.reuse_port:
+            server.socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+            server.request_queue_size = self.request_queue_size
+            server.server_bind()
+            server.server_activate()
+            self.socket.close()
+        else:
+            server.socket.close()
+            server.socket = self.socket
+            server.server_name = self.server_name
+            server.server_port = self.server_port
+        for name, value in vars(self).items():
+            if name not in self._own_attributes:
+                setattr(server, name, value)
+        # shutdown() espera a que termine serve_forever, así que no puede
+        # llamarse desde el manejador de la señal, que se ejecuta en este hilo
+        signal.signal(signal.SIGTERM, lambda signum, frame: threading.Thread(
+            target=server.shutdown, daemon=True).start())
+        try:
+            server.serve_forever()
+        finally:
+            server.server_close()
+
+    def _reap(self):
+        """
+        Recoge los hijos que han terminado y programa su nuevo arranque
+        """
+        for pid in list(self._workers):
+            try:
+                done, _ = os.waitpid(pid, os.WNOHANG)
+            except ChildProcessError:
+                done = pid
+            if not done:
+                continue
+            slot, started = self._workers.pop(pid)
+            self.restarts += 1
+            if time.monotonic() - started < self.restart_delay:
+                self._pending[slot] = time.monotonic() + self.restart_delay
+            else:
+                self._spawn(slot)
+
+    def _terminate_workers(self):
+        """
+        Envía SIGTERM a los hijos y espera a que terminen; mata los que no lo hagan a tiempo
+        """
+        self._pending.clear()
+        for pid in self._workers:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+        deadline = time.monotonic() + self.shutdown_timeout
+        while self._workers and time.monotonic() < deadline:
+            for pid in list(self._workers):
+                try:
+                    done, _ = os.waitpid(pid, os.WNOHANG)
+                except ChildProcessError:
+                    done = pid
+                if done:
+                    del self._workers[pid]
+            time.sleep(0.01)
+        for pid in list(self._workers):
+            try:
+                os.kill(pid, signal.SIGKILL)
+                os.waitpid(pid, 0)
+            except (ProcessLookupError, ChildProcessError):
+                pass
+            del self._workers[pid]
+
+
+class Router:
+    """
+    Despachador de rutas compilado.
+
+    Las rutas fijas ('/status') se guardan en un diccionario y las rutas con
+    parámetros ('/product/<int:product_id>') se convierten a expresiones
+    regulares una sola vez al registrarlas, agrupadas por su primer segmento;
+    así cada petición solo prueba los patrones que empiezan igual que su ruta.
+    """
+
+    # Conversores admitidos en los parámetros: (expresión, función de conversión)
+    converters = {
+        'int': (r'\d+', int),
+        'str': (r'[^/]+', str),
+    }
+
+    def __init__(self):
+        self._static = {}
+        self._patterns = {}
+
+    def add(self, rule, endpoint):
+        """
+        Registra una ruta. Los parámetros se escriben como <nombre> o <conversor:nombre>.
+        """
+        if '<' not in rule:
+            self._static[rule] = endpoint
+            return
+        regex = []
+        converters = {}
+        for segment in rule.split('/')[1:]:
+            if segment.startswith('<') and segment.endswith('>'):
+                converter, _, name = segment[1:-1].rpartition(':')
+                pattern, converters[name] = self.converters[converter or 'str']
+                regex.append(f'(?P<{name}>{pattern})')
+            else:
+                regex.append(re.escape(segment))
+        compiled = re.compile('/' + '/'.join(regex))
+        prefix = rule[1:].partition('/')[0]
+        self._patterns.setdefault(prefix, []).append((compiled, converters, endpoint))
+
+    def match(self, path):
+        """
+        Devuelve (endpoint, parámetros) para la ruta, o (None, None) si no coincide.
+        Se ignora la query string.
+        """
+        path = path.partition('?')[0]
+        endpoint = self._static.get(path)
+        if endpoint is not None:
+            return endpoint, {}
+        for compiled, converters, endpoint in self._patterns.get(path[1:].partition('/')[0], ()):
+            match = compiled.fullmatch(path)
+            if match:
+                return endpoint, {name: converters[name](value) for name, value in match.groupdict().items()}
+        return None, None
+
+
+def _add_vary(headers, field):
+    """
+    Devuelve una copia de las cabeceras con 'field' añadido a Vary
+    """
+    headers = dict(headers or {})
+    vary = headers.get("Vary")
+    headers["Vary"] = f"{vary}, {field}" if vary else field
+    return headers
+
+
+def _wants_close(version, headers):
+    """
+    Indica si la conexión debe cerrarse tras responder, según HTTP/1.0 o 1.1
+    """
+    connection = headers.get('Connection', '').lower()
+    if version == 'HTTP/1.1':
+        return connection == 'close'
+    return connection != 'keep-alive'
+
+
+# (segundo, línea Date) de la última respuesta de send_raw(): la fecha solo
+# cambia una vez por segundo, así que no se formatea en cada petición
+_date_line = (None, b'')
+
+
+def _date_header():
+    """
+    Línea de la cabecera Date con la hora actual
+    """
+    global _date_line
+    now = int(time.time())
+    second, line = _date_line
+    if second != now:
+        line = f'Date: {email.utils.formatdate(now, usegmt=True)}\r\n'.encode('latin-1')
+        _date_line = (now, line)
+    return line
+
+
+def _content_length(value):
+    """
+    Devuelve el Content-Length como entero, o None si no es un entero no
+    negativo escrito con dígitos ASCII (isdigit() admite también '²', que
+    int() rechaza)
+    """
+    value = value.strip()
+    if not (value.isascii() and value.isdigit()):
+        return None
+    return int(value)
+
+
+def encode_response(status, headers, body):
+    """
+    Construye los bytes de una respuesta HTTP/1.1 completa con Content-Length
+    """
+    reason = BaseHTTPRequestHandler.responses.get(status, ('',))[0]
+    lines = [f'HTTP/1.1 {status} {reason}']
+    lines.extend(f'{name}: {value}' for name, value in headers.items())
+    lines.append(f'Content-Length: {len(body)}')
+    return ('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1') + body
+
+
+def _should_compress(server, content_type, body):
+    """
+    Indica si una respuesta de este servidor se comprime cuando el cliente lo acepta
+    """
+    return (getattr(server, 'compress_level', 0) > 0
+            and len(body) >= server.compress_min_size
+            and is_compressible(content_type))
+
+
+def encode_static(server, status, content_type, body, coding=None):
+    """
+    Codifica una respuesta que nunca cambia para enviarla con send_raw().
+    Devuelve (estado, bytes), con la línea de estado y las cabeceras incluidas.
+    Con 'coding' el cuerpo se envía comprimido con esa codificación.
+    """
+    headers = {'Server': KeepAliveHandler.server_version, 'Content-Type': content_type}
+    if _should_compress(server, content_type, body):
+        headers['Vary'] = 'Accept-Encoding'
+    if coding:
+        body = compress(body, coding, server.compress_level)
+        headers['Content-Encoding'] = coding
+    if not getattr(server, 'persistent_connections', False):
+        headers['Connection'] = 'close'
+    return status, encode_response(status, headers, body)
+
+
+def encode_static_variants(server, status, content_type, body):
+    """
+    Codifica las versiones comprimidas de una respuesta fija: devuelve un
+    diccionario codificación -> (estado, bytes), vacío si no se comprime
+    """
+    if not _should_compress(server, content_type, body):
+        return {}
+    return {coding: encode_static(server, status, content_type, body, coding) for coding in CODINGS}
+
+
+def make_server(server_address, handler_class, workers=None, backlog=None,
+                queue_size=64, backend=None, processes=None, reuse_port=False,
+                compress_level=6, compress_min_size=256, access_log=None):
+    """
+    Crea el servidor HTTP para el manejador indicado.
+
+    - backend: "asyncio" para usar AsyncioHTTPServer; None para los servidores
+      basados en hilos.
+    - workers: número de hilos del grupo. Si es None se usa un HTTPServer
+      normal que atiende las peticiones de una en una (comportamiento original).
+    - backlog: tamaño de la cola de escucha del socket (listen). Si es None se
+      usa el valor por defecto de socketserver.
+    - queue_size: número máximo de conexiones aceptadas pendientes de atender
+      por el grupo de hilos.
+    - processes: número de procesos hijos (PreforkHTTPServer), cada uno con un
+      servidor del modo elegido por las opciones anteriores.
+    - reuse_port: con processes, cada hijo abre su propio socket con
+      SO_REUSEPORT en lugar de heredar el del padre.
+    - compress_level: nivel de compresión gzip/deflate (1-9) de las respuestas
+      de texto cuando el cliente lo acepta; 0 desactiva la compresión.
+    - compress_min_size: tamaño mínimo en bytes del cuerpo para comprimirlo.
+    - access_log: un AccessLog (o True para uno en stderr con las opciones por
+      defecto) para registrar las peticiones en segundo plano. Si es None se
+      usa log_message, que escribe cada línea en stderr al atender la petición.
+    """
+    if backend == 'asyncio':
+        if workers is not None:
+            raise ValueError('El backend asyncio no usa un grupo de hilos (workers)')
+        server_class, server_kwargs = AsyncioHTTPServer, {}
+    elif backend is not None:
+        raise ValueError(f'Backend desconocido: {backend}')
+    elif workers is None:
+        server_class, server_kwargs = HTTPServer, {}
+    else:
+        server_class, server_kwargs = ThreadPoolHTTPServer, {'workers': workers, 'queue_size': queue_size}
+    if processes is not None:
+        httpd = PreforkHTTPServer(server_address, handler_class, processes=processes,
+                                  reuse_port=reuse_port, server_class=server_class,
+                                  server_kwargs=server_kwargs, bind_and_activate=False)
+    elif reuse_port:
+        raise ValueError('reuse_port solo se usa junto con processes')
+    else:
+        httpd = server_class(server_address, handler_class, bind_and_activate=False, **server_kwargs)
+    if backlog is not None:
+        httpd.request_queue_size = backlog
+    httpd.compress_level = compress_level
+    httpd.compress_min_size = compress_min_size
+    httpd.access_log = AccessLog() if access_log is True else access_log
+    try:
+        httpd.server_bind()
+        httpd.server_activate()
+    except BaseException:
+        httpd.server_close()
+        raise
+    return httpd
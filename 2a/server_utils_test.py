@@ -0,0 +1,338 @@
+import pytest
+import io
+import json
+import os
+import signal
+import socket
+import threading
+import requests
+import time
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from access_log import AccessLog
+from server_utils import make_server, KeepAliveHandler, ThreadPoolHTTPServer, AsyncioHTTPServer, PreforkHTTPServer, Router
+
+
+class SlowHandler(BaseHTTPRequestHandler):
+    """
+    Manejador de prueba: /slow tarda 1 segundo en responder, /fast responde al momento
+    """
+
+    def do_GET(self):
+        if self.path == '/slow':
+            time.sleep(1)
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain")
+        self.end_headers()
+        self.wfile.write(self.path.encode())
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start(server):
+    thread = threading.Thread(target=server.serve_forever)
+    thread.daemon = True
+    thread.start()
+    time.sleep(0.2)
+    return thread
+
+
+def stop(server, thread):
+    server.shutdown()
+    server.server_close()
+    thread.join(1)
+
+
+@pytest.fixture
+def pool_server():
+    """
+    Servidor con un grupo de 4 hilos
+    """
+    server = make_server(("localhost", 8891), SlowHandler, workers=4, backlog=32, queue_size=8)
+    thread = start(server)
+    yield server
+    stop(server, thread)
+
+
+def test_default_mode_is_plain_http_server():
+    """
+    Sin opciones se mantiene el HTTPServer original
+    """
+    server = make_server(("localhost", 0), SlowHandler)
+    try:
+        assert type(server) is HTTPServer
+    finally:
+        server.server_close()
+
+
+def test_backlog_is_configurable():
+    """
+    El backlog de escucha se aplica al socket del servidor
+    """
+    server = make_server(("localhost", 0), SlowHandler, backlog=256)
+    try:
+        assert server.request_queue_size == 256
+    finally:
+        server.server_close()
+
+
+def test_pool_mode(pool_server):
+    """
+    Con workers se crea un servidor con un grupo fijo de hilos
+    """
+    assert isinstance(pool_server, ThreadPoolHTTPServer)
+    assert pool_server.workers == 4
+    response = requests.get("http://localhost:8891/fast")
+    assert response.status_code == 200
+    assert response.text == "/fast"
+
+
+def test_slow_client_does_not_block_others(pool_server):
+    """
+    Una petición lenta no impide atender otras peticiones a la vez
+    """
+    slow = threading.Thread(target=requests.get, args=("http://localhost:8891/slow",))
+    slow.start()
+    time.sleep(0.1)
+
+    start_time = time.perf_counter()
+    response = requests.get("http://localhost:8891/fast")
+    elapsed = time.perf_counter() - start_time
+    slow.join()
+
+    assert response.status_code == 200
+    assert elapsed < 0.5, "La petición rápida no debe esperar a la lenta."
+
+
+@pytest.fixture
+def async_server():
+    """
+    Servidor con el backend asyncio
+    """
+    server = make_server(("localhost", 8893), SlowHandler, backend="asyncio", backlog=512)
+    thread = start(server)
+    yield server
+    stop(server, thread)
+
+
+def test_asyncio_backend_runs_existing_handler(async_server):
+    """
+    El backend asyncio ejecuta el manejador BaseHTTPRequestHandler sin cambios
+    """
+    assert isinstance(async_server, AsyncioHTTPServer)
+    response = requests.get("http://localhost:8893/fast")
+    assert response.status_code == 200
+    assert response.text == "/fast"
+
+
+def test_asyncio_backend_native_route(async_server):
+    """
+    Las rutas asíncronas nativas tienen prioridad sobre el manejador
+    """
+    @async_server.route('/async')
+    async def async_view(request):
+        return 201, {'Content-Type': 'text/plain'}, request.method.encode()
+
+    response = requests.get("http://localhost:8893/async?x=1")
+    assert response.status_code == 201
+    assert response.text == "GET"
+
+
+def test_asyncio_backend_many_idle_connections(async_server):
+    """
+    Muchas conexiones abiertas sin actividad no impiden atender peticiones
+    """
+    idle = [socket.create_connection(("localhost", 8893)) for _ in range(300)]
+    try:
+        response = requests.get("http://localhost:8893/fast", timeout=2)
+        assert response.status_code == 200
+    finally:
+        for sock in idle:
+            sock.close()
+
+
+def test_asyncio_backend_invalid_content_length(async_server):
+    """
+    Un Content-Length no numérico, negativo o con dígitos no ASCII se responde
+    con 400 y se cierra la conexión
+    """
+    for length in (b"abc", b"-5", b"\xb2"):
+        with socket.create_connection(("localhost", 8893), timeout=5) as sock:
+            sock.sendall(b"POST /fast HTTP/1.1\r\nHost: localhost\r\nContent-Length: " + length + b"\r\n\r\n")
+            data = b""
+            while chunk := sock.recv(4096):
+                data += chunk
+        assert data.startswith(b"HTTP/1.1 400")
+        assert b"Connection: close" in data
+
+
+def test_unknown_backend():
+    """
+    Un backend desconocido produce un error
+    """
+    with pytest.raises(ValueError):
+        make_server(("localhost", 0), SlowHandler, backend="gevent")
+
+
+class PidHandler(BaseHTTPRequestHandler):
+    """
+    Manejador de prueba: responde con el pid del proceso y con server.greeting
+    """
+
+    def do_GET(self):
+        body = f"{os.getpid()} {self.server.greeting}".encode()
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture(params=[False, True], ids=["inherited", "reuse_port"])
+def prefork_server(request):
+    """
+    Servidor con 2 procesos hijos, con socket heredado o con SO_REUSEPORT
+    """
+    server = make_server(("localhost", 0), PidHandler, processes=2, reuse_port=request.param)
+    server.greeting = "hola"
+    thread = start(server)
+    yield server
+    stop(server, thread)
+
+
+def test_prefork_workers_serve_requests(prefork_server):
+    """
+    Las peticiones las atienden los hijos, que reciben los atributos del servidor
+    """
+    assert isinstance(prefork_server, PreforkHTTPServer)
+    pids = set(prefork_server.worker_pids)
+    assert len(pids) == 2
+    for _ in range(10):
+        pid, greeting = requests.get(f"http://localhost:{prefork_server.server_port}/").text.split()
+        assert int(pid) in pids
+        assert greeting == "hola"
+
+
+def test_prefork_restarts_crashed_worker(prefork_server):
+    """
+    El supervisor vuelve a arrancar un hijo que termina inesperadamente
+    """
+    prefork_server.restart_delay = 0
+    crashed = prefork_server.worker_pids[0]
+    os.kill(crashed, signal.SIGKILL)
+    deadline = time.monotonic() + 5
+    while time.monotonic() < deadline:
+        pids = prefork_server.worker_pids
+        if crashed not in pids and len(pids) == 2:
+            break
+        time.sleep(0.1)
+    assert crashed not in prefork_server.worker_pids
+    assert len(prefork_server.worker_pids) == 2
+    assert prefork_server.restarts == 1
+    response = requests.get(f"http://localhost:{prefork_server.server_port}/")
+    assert response.status_code == 200
+
+
+def test_prefork_shutdown_stops_workers(prefork_server):
+    """
+    shutdown() termina todos los hijos
+    """
+    pids = prefork_server.worker_pids
+    prefork_server.shutdown()
+    assert prefork_server.worker_pids == []
+    for pid in pids:
+        with pytest.raises(ProcessLookupError):
+            os.kill(pid, 0)
+
+
+def test_reuse_port_requires_processes():
+    """
+    reuse_port solo tiene sentido con varios procesos
+    """
+    with pytest.raises(ValueError):
+        make_server(("localhost", 0), SlowHandler, reuse_port=True)
+
+
+class BodyHandler(KeepAliveHandler):
+    """
+    Manejador de prueba basado en KeepAliveHandler
+    """
+
+    def do_GET(self):
+        self.send_body(200, "text/plain", b"hola")
+
+
+def test_access_log_records_requests():
+    """
+    Con access_log cada petición queda registrada con su estado y bytes
+    """
+    stream = io.StringIO()
+    access_log = AccessLog(stream=stream)
+    server = make_server(("localhost", 0), BodyHandler, workers=2, access_log=access_log)
+    thread = start(server)
+    try:
+        requests.get(f"http://localhost:{server.server_port}/saludo")
+    finally:
+        stop(server, thread)
+    access_log.close()
+    entry = json.loads(stream.getvalue())
+    assert entry["path"] == "/saludo"
+    assert entry["status"] == 200
+    assert entry["bytes"] == 4
+    assert entry["duration_us"] >= 0
+
+
+def read_all(sock):
+    data = b""
+    while chunk := sock.recv(4096):
+        data += chunk
+    return data
+
+
+def test_unread_body_is_discarded():
+    """
+    El cuerpo que el manejador no lee no se confunde con la petición siguiente
+    """
+    server = make_server(("localhost", 0), BodyHandler, workers=2)
+    thread = start(server)
+    try:
+        with socket.create_connection(("localhost", server.server_port), timeout=5) as sock:
+            sock.sendall(b"GET /uno HTTP/1.1\r\nHost: localhost\r\nContent-Length: 12\r\n\r\n"
+                         b"GET /x HTTP/"
+                         b"GET /dos HTTP/1.1\r\nHost: localhost\r\nConnection: close\r\n\r\n")
+            data = read_all(sock)
+        assert data.count(b"HTTP/1.1 200") == 2
+
+        # Con un cuerpo sin leer mayor que max_unread_body se responde y se cierra
+        with socket.create_connection(("localhost", server.server_port), timeout=5) as sock:
+            body = b"x" * (BodyHandler.max_unread_body + 1)
+            sock.sendall(b"GET /uno HTTP/1.1\r\nHost: localhost\r\nContent-Length: %d\r\n\r\n" % len(body)
+                         + body + b"GET /dos HTTP/1.1\r\nHost: localhost\r\n\r\n")
+            data = read_all(sock)
+        assert data.count(b"HTTP/1.1 200") == 1
+
+        for length in (b"-3", b"\xb2"):
+            with socket.create_connection(("localhost", server.server_port), timeout=5) as sock:
+                sock.sendall(b"GET /uno HTTP/1.1\r\nHost: localhost\r\nContent-Length: " + length + b"\r\n\r\n")
+                assert read_all(sock).startswith(b"HTTP/1.1 400")
+    finally:
+        stop(server, thread)
+
+
+def test_router():
+    """
+    El despachador distingue rutas fijas y con parámetros e ignora la query string
+    """
+    router = Router()
+    router.add('/status', 'status')
+    router.add('/product/<int:product_id>', 'get_product')
+    router.add('/user/<name>', 'get_user')
+
+    assert router.match('/status') == ('status', {})
+    assert router.match('/product/12?verbose=1') == ('get_product', {'product_id': 12})
+    assert router.match('/user/ana') == ('get_user', {'name': 'ana'})
+    assert router.match('/product/abc') == (None, None)
+    assert router.match('/product/1/extra') == (None, None)
+    assert router.match('/') == (None, None)
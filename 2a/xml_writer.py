@@ -0,0 +1,82 @@
+"""
+Serializador XML de una sola pasada para las APIs del apartado 2a.
+
+Recorre un árbol de ElementTree (por ejemplo el que genera dict_to_xml) y
+escribe el documento directamente, sin pasar por minidom: no se construye un
+DOM intermedio ni se vuelve a analizar el XML ya generado.
+
+Con indentación, el resultado es el mismo documento que produce
+minidom.parseString(...).toprettyxml(indent=...): declaración XML, un
+elemento por línea, el texto de los elementos simples en la misma línea y los
+elementos vacíos como <tag/>. Sin indentación (indent=None) el documento sale
+en una sola línea.
+"""
+
+_TEXT_ESCAPES = str.maketrans({'&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;'})
+_ATTR_ESCAPES = str.maketrans({'&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;',
+                               '\n': '&#10;', '\r': '&#13;', '\t': '&#9;'})
+
+XML_DECLARATION = '<?xml version="1.0" ?>'
+
+
+def escape_text(text):
+    """
+    Escapa el contenido de texto de un elemento
+    """
+    return text.translate(_TEXT_ESCAPES)
+
+
+def escape_attribute(value):
+    """
+    Escapa el valor de un atributo. Los saltos de línea y tabuladores se
+    escriben como referencias para que sobrevivan a la normalización de
+    atributos del analizador.
+    """
+    return value.translate(_ATTR_ESCAPES)
+
+
+def iter_xml(elem, indent="  ", declaration=True):
+    """
+    Genera el documento XML de 'elem' en fragmentos de texto, en orden
+    """
+    newline = '' if indent is None else '\n'
+    if declaration:
+        yield XML_DECLARATION + newline
+    yield from _iter_element(elem, indent, 0, newline)
+
+
+def serialize(elem, indent="  ", declaration=True, encoding='utf-8'):
+    """
+    Devuelve el documento XML de 'elem' codificado (bytes)
+    """
+    return ''.join(iter_xml(elem, indent, declaration)).encode(encoding)
+
+
+def _start_tag(elem):
+    if not elem.attrib:
+        return '<' + elem.tag
+    attrs = ''.join(f' {name}="{escape_attribute(str(value))}"' for name, value in elem.attrib.items())
+    return '<' + elem.tag + attrs
+
+
+def _iter_element(elem, indent, level, newline):
+    prefix = indent * level if indent else ''
+    start = _start_tag(elem)
+    text = elem.text
+    children = list(elem)
+
+    if not children:
+        if text:
+            yield f'{prefix}{start}>{escape_text(text)}</{elem.tag}>{newline}'
+        else:
+            yield f'{prefix}{start}/>{newline}'
+    else:
+        yield f'{prefix}{start}>{newline}'
+        inner = indent * (level + 1) if indent else ''
+        if text:
+            yield f'{inner}{escape_text(text)}{newline}'
+        for child in children:
+            yield from _iter_element(child, indent, level + 1, newline)
+            if child.tail:
+                yield f'{inner}{escape_text(child.tail)}{newline}'
+        yield f'{prefix}</{elem.tag}>{newline}'
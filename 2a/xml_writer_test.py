@@ -0,0 +1,52 @@
+import xml.etree.ElementTree as ET
+from xml.dom import minidom
+from xml_writer import serialize, escape_attribute
+
+
+def minidom_prettify(elem):
+    return minidom.parseString(ET.tostring(elem, 'utf-8')).toprettyxml(indent="  ").encode()
+
+
+def test_same_document_as_minidom():
+    """
+    Un producto plano sale igual que con el ida y vuelta por minidom
+    """
+    elem = ET.Element('product')
+    for key, val in {"id": 1, "name": "Laptop", "price": 999.99}.items():
+        ET.SubElement(elem, key).text = str(val)
+    assert serialize(elem) == minidom_prettify(elem)
+
+
+def test_nested_and_empty_elements():
+    """
+    Los elementos anidados se indentan y los vacíos se escriben como <tag/>
+    """
+    root = ET.Element('catalog', {'version': '2'})
+    item = ET.SubElement(root, 'item')
+    ET.SubElement(item, 'name').text = 'Tablet'
+    ET.SubElement(item, 'tags')
+    ET.SubElement(root, 'empty').text = ''
+    assert serialize(root) == minidom_prettify(root)
+
+
+def test_escaping_round_trips():
+    """
+    Texto y atributos con caracteres especiales se leen de vuelta sin cambios
+    """
+    text = 'a < b && c > "d" \'e\''
+    attr = 'x"<&>\n\ty'
+    elem = ET.Element('error', {'detail': attr})
+    elem.text = text
+    parsed = ET.fromstring(serialize(elem))
+    assert parsed.text == text
+    assert parsed.get('detail') == attr
+    assert escape_attribute('\n') == '&#10;'
+
+
+def test_compact_output():
+    """
+    Sin indentación el documento sale en una sola línea
+    """
+    elem = ET.Element('product')
+    ET.SubElement(elem, 'id').text = '1'
+    assert serialize(elem, indent=None, declaration=False) == b'<product><id>1</id></product>'
@@ -13,12 +13,15 @@ Nota: Si deseas cambiar el idioma del ejercicio, edita el archivo de prueba corr
 """
 
 from flask import Flask
+from response_cache import ResponseCache
 
 def create_app():
     """
     Crea y configura la aplicación Flask
     """
     app = Flask(__name__)
+    # Caché de respuestas para las vistas puras (misma ruta, misma respuesta)
+    cache = ResponseCache(app)
 
     # Aquí debes implementar los endpoints solicitados
 
@@ -36,6 +39,7 @@ def create_app():
 
     # endpoint 'greet'
     @app.route('/greet/<nombre>', methods=['GET'])
+    @cache.cached(maxsize=1024)
     def saludo_nombre(nombre):
         # La función devuelve el texto que se mostrará en el navegador.
         return f'¡Hola, {nombre}!', 200, {'Content-Type': 'text/plain; charset=utf-8'}
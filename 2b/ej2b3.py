@@ -21,13 +21,23 @@ Esta actividad te enseñará las diferentes formas de recibir parámetros en una
 Estos métodos son fundamentales para construir APIs web interactivas que puedan recibir información del cliente.
 """
 
-from flask import Flask, jsonify, request
+from flask import Flask, abort, jsonify, request
+from form_parser import parse_multipart
+from json_provider import FastJSONProvider
 
 def create_app():
     """
     Crea y configura la aplicación Flask
     """
     app = Flask(__name__)
+    app.json = FastJSONProvider(app)
+    # Tamaño máximo del cuerpo de la petición (se comprueba mientras se lee,
+    # con un 413 al superarlo) y memoria máxima por campo de un formulario
+    # multipart antes de pasarlo a un fichero temporal. Los campos de texto
+    # no pueden superar MAX_FORM_MEMORY_SIZE (500 KB por defecto en Flask),
+    # igual que con request.form.
+    app.config['MAX_CONTENT_LENGTH'] = 64 * 1024 * 1024
+    app.config['FORM_FIELD_MEMORY_LIMIT'] = 64 * 1024
 
     @app.route('/search', methods=['GET'])
     def search():
@@ -57,11 +67,40 @@ def create_app():
         # Implementa este endpoint para obtener los datos del formulario
         # y devolverlos en formato JSON
 
+        if request.mimetype == 'multipart/form-data':
+            # Los formularios multipart se leen por bloques: los campos que
+            # superan FORM_FIELD_MEMORY_LIMIT pasan a ficheros temporales
+            # mientras se lee el resto. La respuesta es la misma que con
+            # request.form: los campos de texto, sin los ficheros, y un 413 si
+            # un campo de texto supera MAX_FORM_MEMORY_SIZE; así la memoria
+            # necesaria para la respuesta está acotada aunque los ficheros
+            # sean grandes.
+            return jsonify(read_multipart())
+
         # Convierte los datos del formulario a un diccionario
         form_data = request.form
         # y se devuelven en json
         return jsonify(form_data)
 
+    def read_multipart():
+        boundary = request.mimetype_params.get('boundary')
+        if not boundary:
+            abort(400, description='Falta el boundary del formulario multipart')
+        parts = parse_multipart(request.stream, boundary,
+                                memory_limit=app.config['FORM_FIELD_MEMORY_LIMIT'],
+                                max_parts=app.config['MAX_FORM_PARTS'],
+                                max_field_size=app.config['MAX_FORM_MEMORY_SIZE'])
+        form_data = {}
+        try:
+            for part in parts:
+                # Igual que request.form: sin ficheros y el primer valor de cada campo
+                if part.filename is None and part.name not in form_data:
+                    form_data[part.name] = part.value()
+        finally:
+            for part in parts:
+                part.close()
+        return form_data
+
     @app.route('/json', methods=['POST'])
     def json_handler():
         """
@@ -1,3 +1,4 @@
+import io
 import pytest
 from flask.testing import FlaskClient
 from ej2b3 import create_app
@@ -70,3 +71,44 @@ def test_json_handler(client):
     assert response.json["user"]["name"] == "Ana", "El nombre del usuario debe estar en la respuesta."
     assert "admin" in response.json["user"]["roles"], "El rol 'admin' debe estar en la respuesta."
     assert response.json["settings"]["theme"] == "dark", "El tema debe estar en la respuesta."
+
+def test_form_handler_multipart(client):
+    """
+    Prueba el endpoint /form con un formulario multipart: se devuelven los
+    campos de texto, también los que superan el límite de memoria, y no los ficheros
+    """
+    data = {
+        "name": "Juan Pérez",
+        "comment": "ñ" * 100_000,
+        "doc": (io.BytesIO(b"x" * 200_000), "doc.txt", "text/plain"),
+    }
+    response = client.post("/form", data=data, content_type="multipart/form-data")
+    assert response.status_code == 200, "El código de estado debe ser 200."
+    assert response.json == {"name": "Juan Pérez", "comment": "ñ" * 100_000}, \
+        "La respuesta debe tener los campos de texto completos y no los ficheros."
+
+
+def test_form_handler_body_limit(client):
+    """
+    Un cuerpo mayor que MAX_CONTENT_LENGTH se rechaza con 413
+    """
+    client.application.config["MAX_CONTENT_LENGTH"] = 1024
+    data = {"doc": (io.BytesIO(b"x" * 4096), "doc.txt")}
+    response = client.post("/form", data=data, content_type="multipart/form-data")
+    assert response.status_code == 413, "El código de estado debe ser 413."
+
+
+def test_form_handler_text_field_limit(client):
+    """
+    Un campo de texto mayor que MAX_FORM_MEMORY_SIZE se rechaza con 413, como
+    con request.form; los ficheros grandes se siguen admitiendo
+    """
+    client.application.config["MAX_FORM_MEMORY_SIZE"] = 1024
+    data = {"comment": "x" * 4096}
+    response = client.post("/form", data=data, content_type="multipart/form-data")
+    assert response.status_code == 413, "El código de estado debe ser 413."
+
+    data = {"name": "Ana", "doc": (io.BytesIO(b"x" * 200_000), "doc.txt", "text/plain")}
+    response = client.post("/form", data=data, content_type="multipart/form-data")
+    assert response.status_code == 200, "El código de estado debe ser 200."
+    assert response.json == {"name": "Ana"}
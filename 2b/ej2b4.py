@@ -11,7 +11,8 @@ Además, debes crear una plantilla HTML utilizando Jinja2 que reciba una variabl
 Nota: Asegúrate de incluir una estructura HTML válida en la plantilla.
 """
 
-from flask import Flask, render_template_string
+from flask import Flask, Response, current_app, render_template, stream_template
+from jinja2 import ChoiceLoader, DictLoader, FileSystemBytecodeCache
 
 # Implementa la plantilla HTML aquí
 TEMPLATE = """
@@ -27,19 +28,70 @@ TEMPLATE = """
 </html>
 """
 
-def create_app():
+# Plantillas de la aplicación por nombre. Se cargan en el entorno Jinja2 de la
+# aplicación, que compila cada una la primera vez y la guarda compilada, en
+# lugar de recompilar el código fuente en cada petición como render_template_string.
+TEMPLATES = {
+    'greet.html': TEMPLATE,
+}
+
+# Tamaño mínimo (en caracteres) de cada fragmento enviado en modo streaming
+STREAM_CHUNK_SIZE = 16 * 1024
+
+def _group_chunks(chunks, size):
+    """
+    Agrupa los fragmentos pequeños que genera Jinja2 en bloques de al menos 'size' caracteres
+    """
+    buffer, length = [], 0
+    for chunk in chunks:
+        buffer.append(chunk)
+        length += len(chunk)
+        if length >= size:
+            yield ''.join(buffer)
+            buffer, length = [], 0
+    if buffer:
+        yield ''.join(buffer)
+
+def render(name, **context):
+    """
+    Renderiza una plantilla registrada. Con STREAM_TEMPLATES activado la
+    respuesta se envía a medida que se genera, en bloques de
+    STREAM_CHUNK_SIZE caracteres, sin construir antes la página completa.
+    """
+    if not current_app.config['STREAM_TEMPLATES']:
+        return render_template(name, **context)
+    chunks = stream_template(name, **context)
+    return Response(_group_chunks(chunks, current_app.config['STREAM_CHUNK_SIZE']), mimetype='text/html')
+
+def create_app(template_cache_dir=None, stream=False):
     """
     Crea y configura la aplicación Flask
+
+    Las plantillas de TEMPLATES se compilan al crear la aplicación. Con
+    template_cache_dir, Jinja2 guarda además el código compilado en ese
+    directorio, de modo que los siguientes arranques no tienen que compilarlas.
+    Con stream=True las páginas se envían en streaming (ver render).
     """
     app = Flask(__name__)
+    app.config['STREAM_TEMPLATES'] = stream
+    app.config['STREAM_CHUNK_SIZE'] = STREAM_CHUNK_SIZE
+    if template_cache_dir is not None:
+        app.jinja_options = {**app.jinja_options, 'bytecode_cache': FileSystemBytecodeCache(template_cache_dir)}
+    # Las plantillas registradas tienen prioridad sobre la carpeta templates/
+    loaders = [DictLoader(TEMPLATES)]
+    if app.jinja_loader is not None:
+        loaders.append(app.jinja_loader)
+    app.jinja_loader = ChoiceLoader(loaders)
+    for name in TEMPLATES:
+        app.jinja_env.get_template(name)
 
     @app.route('/greet/<nombre>', methods=['GET'])
     def greet(nombre):
         """
         Devuelve una página web que saluda al usuario utilizando una plantilla Jinja2
         """
-        # Utiliza render_template_string para renderizar la plantilla con el nombre proporcionado:
-        return render_template_string(TEMPLATE, nombre = nombre)
+        # Renderizamos la plantilla ya compilada con el nombre proporcionado:
+        return render('greet.html', nombre = nombre)
 
     return app
 
@@ -34,3 +34,47 @@ def test_greet_endpoint(client):
     assert "<html>" in html_content.lower(), "La respuesta debe contener la etiqueta <html>."
     assert "<body>" in html_content.lower(), "La respuesta debe contener la etiqueta <body>."
     assert f"¡hola, {nombre.lower()}!" in html_content.lower(), "La respuesta debe contener el mensaje '¡Hola, <nombre>!' dentro del cuerpo."
+
+def test_greet_escapes_name(client):
+    """
+    Prueba que el nombre se escapa en el HTML, igual que con render_template_string.
+    """
+    response = client.get("/greet/<b>Ana")
+    assert "&lt;b&gt;Ana" in response.data.decode("utf-8")
+
+def test_template_is_compiled_once():
+    """
+    Prueba que la plantilla se compila al crear la aplicación y se reutiliza en cada petición.
+    """
+    app = create_app()
+    template = app.jinja_env.get_template("greet.html")
+    with app.test_client() as client:
+        client.get("/greet/Ana")
+        client.get("/greet/Luis")
+    assert app.jinja_env.get_template("greet.html") is template
+
+def test_bytecode_cache(tmp_path):
+    """
+    Prueba que con template_cache_dir el código compilado se guarda en disco.
+    """
+    create_app(template_cache_dir=str(tmp_path))
+    assert list(tmp_path.iterdir()), "Debe guardarse el código compilado de la plantilla."
+    app = create_app(template_cache_dir=str(tmp_path))
+    with app.test_client() as client:
+        assert "¡Hola, Ana!" in client.get("/greet/Ana").data.decode("utf-8")
+
+def test_streaming_render():
+    """
+    Prueba que en modo streaming la página llega en varios bloques y con el mismo contenido.
+    """
+    app = create_app(stream=True)
+    app.config["STREAM_CHUNK_SIZE"] = 64
+    with app.test_client() as client:
+        response = client.get("/greet/Ana", buffered=False)
+        assert response.is_streamed
+        chunks = list(response.response)
+        assert len(chunks) > 1
+        html_content = b"".join(chunks).decode("utf-8")
+        assert "¡Hola, Ana!" in html_content
+    with create_app().test_client() as client:
+        assert client.get("/greet/Ana").data.decode("utf-8") == html_content
@@ -0,0 +1,112 @@
+"""
+Lectura en streaming de formularios multipart/form-data.
+
+request.form lee y guarda en memoria todos los campos de texto del
+formulario. parse_multipart() lee el cuerpo de la petición por bloques y
+entrega cada parte como un FormPart: las partes pequeñas se quedan en
+memoria y, en cuanto una parte supera memory_limit bytes, su contenido se
+pasa a un fichero temporal. Así la memoria usada por petición depende de
+memory_limit y del tamaño de bloque, no del tamaño del formulario.
+
+El límite del cuerpo completo lo aplica Flask al leer request.stream
+(MAX_CONTENT_LENGTH): si se supera, la lectura produce un 413 en ese momento,
+sin haber leído el resto. Los campos de texto tienen además su propio límite
+(max_field_size, como MAX_FORM_MEMORY_SIZE en request.form): su valor acaba
+entero en memoria al leerlo con value(), así que uno mayor produce un 413
+mientras se lee, sin llegar a guardarlo. Los ficheros no tienen ese límite.
+"""
+
+import io
+import tempfile
+from werkzeug.exceptions import BadRequest, RequestEntityTooLarge
+from werkzeug.sansio.multipart import Data, Epilogue, Field, File, MultipartDecoder, NeedData
+
+
+class FormPart:
+    """
+    Parte de un formulario: un campo de texto o un fichero, en memoria o en disco
+    """
+
+    def __init__(self, name, filename=None, content_type=None, memory_limit=64 * 1024):
+        self.name = name
+        self.filename = filename
+        self.content_type = content_type
+        self.size = 0
+        self.memory_limit = memory_limit
+        self._buffer = io.BytesIO()
+        self._file = None
+
+    @property
+    def in_memory(self):
+        return self._file is None
+
+    def write(self, data):
+        """
+        Añade datos a la parte; al superar memory_limit se pasa a un fichero temporal
+        """
+        self.size += len(data)
+        if self._file is None and self.size > self.memory_limit:
+            self._file = tempfile.TemporaryFile()
+            self._file.write(self._buffer.getvalue())
+            self._buffer = None
+        (self._buffer if self._file is None else self._file).write(data)
+
+    def stream(self):
+        """
+        Devuelve un objeto de fichero posicionado al principio del contenido
+        """
+        stream = self._buffer if self._file is None else self._file
+        stream.seek(0)
+        return stream
+
+    def value(self, charset='utf-8'):
+        """
+        Contenido de la parte como texto (desde el fichero temporal si se
+        pasó a disco)
+        """
+        if self._file is None:
+            return self._buffer.getvalue().decode(charset, 'replace')
+        return self.stream().read().decode(charset, 'replace')
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+
+
+def parse_multipart(stream, boundary, memory_limit=64 * 1024, chunk_size=64 * 1024, max_parts=1000,
+                    max_field_size=None):
+    """
+    Lee un cuerpo multipart/form-data de 'stream' por bloques de chunk_size
+    bytes y devuelve la lista de FormPart en orden. Quien llama debe cerrar
+    las partes (close) al terminar. Un campo de texto (sin nombre de
+    fichero) de más de max_field_size bytes produce RequestEntityTooLarge.
+    """
+    decoder = MultipartDecoder(boundary.encode('latin-1'), max_parts=max_parts)
+    parts = []
+    current = None
+    try:
+        while True:
+            event = decoder.next_event()
+            if isinstance(event, NeedData):
+                chunk = stream.read(chunk_size)
+                decoder.receive_data(chunk or None)
+            elif isinstance(event, (Field, File)):
+                filename = event.filename if isinstance(event, File) else None
+                current = FormPart(event.name, filename, event.headers.get('Content-Type'), memory_limit)
+                parts.append(current)
+            elif isinstance(event, Data):
+                if (max_field_size is not None and current.filename is None
+                        and current.size + len(event.data) > max_field_size):
+                    raise RequestEntityTooLarge(f'El campo {current.name!r} supera {max_field_size} bytes')
+                current.write(event.data)
+            elif isinstance(event, Epilogue):
+                return parts
+    except ValueError as e:
+        # Cuerpo mal formado o cortado antes del final
+        for part in parts:
+            part.close()
+        raise BadRequest(f'Formulario multipart no válido: {e}') from e
+    except RequestEntityTooLarge:
+        for part in parts:
+            part.close()
+        raise
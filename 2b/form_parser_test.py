@@ -0,0 +1,89 @@
+import io
+import pytest
+from werkzeug.exceptions import BadRequest, RequestEntityTooLarge
+from form_parser import FormPart, parse_multipart
+
+BOUNDARY = "----limite"
+
+
+def multipart(*parts):
+    """
+    Construye un cuerpo multipart a partir de (nombre, contenido, filename)
+    """
+    body = b""
+    for name, content, filename in parts:
+        disposition = f'form-data; name="{name}"'
+        if filename:
+            disposition += f'; filename="{filename}"'
+        body += f"--{BOUNDARY}\r\nContent-Disposition: {disposition}\r\n".encode()
+        if filename:
+            body += b"Content-Type: application/octet-stream\r\n"
+        body += b"\r\n" + content + b"\r\n"
+    return body + f"--{BOUNDARY}--\r\n".encode()
+
+
+def test_small_part_stays_in_memory():
+    """
+    Una parte por debajo del límite no crea fichero temporal
+    """
+    part = FormPart("name", memory_limit=10)
+    part.write(b"hola")
+    assert part.in_memory
+    assert part.value() == "hola"
+
+
+def test_large_part_spills_to_disk():
+    """
+    Al superar el límite el contenido pasa a un fichero temporal, sin perder datos
+    """
+    part = FormPart("doc", memory_limit=10)
+    part.write(b"0123456789")
+    part.write(b"abcdef")
+    assert not part.in_memory
+    assert part.size == 16
+    assert part.stream().read() == b"0123456789abcdef"
+    part.close()
+
+
+def test_parse_multipart_fields_and_files():
+    """
+    Los campos y ficheros se devuelven en orden, leyendo en bloques pequeños
+    """
+    big = b"x" * 5000
+    body = multipart(("name", "Juan Pérez".encode(), None), ("doc", big, "doc.bin"))
+    parts = parse_multipart(io.BytesIO(body), BOUNDARY, memory_limit=1024, chunk_size=100)
+    try:
+        assert [p.name for p in parts] == ["name", "doc"]
+        assert parts[0].in_memory and parts[0].value() == "Juan Pérez"
+        assert parts[1].filename == "doc.bin"
+        assert parts[1].content_type == "application/octet-stream"
+        assert not parts[1].in_memory
+        assert parts[1].stream().read() == big
+    finally:
+        for part in parts:
+            part.close()
+
+
+def test_parse_multipart_truncated_body():
+    """
+    Un cuerpo cortado antes del boundary final es un 400
+    """
+    body = multipart(("name", b"Ana", None))[:-10]
+    with pytest.raises(BadRequest):
+        parse_multipart(io.BytesIO(body), BOUNDARY)
+
+
+def test_parse_multipart_field_size_limit():
+    """
+    Un campo de texto mayor que max_field_size es un 413; un fichero no tiene ese límite
+    """
+    body = multipart(("comment", b"x" * 5000, None))
+    with pytest.raises(RequestEntityTooLarge):
+        parse_multipart(io.BytesIO(body), BOUNDARY, memory_limit=1024, chunk_size=100, max_field_size=4096)
+    body = multipart(("doc", b"x" * 5000, "doc.bin"))
+    parts = parse_multipart(io.BytesIO(body), BOUNDARY, memory_limit=1024, max_field_size=4096)
+    try:
+        assert parts[0].size == 5000
+    finally:
+        for part in parts:
+            part.close()
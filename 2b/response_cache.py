@@ -0,0 +1,142 @@
+"""
+Caché de respuestas para vistas GET puras de Flask.
+
+Una vista pura devuelve siempre la misma respuesta para la misma ruta (por
+ejemplo /greet/<nombre> en ej2b2). ResponseCache guarda los bytes de esas
+respuestas en un LRU acotado por vista, con caducidad opcional, y las sirve
+desde un before_request: en un acierto Flask no llega a despachar la vista
+ni a construir la respuesta a partir de su valor de retorno.
+
+Uso:
+    cache = ResponseCache(app)
+
+    @app.route('/greet/<nombre>')
+    @cache.cached(maxsize=256, ttl=60)
+    def saludo_nombre(nombre):
+        ...
+"""
+
+import collections
+import threading
+import time
+from flask import Response, current_app, request
+
+
+class LRUCache:
+    """
+    Diccionario acotado que descarta el elemento usado hace más tiempo, con
+    caducidad opcional (ttl, en segundos) y contadores de aciertos, fallos y
+    descartes
+    """
+
+    def __init__(self, maxsize=128, ttl=None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._data = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """
+        Devuelve el valor guardado, o None si no está o ha caducado
+        """
+        with self._lock:
+            item = self._data.get(key)
+            if item is not None:
+                value, expires = item
+                if expires is None or expires > time.monotonic():
+                    self._data.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._data[key]
+            self.misses += 1
+            return None
+
+    def set(self, key, value):
+        expires = None if self.ttl is None else time.monotonic() + self.ttl
+        with self._lock:
+            self._data[key] = (value, expires)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def stats(self):
+        return {'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions,
+                'size': len(self._data), 'maxsize': self.maxsize}
+
+    def __len__(self):
+        return len(self._data)
+
+
+class ResponseCache:
+    """
+    Extensión de Flask que sirve desde un LRU las respuestas de las vistas
+    marcadas con cached(). Solo se guardan las respuestas 200 a GET que no
+    se envían en streaming ni crean cookies.
+    """
+
+    def __init__(self, app=None):
+        # Una caché por vista, con la función de la vista como clave
+        self.caches = {}
+        self.app = None
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.app = app
+        app.extensions['response_cache'] = self
+        app.before_request(self._serve_cached)
+        app.after_request(self._store)
+
+    def cached(self, maxsize=128, ttl=None):
+        """
+        Decorador que marca una vista como cacheable. Vale para cualquier
+        vista, también de un blueprint o registrada con otro endpoint: en
+        cada petición se busca la función del endpoint en app.view_functions.
+        """
+        def decorator(view):
+            self.caches[view] = LRUCache(maxsize, ttl)
+            return view
+        return decorator
+
+    def stats(self, endpoint):
+        """
+        Contadores de la caché de una vista, por nombre de endpoint o función
+        """
+        view = self.app.view_functions[endpoint] if isinstance(endpoint, str) else endpoint
+        return self.caches[view].stats()
+
+    def _cache(self):
+        """
+        Caché de la vista de la petición actual, o None si no tiene
+        """
+        if request.method != 'GET':
+            return None
+        return self.caches.get(current_app.view_functions.get(request.endpoint))
+
+    def _serve_cached(self):
+        cache = self._cache()
+        if cache is None:
+            return None
+        entry = cache.get(request.full_path)
+        if entry is None:
+            return None
+        body, status, headers = entry
+        request.environ['response_cache.hit'] = True
+        return Response(body, status, headers)
+
+    def _store(self, response):
+        cache = self._cache()
+        if (cache is not None and response.status_code == 200
+                and not response.is_streamed and 'Set-Cookie' not in response.headers
+                and not request.environ.get('response_cache.hit')):
+            headers = [(name, value) for name, value in response.headers if name != 'Content-Length']
+            cache.set(request.full_path, (response.get_data(), response.status_code, headers))
+        return response
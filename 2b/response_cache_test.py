@@ -0,0 +1,115 @@
+import time
+import pytest
+from flask import Blueprint, Flask
+from response_cache import LRUCache, ResponseCache
+
+
+def test_lru_evicts_least_recently_used():
+    """
+    Al superar maxsize se descarta el elemento usado hace más tiempo
+    """
+    cache = LRUCache(maxsize=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.stats() == {"hits": 2, "misses": 1, "evictions": 1, "size": 2, "maxsize": 2}
+
+
+def test_lru_ttl():
+    """
+    Los elementos caducados cuentan como fallo
+    """
+    cache = LRUCache(ttl=0.05)
+    cache.set("a", 1)
+    assert cache.get("a") == 1
+    time.sleep(0.1)
+    assert cache.get("a") is None
+
+
+@pytest.fixture
+def app():
+    app = Flask(__name__)
+    cache = ResponseCache(app)
+    app.calls = 0
+
+    @app.route('/square/<int:n>')
+    @cache.cached(maxsize=2)
+    def square(n):
+        app.calls += 1
+        return str(n * n)
+
+    @app.route('/missing')
+    @cache.cached()
+    def missing():
+        app.calls += 1
+        return 'no', 404
+
+    return app
+
+
+def test_cached_response_skips_view(app):
+    """
+    La segunda petición a la misma ruta se sirve desde la caché sin ejecutar la vista
+    """
+    client = app.test_client()
+    assert client.get('/square/3').data == b'9'
+    assert client.get('/square/3').data == b'9'
+    assert app.calls == 1
+    stats = app.extensions['response_cache'].stats('square')
+    assert stats['hits'] == 1
+    assert stats['misses'] == 1
+
+
+def test_only_successful_responses_are_cached(app):
+    """
+    Las respuestas con error no se guardan
+    """
+    client = app.test_client()
+    client.get('/missing')
+    client.get('/missing')
+    assert app.calls == 2
+
+
+def test_blueprint_and_custom_endpoint():
+    """
+    Las vistas de un blueprint o con otro endpoint también se cachean, y dos
+    vistas con el mismo nombre de función tienen cada una su caché
+    """
+    app = Flask(__name__)
+    cache = ResponseCache(app)
+    calls = []
+    bp_a = Blueprint('a', __name__)
+    bp_b = Blueprint('b', __name__)
+
+    @bp_a.route('/a/view')
+    @cache.cached()
+    def view():
+        calls.append('a')
+        return 'a'
+
+    @bp_b.route('/b/view')
+    @cache.cached()
+    def view():  # noqa: F811
+        calls.append('b')
+        return 'b'
+
+    @cache.cached()
+    def other():
+        calls.append('other')
+        return 'other'
+
+    app.add_url_rule('/other', endpoint='otro', view_func=other)
+    app.register_blueprint(bp_a)
+    app.register_blueprint(bp_b)
+
+    client = app.test_client()
+    for _ in range(2):
+        assert client.get('/a/view').data == b'a'
+        assert client.get('/b/view').data == b'b'
+        assert client.get('/other').data == b'other'
+    assert calls == ['a', 'b', 'other']
+    assert cache.stats('a.view')['hits'] == 1
+    assert cache.stats(other)['hits'] == 1
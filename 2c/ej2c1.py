@@ -28,7 +28,8 @@ Ejemplo:
 2. Una solicitud `GET /product/999` debe devolver un mensaje de error con código 404.
 """
 
-from flask import Flask, jsonify
+from flask import Flask, jsonify, request
+from json_provider import FastJSONProvider
 
 # Lista de productos predefinida
 products = [
@@ -37,11 +38,16 @@ products = [
     {"id": 3, "name": "Tablet", "price": 349.99}
 ]
 
+# Número máximo de ids por defecto en GET /products?ids=...
+MAX_BATCH_IDS = 100
+
 def create_app():
     """
     Crea y configura la aplicación Flask
     """
     app = Flask(__name__)
+    app.json = FastJSONProvider(app)
+    app.config.setdefault('MAX_BATCH_IDS', MAX_BATCH_IDS)
 
     @app.route('/product/<int:product_id>', methods=['GET'])
     def get_product(product_id):
@@ -58,6 +64,28 @@ def create_app():
         # Si no se encuentra, devolvemos un error 404.
         return jsonify({'error': 'Product not found.'}), 404
 
+    @app.route('/products', methods=['GET'])
+    def get_products():
+        """
+        Devuelve varios productos en una sola respuesta: GET /products?ids=1,2,3
+        - Responde con los productos encontrados y la lista de ids que no existen
+        - Si faltan los ids, no son números o hay más de MAX_BATCH_IDS: error 400
+        """
+        limit = app.config['MAX_BATCH_IDS']
+        try:
+            ids = [int(value) for value in request.args.get('ids', '').split(',') if value]
+        except ValueError:
+            ids = []
+        # Quitamos los ids repetidos manteniendo el orden
+        ids = list(dict.fromkeys(ids))
+        if not ids or len(ids) > limit:
+            return jsonify({'error': f'Indica entre 1 y {limit} ids numéricos: /products?ids=1,2,3'}), 400
+        # Índice por id construido una sola vez por petición
+        index = {product['id']: product for product in products}
+        found = [index[product_id] for product_id in ids if product_id in index]
+        missing = [product_id for product_id in ids if product_id not in index]
+        return jsonify({'products': found, 'missing': missing}), 200
+
     return app
 
 if __name__ == '__main__':
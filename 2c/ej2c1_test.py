@@ -26,3 +26,17 @@ def test_get_product_not_found(client):
     response = client.get("/product/999")
     assert response.status_code == 404
     assert "error" in response.json
+
+def test_get_products_batch(client):
+    """Test GET /products?ids=... (returns found products and missing ids)"""
+    response = client.get("/products?ids=3,1,999,1")
+    assert response.status_code == 200
+    assert [product["id"] for product in response.json["products"]] == [3, 1]
+    assert response.json["missing"] == [999]
+
+def test_get_products_batch_invalid(client):
+    """Test GET /products with missing, invalid or too many ids (should return 400)"""
+    assert client.get("/products").status_code == 400
+    assert client.get("/products?ids=1,a").status_code == 400
+    client.application.config["MAX_BATCH_IDS"] = 2
+    assert client.get("/products?ids=1,2,3").status_code == 400
@@ -27,26 +27,151 @@ Si la lista de tareas inicial está vacía:
 Tu tarea es implementar esta API en Flask.
 """
 
-from flask import Flask, jsonify, request
+import base64
+import binascii
+import os
 
-# Esta lista almacenará todas las tareas
-tasks = []
-# Este contador se usará para asignar IDs únicos
-next_id = 1
+from flask import Flask, Response, jsonify, request, url_for
+from journal import Journal
+from json_provider import FastJSONProvider
+from sqlite_task_store import SQLiteTaskStore
+from task_store import TaskStore
 
-def create_app():
+# Tareas por página en GET /tasks si no se indica limit, y máximo admitido
+TASKS_PAGE_SIZE = 100
+MAX_TASKS_PAGE_SIZE = 1000
+
+# Operaciones máximas por petición en POST /tasks/bulk
+MAX_BULK_OPERATIONS = 10000
+
+# Cambios en el diario entre instantáneas con storage='journal'
+JOURNAL_SNAPSHOT_EVERY = 100_000
+
+def parse_operation(item):
+    """
+    Convierte un elemento de POST /tasks/bulk en una operación del almacén
+    ('create', None, datos), ('update', id, cambios) o ('delete', id, None).
+    Si el elemento no es válido devuelve el mensaje de error.
+    """
+    if not isinstance(item, dict) or item.get('op') not in ('create', 'update', 'delete'):
+        return 'Cada operación debe ser un objeto con "op": create, update o delete'
+    op = item['op']
+    if op == 'create':
+        if 'name' not in item:
+            return 'La operación create debe incluir el campo "name"'
+        return op, None, {key: value for key, value in item.items() if key != 'op'}
+    task_id = item.get('id')
+    if not isinstance(task_id, int) or isinstance(task_id, bool):
+        return f'La operación {op} debe incluir el "id" numérico de la tarea'
+    if op == 'update':
+        if 'name' not in item:
+            return 'La operación update debe incluir el campo "name"'
+        return op, task_id, {'name': item['name']}
+    return op, task_id, None
+
+def iter_lines(stream, chunk_size=64 * 1024):
+    """
+    Líneas de 'stream' leídas por bloques (leer línea a línea del flujo de
+    la petición es mucho más lento)
+    """
+    pending = b''
+    while True:
+        chunk = stream.read(chunk_size)
+        if not chunk:
+            break
+        lines = (pending + chunk).split(b'\n')
+        pending = lines.pop()
+        yield from lines
+    if pending:
+        yield pending
+
+def encode_cursor(task_id):
+    """
+    Cursor opaco que apunta detrás de la tarea task_id
+    """
+    return base64.urlsafe_b64encode(f'after:{task_id}'.encode()).decode().rstrip('=')
+
+def decode_cursor(cursor):
+    """
+    Devuelve el id codificado en el cursor, o None si no es válido
+    """
+    try:
+        text = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)).decode()
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        return None
+    prefix, _, value = text.partition(':')
+    # isdigit() solo con ASCII: acepta también dígitos Unicode como '²' que int() rechaza
+    if prefix != 'after' or not (value.isascii() and value.isdigit()):
+        return None
+    return int(value)
+
+def create_app(storage='memory', database=None):
     """
     Crea y configura la aplicación Flask
+
+    storage elige dónde se guardan las tareas:
+    - 'memory' (por defecto): en memoria, cada aplicación con las suyas
+    - 'sqlite': en la base de datos SQLite 'database' (por defecto
+      tasks.db en la carpeta instance), compartida por todos los procesos
+      que la abran y persistente entre reinicios
+    - 'journal': en memoria, con cada cambio guardado en un diario en el
+      directorio 'database' (por defecto tasks-journal en la carpeta
+      instance) para recuperar las tareas al reiniciar. El diario es de un
+      solo proceso: con serve.py, --workers 1.
     """
     app = Flask(__name__)
+    app.json = FastJSONProvider(app)
+    # Almacén de las tareas: indexado por id y seguro con varios hilos.
+    if storage == 'memory':
+        tasks = TaskStore()
+    elif storage == 'sqlite':
+        if database is None:
+            os.makedirs(app.instance_path, exist_ok=True)
+            database = os.path.join(app.instance_path, 'tasks.db')
+        tasks = SQLiteTaskStore(database)
+    elif storage == 'journal':
+        if database is None:
+            database = os.path.join(app.instance_path, 'tasks-journal')
+        tasks = TaskStore(Journal(database, snapshot_every=JOURNAL_SNAPSHOT_EVERY))
+    else:
+        raise ValueError(f"storage debe ser 'memory', 'sqlite' o 'journal', no {storage!r}")
+    app.extensions['task_store'] = tasks
+    app.config.setdefault('TASKS_PAGE_SIZE', TASKS_PAGE_SIZE)
+    app.config.setdefault('MAX_TASKS_PAGE_SIZE', MAX_TASKS_PAGE_SIZE)
+    app.config.setdefault('MAX_BULK_OPERATIONS', MAX_BULK_OPERATIONS)
 
     @app.route('/tasks', methods=['GET'])
     def get_tasks():
         """
-        Devuelve la lista completa de tareas
+        Devuelve la lista completa de tareas o, con limit o cursor, una página:
+        GET /tasks?limit=50&cursor=...
+        - Cada página tiene como máximo 'limit' tareas (TASKS_PAGE_SIZE si no se indica)
+        - Si hay más tareas, la cabecera Link (rel="next") lleva la URL de la
+          página siguiente, con su cursor
+        - Si limit o cursor no son válidos: error 400
         """
         # Implementa este endpoint
-        return jsonify(tasks)
+        if 'limit' not in request.args and 'cursor' not in request.args:
+            return jsonify(tasks.list())
+        try:
+            limit = int(request.args.get('limit', app.config['TASKS_PAGE_SIZE']))
+        except ValueError:
+            limit = 0
+        if not 1 <= limit <= app.config['MAX_TASKS_PAGE_SIZE']:
+            return jsonify({'error': f"limit debe estar entre 1 y {app.config['MAX_TASKS_PAGE_SIZE']}"}), 400
+        after_id = 0
+        if 'cursor' in request.args:
+            after_id = decode_cursor(request.args['cursor'])
+            if after_id is None:
+                return jsonify({'error': 'Cursor no válido'}), 400
+        # El almacén empieza en el cursor sin recorrer las tareas anteriores,
+        # así que el coste depende solo del tamaño de la página
+        page, more = tasks.page(after_id, limit)
+        response = jsonify(page)
+        if more:
+            next_url = url_for('get_tasks', limit=limit, cursor=encode_cursor(page[-1]['id']))
+            response.headers['Link'] = f'<{next_url}>; rel="next"'
+        return response
 
     @app.route('/tasks', methods=['POST'])
     def add_task():
@@ -55,20 +180,16 @@ def create_app():
         El cuerpo de la solicitud debe incluir un JSON con el campo "name"
         """
         # Implementa este endpoint
-        global next_id
-
         # Obtiene los datos JSON del cuerpo de la petición.
-        new_task = {'id': next_id}
-        new_task.update(request.get_json())
-        
+        datos = request.get_json(silent=True)
+
         # Valida que los datos existan.
-        if not new_task or 'name' not in new_task:
+        if not isinstance(datos, dict) or 'name' not in datos:
             return jsonify({'error': 'La solicitud debe contener datos JSON'}), 400
-        
-        # Agrega la nueva tarea a la lista 'tasks'.
-        tasks.append(new_task)
-        next_id += 1
-        
+
+        # Agrega la nueva tarea al almacén, que le asigna el siguiente id.
+        new_task = tasks.create(datos)
+
         # Devuelve la nueva tarea con el código de estado 201.
         return jsonify(new_task), 201
 
@@ -78,19 +199,11 @@ def create_app():
         Elimina una tarea específica por su ID
         """
         # Implementa este endpoint
-        # Declaramos tasks como 'global' para poder modificarla
-        # puesto que está fuera del alcance de la función.
-        global tasks
-        
-        # Primero comprobamos que el id de la tarea exista
-        task = next((task for task in tasks if task['id'] == task_id), None)
-        if not task:
+        # El almacén busca la tarea por su id sin recorrer la lista
+        # y nos dice si existía.
+        if not tasks.delete(task_id):
             return jsonify({'error': 'Task not found'}), 404
 
-        # Si existe, se usa una "list comprehension" para crear una nueva lista
-        # que excluya la tarea con el id que queremos eliminar.
-        tasks = [task for task in tasks if task['id'] != task_id]
-
         # Se devuelve una respuesta de éxito con un código 200.
         return jsonify({'message': 'Task deleted'}), 200
 
@@ -103,24 +216,84 @@ def create_app():
         """
         # Implementa este endpoint
         # Se recuperan los datos de la petición
-        datos = request.get_json()
-        if not datos or 'name' not in datos:
+        datos = request.get_json(silent=True)
+        if not isinstance(datos, dict) or 'name' not in datos:
             return jsonify({'error': 'La solicitud debe contener datos JSON'}), 400
-        
-        # Primero comprobamos que el id de la tarea exista
-        task = next((task for task in tasks if task['id'] == task_id), None)
-        if not task:
-            return jsonify({'error': 'Task not found'}), 404      
-
-        # Se actualiza la tarea con los nuevos datos
-        #task.clear()
-        #datos = {'id': next_id, 'name': 'Tarea actualizada'}
-        #task.update(datos)
-
-        task["name"] = datos["name"]
+
+        # Se actualiza la tarea con los nuevos datos; None si no existe
+        task = tasks.update(task_id, {'name': datos['name']})
+        if task is None:
+            return jsonify({'error': 'Task not found'}), 404
+
         # Se devuelve la tarea actualizada con un código 200.
         return jsonify(task), 200
 
+    @app.route('/tasks/bulk', methods=['POST'])
+    def bulk_tasks():
+        """
+        Aplica muchas operaciones en una sola petición. El cuerpo es una
+        lista JSON, o un flujo NDJSON (application/x-ndjson, un objeto por
+        línea), de operaciones:
+            {"op": "create", "name": "..."}
+            {"op": "update", "id": 1, "name": "..."}
+            {"op": "delete", "id": 1}
+        Responde con un resultado por operación, en el mismo orden y en el
+        mismo formato que la petición: {"status": 201, "task": {...}},
+        {"status": 200, "task": {...}}, {"status": 200, "id": 1} o
+        {"status": 4xx, "error": "..."}. Cada operación es independiente: un
+        error en una no deshace las demás.
+        - Si el cuerpo no es una lista o hay más de MAX_BULK_OPERATIONS operaciones: error 400
+        """
+        limit = app.config['MAX_BULK_OPERATIONS']
+        ndjson = request.mimetype == 'application/x-ndjson'
+        if ndjson:
+            items = read_ndjson(limit + 1)
+        else:
+            items = request.get_json(silent=True)
+            if not isinstance(items, list):
+                return jsonify({'error': 'El cuerpo debe ser una lista JSON de operaciones'}), 400
+        if len(items) > limit:
+            return jsonify({'error': f'Como máximo {limit} operaciones por petición'}), 400
+
+        operations = [parse_operation(item) for item in items]
+        # Todas las operaciones válidas se aplican de una vez en el almacén
+        applied = iter(tasks.apply([op for op in operations if not isinstance(op, str)]))
+        results = []
+        for operation in operations:
+            if isinstance(operation, str):
+                results.append({'status': 400, 'error': operation})
+                continue
+            op, task_id, _ = operation
+            task = next(applied)
+            if task is None:
+                results.append({'status': 404, 'error': 'Task not found', 'id': task_id})
+            elif op == 'delete':
+                results.append({'status': 200, 'id': task_id})
+            else:
+                results.append({'status': 201 if op == 'create' else 200, 'task': task})
+
+        if ndjson:
+            body = ''.join(app.json.dumps(result) + '\n' for result in results)
+            return Response(body, mimetype='application/x-ndjson')
+        return jsonify({'results': results})
+
+    def read_ndjson(limit):
+        """
+        Lee como máximo 'limit' líneas NDJSON del cuerpo a medida que llegan;
+        una línea que no es JSON válido se convierte en una operación no válida
+        """
+        items = []
+        for line in iter_lines(request.stream):
+            if not line.strip():
+                continue
+            try:
+                items.append(app.json.loads(line))
+            except ValueError:
+                items.append(None)
+            if len(items) >= limit:
+                break
+        return items
+
     return app
 
 if __name__ == '__main__':
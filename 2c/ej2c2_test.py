@@ -1,14 +1,17 @@
+import base64
+import json
 import pytest
 from flask import Flask
 from flask.testing import FlaskClient
-from ej2c2 import create_app
+from ej2c2 import create_app, encode_cursor
 
-@pytest.fixture
-def client() -> FlaskClient:
-    app = create_app()
+@pytest.fixture(params=["memory", "sqlite", "journal"])
+def client(request, tmp_path) -> FlaskClient:
+    app = create_app(storage=request.param, database=str(tmp_path / request.param))
     app.testing = True
     with app.test_client() as client:
         yield client
+    app.extensions["task_store"].close()
 
 def test_get_tasks_empty(client):
     """Test GET /tasks with an empty task list"""
@@ -62,3 +65,109 @@ def test_update_nonexistent_task(client):
     response = client.put("/tasks/999", json={"name": "Tarea inexistente"})
     assert response.status_code == 404
     assert response.json == {"error": "Task not found"}
+
+
+def test_add_task_invalid(client):
+    """Test POST /tasks without a name"""
+    response = client.post("/tasks", json={"title": "Sin nombre"})
+    assert response.status_code == 400
+    response = client.post("/tasks", json=["lista"])
+    assert response.status_code == 400
+
+
+def test_get_tasks_pages(client):
+    """Test GET /tasks?limit=N following the Link header through every page"""
+    for i in range(7):
+        client.post("/tasks", json={"name": f"Tarea {i}"})
+    client.delete("/tasks/3")
+
+    seen = []
+    url = "/tasks?limit=2"
+    while url:
+        response = client.get(url)
+        assert response.status_code == 200
+        assert len(response.json) <= 2
+        seen.extend(task["id"] for task in response.json)
+        link = response.headers.get("Link")
+        url = link[1:link.index(">")] if link else None
+    assert seen == [1, 2, 4, 5, 6, 7]
+
+
+def test_get_tasks_without_parameters_returns_full_list(client):
+    """Test GET /tasks without limit or cursor returns every task, unpaginated"""
+    client.application.config["TASKS_PAGE_SIZE"] = 3
+    for i in range(5):
+        client.post("/tasks", json={"name": f"Tarea {i}"})
+    response = client.get("/tasks")
+    assert [task["id"] for task in response.json] == [1, 2, 3, 4, 5]
+    assert "Link" not in response.headers
+
+
+def test_get_tasks_default_page_size(client):
+    """Test GET /tasks with a cursor but no limit returns at most TASKS_PAGE_SIZE tasks"""
+    client.application.config["TASKS_PAGE_SIZE"] = 3
+    for i in range(5):
+        client.post("/tasks", json={"name": f"Tarea {i}"})
+    response = client.get(f"/tasks?cursor={encode_cursor(1)}")
+    assert [task["id"] for task in response.json] == [2, 3, 4]
+    assert 'rel="next"' in response.headers["Link"]
+
+
+def test_get_tasks_invalid_parameters(client):
+    """Test GET /tasks with an invalid limit or cursor"""
+    assert client.get("/tasks?limit=0").status_code == 400
+    assert client.get("/tasks?limit=abc").status_code == 400
+    assert client.get("/tasks?limit=100000").status_code == 400
+    assert client.get("/tasks?cursor=no-es-un-cursor").status_code == 400
+    unicode_digit = base64.urlsafe_b64encode("after:²".encode()).decode()
+    assert client.get(f"/tasks?cursor={unicode_digit}").status_code == 400
+
+
+def test_bulk_json(client):
+    """Test POST /tasks/bulk with a JSON list of operations"""
+    client.post("/tasks", json={"name": "Existente"})
+    operations = [
+        {"op": "create", "name": "Nueva"},
+        {"op": "update", "id": 1, "name": "Cambiada"},
+        {"op": "delete", "id": 2},
+        {"op": "delete", "id": 999},
+        {"op": "update", "id": 1},
+        {"op": "mover"},
+    ]
+    response = client.post("/tasks/bulk", json=operations)
+    assert response.status_code == 200
+    assert response.json["results"] == [
+        {"status": 201, "task": {"id": 2, "name": "Nueva"}},
+        {"status": 200, "task": {"id": 1, "name": "Cambiada"}},
+        {"status": 200, "id": 2},
+        {"status": 404, "error": "Task not found", "id": 999},
+        {"status": 400, "error": 'La operación update debe incluir el campo "name"'},
+        {"status": 400, "error": 'Cada operación debe ser un objeto con "op": create, update o delete'},
+    ]
+    assert client.get("/tasks").json == [{"id": 1, "name": "Cambiada"}]
+
+
+def test_bulk_ndjson(client):
+    """Test POST /tasks/bulk with an NDJSON stream"""
+    body = '{"op": "create", "name": "A"}\n\n{"op": "create", "name": "B"}\nno es json\n'
+    response = client.post("/tasks/bulk", data=body, content_type="application/x-ndjson")
+    assert response.status_code == 200
+    assert response.mimetype == "application/x-ndjson"
+    lines = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+    assert [line["status"] for line in lines] == [201, 201, 400]
+    assert [task["name"] for task in client.get("/tasks").json] == ["A", "B"]
+
+
+def test_bulk_limits(client):
+    """Test POST /tasks/bulk with an invalid body or too many operations"""
+    assert client.post("/tasks/bulk", json={"op": "create"}).status_code == 400
+    client.application.config["MAX_BULK_OPERATIONS"] = 2
+    response = client.post("/tasks/bulk", json=[{"op": "create", "name": "x"}] * 3)
+    assert response.status_code == 400
+    assert client.get("/tasks").json == []
+
+
+def test_invalid_storage():
+    """Test create_app with an unknown storage backend"""
+    with pytest.raises(ValueError):
+        create_app(storage="ficheros")
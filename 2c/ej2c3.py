@@ -31,6 +31,7 @@ Ejemplos:
 """
 
 from flask import Flask, jsonify, request
+from json_provider import FastJSONProvider
 
 # Lista de productos predefinida con categorías
 products = [
@@ -49,6 +50,7 @@ def create_app():
     Crea y configura la aplicación Flask
     """
     app = Flask(__name__)
+    app.json = FastJSONProvider(app)
 
     @app.route('/products', methods=['GET'])
     def get_products():
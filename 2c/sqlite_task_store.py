@@ -0,0 +1,220 @@
+"""
+Almacén de tareas persistente en SQLite para ej2c2.
+
+Tiene la misma interfaz que TaskStore (task_store.py), así que create_app
+puede usar uno u otro. Las tareas sobreviven a los reinicios y varios
+procesos (serve.py --workers N) comparten los mismos datos.
+
+- El fichero se abre en modo WAL: las lecturas no esperan a las escrituras
+  y cada escritura solo añade al registro, con synchronous=NORMAL.
+- Cada hilo reutiliza su propia conexión (threading.local); tras un fork el
+  proceso hijo abre conexiones nuevas. La conexión de un hilo se cierra
+  cuando el hilo termina, así que un servidor con un hilo por petición no
+  acumula conexiones abiertas.
+- Las sentencias son siempre las mismas cadenas con parámetros, así que el
+  módulo sqlite3 las prepara una vez por conexión y las reutiliza.
+- apply() hace todas sus operaciones en una sola transacción, es decir, con
+  un único commit.
+- id es INTEGER PRIMARY KEY: es el rowid, la clave del índice de la tabla.
+  Con AUTOINCREMENT los ids de tareas eliminadas no se reutilizan.
+
+El resto de campos de la tarea se guardan como un objeto JSON en la columna
+data.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import weakref
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS tasks (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    data TEXT NOT NULL
+)
+"""
+
+
+class SQLiteTaskStore:
+    """
+    Tareas guardadas en una base de datos SQLite, en orden de id
+    """
+
+    def __init__(self, path, timeout=5.0):
+        self.path = path
+        self.timeout = timeout
+        self._local = threading.local()
+        # Referencias débiles: no impiden cerrar la conexión de un hilo que termina
+        self._connections = weakref.WeakSet()
+        self._lock = threading.Lock()
+        with self._transaction() as conn:
+            conn.execute(SCHEMA)
+
+    def _connection(self):
+        """
+        Conexión del hilo actual, creada la primera vez
+        """
+        holder = getattr(self._local, 'holder', None)
+        if holder is None or holder.pid != os.getpid():
+            # Sin transacciones implícitas: se abren con BEGIN en _transaction
+            conn = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None,
+                                   check_same_thread=False, cached_statements=64)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            holder = self._local.holder = _ThreadConnection(conn)
+            with self._lock:
+                self._connections.add(holder)
+        return holder.conn
+
+    def _transaction(self):
+        return _Transaction(self._connection())
+
+    def close(self):
+        """
+        Cierra las conexiones de todos los hilos
+        """
+        with self._lock:
+            holders = list(self._connections)
+            self._connections.clear()
+        for holder in holders:
+            holder.close()
+        self._local = threading.local()
+
+    def __len__(self):
+        return self._connection().execute('SELECT COUNT(*) FROM tasks').fetchone()[0]
+
+    def __contains__(self, task_id):
+        return self._connection().execute('SELECT 1 FROM tasks WHERE id = ?', (task_id,)).fetchone() is not None
+
+    def list(self):
+        """
+        Todas las tareas, en orden de id
+        """
+        rows = self._connection().execute('SELECT id, data FROM tasks ORDER BY id')
+        return [_task(task_id, data) for task_id, data in rows]
+
+    def page(self, after_id=0, limit=100):
+        """
+        Devuelve (tareas, hay_más): hasta 'limit' tareas con id mayor que
+        after_id, en orden de id, y si quedan más después
+        """
+        rows = self._connection().execute(
+            'SELECT id, data FROM tasks WHERE id > ? ORDER BY id LIMIT ?', (after_id, limit + 1)).fetchall()
+        return [_task(task_id, data) for task_id, data in rows[:limit]], len(rows) > limit
+
+    def get(self, task_id):
+        """
+        Devuelve la tarea, o None si no existe
+        """
+        row = self._connection().execute('SELECT data FROM tasks WHERE id = ?', (task_id,)).fetchone()
+        return None if row is None else _task(task_id, row[0])
+
+    def create(self, data):
+        """
+        Crea una tarea con un id nuevo y los campos de 'data' (el campo id
+        de 'data', si lo hay, se ignora) y la devuelve
+        """
+        with self._transaction() as conn:
+            return self._create(conn, data)
+
+    def update(self, task_id, changes):
+        """
+        Aplica 'changes' a la tarea y devuelve la tarea nueva, o None si no existe
+        """
+        with self._transaction() as conn:
+            return self._update(conn, task_id, changes)
+
+    def delete(self, task_id):
+        """
+        Elimina la tarea; devuelve False si no existía
+        """
+        with self._transaction() as conn:
+            return self._delete(conn, task_id) is not None
+
+    def apply(self, operations):
+        """
+        Aplica en orden una secuencia de operaciones ('create', None, datos),
+        ('update', id, cambios) o ('delete', id, None) en una sola
+        transacción. Devuelve, por cada operación, la tarea creada,
+        actualizada o eliminada, o None si la tarea no existía.
+        """
+        actions = {'create': lambda conn, task_id, data: self._create(conn, data),
+                   'update': self._update,
+                   'delete': lambda conn, task_id, data: self._delete(conn, task_id)}
+        with self._transaction() as conn:
+            return [actions[op](conn, task_id, data) for op, task_id, data in operations]
+
+    def clear(self):
+        with self._transaction() as conn:
+            conn.execute('DELETE FROM tasks')
+
+    @staticmethod
+    def _create(conn, data):
+        fields = {key: value for key, value in data.items() if key != 'id'}
+        task_id = conn.execute('INSERT INTO tasks (data) VALUES (?)', (_dumps(fields),)).lastrowid
+        return {'id': task_id, **fields}
+
+    @staticmethod
+    def _update(conn, task_id, changes):
+        row = conn.execute('SELECT data FROM tasks WHERE id = ?', (task_id,)).fetchone()
+        if row is None:
+            return None
+        fields = json.loads(row[0])
+        fields.update((key, value) for key, value in changes.items() if key != 'id')
+        conn.execute('UPDATE tasks SET data = ? WHERE id = ?', (_dumps(fields), task_id))
+        return {'id': task_id, **fields}
+
+    @staticmethod
+    def _delete(conn, task_id):
+        row = conn.execute('SELECT data FROM tasks WHERE id = ?', (task_id,)).fetchone()
+        if row is None:
+            return None
+        conn.execute('DELETE FROM tasks WHERE id = ?', (task_id,))
+        return _task(task_id, row[0])
+
+
+class _ThreadConnection:
+    """
+    Conexión de un hilo, guardada en el threading.local del almacén. Cuando
+    el hilo termina se libera y el finalizador cierra la conexión; la
+    conexión sola tardaría en liberarse, porque su caché de sentencias forma
+    un ciclo de referencias que solo recoge el recolector de basura.
+    """
+
+    def __init__(self, conn):
+        self.conn = conn
+        self.pid = os.getpid()
+        self.close = weakref.finalize(self, _close, conn, self.pid)
+
+
+def _close(conn, pid):
+    # La conexión heredada en un fork es del proceso padre: el hijo no la cierra
+    if os.getpid() == pid:
+        conn.close()
+
+
+class _Transaction:
+    """
+    Transacción de escritura: BEGIN IMMEDIATE toma el bloqueo de escritura
+    al empezar, de modo que leer y después escribir (update, delete) es
+    atómico también entre procesos
+    """
+
+    def __init__(self, conn):
+        self.conn = conn
+
+    def __enter__(self):
+        self.conn.execute('BEGIN IMMEDIATE')
+        return self.conn
+
+    def __exit__(self, exc_type, exc, tb):
+        self.conn.execute('COMMIT' if exc_type is None else 'ROLLBACK')
+
+
+def _dumps(fields):
+    return json.dumps(fields, ensure_ascii=False, separators=(',', ':'))
+
+
+def _task(task_id, data):
+    return {'id': task_id, **json.loads(data)}
@@ -0,0 +1,115 @@
+import os
+import threading
+import pytest
+from sqlite_task_store import SQLiteTaskStore
+
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / "tasks.db")
+
+
+def test_crud(path):
+    """
+    Mismo comportamiento que TaskStore
+    """
+    store = SQLiteTaskStore(path)
+    first = store.create({"name": "a", "tags": ["x"]})
+    second = store.create({"name": "b", "id": 99})
+    assert (first["id"], second["id"]) == (1, 2), "El id lo asigna el almacén"
+    assert store.get(1) == {"id": 1, "name": "a", "tags": ["x"]}
+    assert store.update(1, {"name": "c"}) == {"id": 1, "name": "c", "tags": ["x"]}
+    assert store.update(5, {"name": "x"}) is None
+    assert store.delete(2)
+    assert not store.delete(2)
+    assert 1 in store and 2 not in store and len(store) == 1
+    assert store.create({"name": "d"})["id"] == 3, "Los ids no se reutilizan"
+    assert store.page(0, 1) == ([{"id": 1, "name": "c", "tags": ["x"]}], True)
+    assert store.page(1, 1) == ([{"id": 3, "name": "d"}], False)
+    store.close()
+
+
+def test_persistence_and_sharing(path):
+    """
+    Los datos sobreviven al cierre y dos almacenes sobre el mismo fichero (dos procesos) ven lo mismo
+    """
+    store = SQLiteTaskStore(path)
+    other = SQLiteTaskStore(path)
+    store.create({"name": "a"})
+    assert other.create({"name": "b"})["id"] == 2
+    assert [task["name"] for task in store.list()] == ["a", "b"]
+    store.close()
+    other.close()
+    assert [task["id"] for task in SQLiteTaskStore(path).list()] == [1, 2]
+
+
+def test_apply_is_one_transaction(path):
+    """
+    apply() devuelve un resultado por operación y, si falla, no deja cambios a medias
+    """
+    store = SQLiteTaskStore(path)
+    results = store.apply([("create", None, {"name": "a"}), ("update", 1, {"name": "b"}),
+                           ("delete", 7, None)])
+    assert results == [{"id": 1, "name": "a"}, {"id": 1, "name": "b"}, None]
+    with pytest.raises(KeyError):
+        store.apply([("create", None, {"name": "c"}), ("mover", 1, None)])
+    assert store.list() == [{"id": 1, "name": "b"}]
+
+
+def test_concurrent_threads(path):
+    """
+    Cada hilo usa su conexión; no se repiten ids ni se pierden tareas
+    """
+    store = SQLiteTaskStore(path)
+    created = [[] for _ in range(4)]
+
+    def worker(n):
+        for i in range(200):
+            created[n].append(store.create({"name": f"{n}-{i}"})["id"])
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    ids = [task_id for ids in created for task_id in ids]
+    assert len(set(ids)) == len(ids) == len(store) == 800
+    store.close()
+
+
+def open_files(path):
+    """
+    Descriptores abiertos del proceso sobre la base de datos (y sus ficheros -wal y -shm)
+    """
+    fds = os.listdir("/proc/self/fd")
+    targets = []
+    for fd in fds:
+        try:
+            targets.append(os.readlink(f"/proc/self/fd/{fd}"))
+        except OSError:
+            pass
+    return sum(target.startswith(path) for target in targets)
+
+
+@pytest.mark.skipif(not os.path.isdir("/proc/self/fd"), reason="Necesita /proc")
+def test_thread_connection_closed_when_thread_ends(path):
+    """
+    Con un hilo por petición las conexiones de los hilos que terminan se cierran
+    """
+    store = SQLiteTaskStore(path)
+    store.create({"name": "a"})
+
+    def requests(count):
+        for _ in range(count):
+            thread = threading.Thread(target=store.list)
+            thread.start()
+            thread.join()
+
+    requests(5)
+    # SQLite puede guardar para reutilizar el descriptor de una conexión cerrada
+    before = open_files(path)
+    requests(50)
+    assert len(store._connections) == 1, "Solo queda la conexión del hilo principal"
+    assert open_files(path) == before
+    store.close()
+    assert open_files(path) == 0
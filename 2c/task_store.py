@@ -0,0 +1,216 @@
+"""
+Almacén de tareas en memoria para ej2c2.
+
+Las tareas se guardan en un diccionario por id, así que obtener, actualizar o
+eliminar una tarea cuesta O(1) en lugar de recorrer la lista completa. Los
+diccionarios conservan el orden de inserción y los ids solo crecen, así que
+el diccionario ya está ordenado por id.
+
+Para paginar hace falta además empezar en un id cualquiera sin recorrer las
+tareas anteriores: una lista ordenada con los ids permite buscar el punto
+de partida con bisect. Crear una tarea añade su id al final; al eliminarla
+su id se queda en la lista como hueco, que page() salta, y la lista se
+compacta en cuanto hay compact_min huecos, cuente las tareas vivas que
+cuente. Así una página salta como mucho compact_min huecos y cuesta
+O(log n + tamaño de página + compact_min), y eliminar cuesta
+O(n / compact_min) amortizado.
+
+Todas las modificaciones se hacen con un cerrojo, de modo que el almacén se
+puede usar desde varios hilos a la vez (servidor con hilos) y la asignación
+de ids es atómica. Las tareas guardadas no se modifican nunca: actualizar
+crea un diccionario nuevo, y list() devuelve una copia de la lista que se
+puede serializar fuera del cerrojo.
+
+Con un diario (journal.Journal) las tareas sobreviven a los reinicios: al
+crearse, el almacén recupera las tareas del diario, y cada modificación se
+añade al diario dentro del cerrojo (así el orden del diario es el de los
+cambios). La espera al fsync se hace ya fuera del cerrojo, para que las
+modificaciones de otros hilos compartan el mismo fsync. Las lecturas no
+tocan el disco.
+"""
+
+import bisect
+import threading
+
+
+class TaskStore:
+    """
+    Tareas indexadas por id, en orden de creación
+    """
+
+    # Huecos mínimos en la lista de ids antes de compactarla
+    compact_min = 1024
+
+    def __init__(self, journal=None):
+        self._tasks = {}
+        self._ids = []
+        self._holes = 0
+        self._next_id = 1
+        self._lock = threading.Lock()
+        self._journal = journal
+        self._seq = 0
+        if journal is not None:
+            tasks, self._next_id = journal.load()
+            self._ids = sorted(tasks)
+            self._tasks = {task_id: tasks[task_id] for task_id in self._ids}
+
+    def __len__(self):
+        return len(self._tasks)
+
+    def __contains__(self, task_id):
+        return task_id in self._tasks
+
+    def list(self):
+        """
+        Todas las tareas, en orden de creación
+        """
+        with self._lock:
+            return list(self._tasks.values())
+
+    def page(self, after_id=0, limit=100):
+        """
+        Devuelve (tareas, hay_más): hasta 'limit' tareas con id mayor que
+        after_id, en orden de creación, y si quedan más después
+        """
+        with self._lock:
+            ids = self._ids
+            i = bisect.bisect_right(ids, after_id)
+            page = []
+            # Se busca una tarea más de las pedidas para saber si hay más
+            while i < len(ids) and len(page) <= limit:
+                task = self._tasks.get(ids[i])
+                if task is not None:
+                    page.append(task)
+                i += 1
+        return page[:limit], len(page) > limit
+
+    def get(self, task_id):
+        """
+        Devuelve la tarea, o None si no existe
+        """
+        return self._tasks.get(task_id)
+
+    def create(self, data):
+        """
+        Crea una tarea con un id nuevo y los campos de 'data' (el campo id
+        de 'data', si lo hay, se ignora) y la devuelve
+        """
+        with self._lock:
+            task = self._create(data)
+            seq = self._log()
+        self._wait(seq)
+        return task
+
+    def update(self, task_id, changes):
+        """
+        Aplica 'changes' a la tarea y devuelve la tarea nueva, o None si no existe
+        """
+        with self._lock:
+            task = self._update(task_id, changes)
+            seq = self._log()
+        self._wait(seq)
+        return task
+
+    def delete(self, task_id):
+        """
+        Elimina la tarea; devuelve False si no existía
+        """
+        with self._lock:
+            task = self._delete(task_id)
+            seq = self._log()
+        self._wait(seq)
+        return task is not None
+
+    def apply(self, operations):
+        """
+        Aplica en orden una secuencia de operaciones ('create', None, datos),
+        ('update', id, cambios) o ('delete', id, None) tomando el cerrojo una
+        sola vez. Devuelve, por cada operación, la tarea creada, actualizada o
+        eliminada, o None si la tarea no existía.
+        """
+        actions = {'create': lambda task_id, data: self._create(data),
+                   'update': self._update,
+                   'delete': lambda task_id, data: self._delete(task_id)}
+        with self._lock:
+            results = [actions[op](task_id, data) for op, task_id, data in operations]
+            seq = self._log()
+        self._wait(seq)
+        return results
+
+    def _create(self, data):
+        task = {'id': self._next_id}
+        task.update((key, value) for key, value in data.items() if key != 'id')
+        self._put(task)
+        self._next_id += 1
+        self._tasks[task['id']] = task
+        self._ids.append(task['id'])
+        return task
+
+    def _update(self, task_id, changes):
+        task = self._tasks.get(task_id)
+        if task is None:
+            return None
+        task = {**task, **changes, 'id': task_id}
+        self._put(task)
+        self._tasks[task_id] = task
+        return task
+
+    def _delete(self, task_id):
+        if task_id not in self._tasks:
+            return None
+        if self._journal is not None:
+            self._seq = self._journal.delete(task_id)
+        task = self._tasks.pop(task_id)
+        self._holes += 1
+        if self._holes >= self.compact_min:
+            self._ids = [i for i in self._ids if i in self._tasks]
+            self._holes = 0
+        return task
+
+    def _put(self, task):
+        # Se llama antes de cambiar la memoria: si el diario falla (por
+        # ejemplo un valor que no se puede escribir), el almacén no cambia
+        if self._journal is not None:
+            self._seq = self._journal.put(task)
+
+    def _log(self):
+        """
+        Número de la última entrada del diario (0 si no hay diario); pide una
+        instantánea si toca. Se llama con el cerrojo tomado.
+        """
+        if self._journal is None:
+            return 0
+        if self._journal.should_snapshot():
+            # La instantánea es el estado justo al rotar el diario; las
+            # tareas no se modifican, así que basta con copiar la lista
+            generation = self._journal.rotate()
+            self._journal.snapshot_async(generation, list(self._tasks.values()), self._next_id)
+        return self._seq
+
+    def _wait(self, seq):
+        if seq:
+            self._journal.wait(seq)
+
+    def snapshot(self):
+        """
+        Escribe ya una instantánea del diario y espera a que esté en disco
+        """
+        with self._lock:
+            generation = self._journal.rotate()
+            tasks, next_id = list(self._tasks.values()), self._next_id
+        self._journal.write_snapshot(generation, tasks, next_id)
+
+    def close(self):
+        if self._journal is not None:
+            self._journal.close()
+
+    def clear(self):
+        with self._lock:
+            if self._journal is not None:
+                for task_id in self._tasks:
+                    self._seq = self._journal.delete(task_id)
+            self._tasks.clear()
+            self._ids.clear()
+            self._holes = 0
+            seq = self._log()
+        self._wait(seq)
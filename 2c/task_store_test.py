@@ -0,0 +1,145 @@
+import os
+import threading
+import pytest
+
+from journal import Journal
+from task_store import TaskStore
+
+
+def test_crud():
+    """
+    Crear, obtener, actualizar y eliminar por id
+    """
+    store = TaskStore()
+    first = store.create({"name": "a"})
+    second = store.create({"name": "b", "id": 99})
+    assert (first["id"], second["id"]) == (1, 2), "El id lo asigna el almacén"
+    assert store.get(2) == {"id": 2, "name": "b"}
+    assert store.update(1, {"name": "c"}) == {"id": 1, "name": "c"}
+    assert first == {"id": 1, "name": "a"}, "Las tareas devueltas antes no cambian"
+    assert store.update(5, {"name": "x"}) is None
+    assert store.delete(1)
+    assert not store.delete(1)
+    assert store.list() == [{"id": 2, "name": "b"}]
+    assert store.create({"name": "d"})["id"] == 3, "Los ids no se reutilizan"
+
+
+def test_order_is_creation_order():
+    store = TaskStore()
+    for i in range(5):
+        store.create({"name": str(i)})
+    store.update(2, {"name": "x"})
+    store.delete(4)
+    assert [task["id"] for task in store.list()] == [1, 2, 3, 5]
+
+
+def test_concurrent_access():
+    """
+    Con varios hilos creando y eliminando a la vez no se repiten ids ni se pierden tareas
+    """
+    store = TaskStore()
+    created = [[] for _ in range(8)]
+
+    def worker(n):
+        for i in range(2000):
+            task = store.create({"name": f"{n}-{i}"})
+            created[n].append(task["id"])
+            if i % 2:
+                assert store.delete(task["id"])
+            if i % 500 == 0:
+                store.list()
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    ids = [task_id for ids in created for task_id in ids]
+    assert len(set(ids)) == len(ids) == 16000
+    assert len(store) == 8000
+    assert [task["id"] for task in store.list()] == sorted(task["id"] for task in store.list())
+
+
+def test_page_skips_deleted_and_compacts():
+    """
+    page() empieza después de after_id y salta las tareas eliminadas, también tras compactar
+    """
+    store = TaskStore()
+    store.compact_min = 2
+    for i in range(10):
+        store.create({"name": str(i)})
+    for task_id in (2, 3, 4, 5, 6, 7):
+        store.delete(task_id)
+    tasks, more = store.page(0, 2)
+    assert [task["id"] for task in tasks] == [1, 8] and more
+    tasks, more = store.page(8, 2)
+    assert [task["id"] for task in tasks] == [9, 10] and not more
+    assert store.page(10, 2) == ([], False)
+
+
+def test_holes_are_compacted_with_many_live_tasks():
+    """
+    Los huecos se compactan al llegar a compact_min aunque haya más tareas vivas
+    """
+    store = TaskStore()
+    store.compact_min = 4
+    for i in range(100):
+        store.create({"name": str(i)})
+    for task_id in range(1, 10):
+        store.delete(task_id)
+    assert len(store._ids) - len(store) < store.compact_min
+    tasks, more = store.page(0, 1)
+    assert [task["id"] for task in tasks] == [10] and more
+
+
+def test_apply():
+    """
+    apply() aplica las operaciones en orden y devuelve una tarea (o None) por operación
+    """
+    store = TaskStore()
+    results = store.apply([
+        ("create", None, {"name": "a"}),
+        ("create", None, {"name": "b"}),
+        ("update", 1, {"name": "c"}),
+        ("delete", 2, None),
+        ("delete", 2, None),
+        ("update", 7, {"name": "x"}),
+    ])
+    assert results == [{"id": 1, "name": "a"}, {"id": 2, "name": "b"}, {"id": 1, "name": "c"},
+                       {"id": 2, "name": "b"}, None, None]
+    assert store.list() == [{"id": 1, "name": "c"}]
+
+
+def test_journal_restart(tmp_path):
+    """
+    Con diario las tareas, los huecos y el siguiente id sobreviven al reinicio
+    """
+    store = TaskStore(Journal(str(tmp_path), snapshot_every=3))
+    store.apply([("create", None, {"name": str(i)}) for i in range(5)])
+    store.update(2, {"name": "x"})
+    store.delete(5)
+    store.create({"name": "y"})
+    store.close()
+
+    store = TaskStore(Journal(str(tmp_path), snapshot_every=3))
+    assert store.list() == [{"id": 1, "name": "0"}, {"id": 2, "name": "x"}, {"id": 3, "name": "2"},
+                            {"id": 4, "name": "3"}, {"id": 6, "name": "y"}]
+    assert store.page(3, 2) == ([{"id": 4, "name": "3"}, {"id": 6, "name": "y"}], False)
+    assert store.create({"name": "z"})["id"] == 7
+    store.snapshot()
+    store.close()
+    assert sorted(os.listdir(tmp_path))[-1].startswith("snapshot-")
+    assert TaskStore(Journal(str(tmp_path))).get(7) == {"id": 7, "name": "z"}
+
+
+def test_journal_failure_leaves_store_unchanged(tmp_path):
+    """
+    Si no se puede escribir en el diario, la tarea no queda en memoria
+    """
+    store = TaskStore(Journal(str(tmp_path)))
+    with pytest.raises(TypeError):
+        store.create({"name": object()})
+    assert store.list() == []
+    assert store.create({"name": "a", "priority": 2 ** 70})["id"] == 1
+    store.close()
+    assert TaskStore(Journal(str(tmp_path))).get(1) == {"id": 1, "name": "a", "priority": 2 ** 70}
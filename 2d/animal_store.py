@@ -0,0 +1,119 @@
+"""
+Catálogo de animales en memoria para ej2d3.
+
+Los animales se guardan en un diccionario por id y hay un segundo índice por
+nombre, así que buscar un animal y comprobar si un nombre ya existe cuestan
+O(1) en lugar de recorrer la lista. Las modificaciones se hacen con un
+cerrojo: comprobar el nombre, asignar el id y guardar es atómico aunque el
+servidor atienda varias peticiones a la vez.
+
+Con un diario (journal.Journal) el catálogo sobrevive a los reinicios: al
+crearse se recupera del diario (los animales iniciales solo se añaden si el
+diario está vacío) y cada cambio se añade al diario dentro del cerrojo. La
+espera al fsync se hace fuera del cerrojo, para que los cambios de otros
+hilos compartan el mismo fsync. Las lecturas no tocan el disco.
+"""
+
+import threading
+
+
+class AnimalStore:
+    """
+    Animales indexados por id y por nombre, en orden de creación
+    """
+
+    def __init__(self, initial=(), journal=None):
+        self._animals = {}
+        self._names = {}
+        self._next_id = 1
+        self._seq = 0
+        self._lock = threading.Lock()
+        self._journal = journal
+        if journal is not None:
+            animals, self._next_id = journal.load()
+            for animal_id in sorted(animals):
+                self._index(animals[animal_id])
+            if not journal.is_new:
+                return
+        for animal in initial:
+            self._index(dict(animal))
+            self._next_id = max(self._next_id, animal['id'] + 1)
+            self._put(self._animals[animal['id']])
+        self._wait(self._seq)
+
+    def _index(self, animal):
+        self._animals[animal['id']] = animal
+        self._names[animal['name']] = animal['id']
+
+    def __len__(self):
+        return len(self._animals)
+
+    def list(self):
+        """
+        Todos los animales, en orden de creación
+        """
+        with self._lock:
+            return list(self._animals.values())
+
+    def get(self, animal_id):
+        """
+        Devuelve el animal, o None si no existe
+        """
+        return self._animals.get(animal_id)
+
+    def add(self, data):
+        """
+        Añade un animal con un id nuevo y los campos de 'data' y lo devuelve;
+        devuelve None si ya hay un animal con ese nombre
+        """
+        with self._lock:
+            if data['name'] in self._names:
+                return None
+            animal = {**data, 'id': self._next_id}
+            self._put(animal)
+            self._next_id += 1
+            self._index(animal)
+            seq = self._log()
+        self._wait(seq)
+        return animal
+
+    def delete(self, animal_id):
+        """
+        Elimina el animal; devuelve False si no existía
+        """
+        with self._lock:
+            if animal_id not in self._animals:
+                return False
+            if self._journal is not None:
+                self._seq = self._journal.delete(animal_id)
+            animal = self._animals.pop(animal_id)
+            del self._names[animal['name']]
+            seq = self._log()
+        self._wait(seq)
+        return True
+
+    def _put(self, animal):
+        # Se llama antes de cambiar la memoria: si el diario falla, el
+        # catálogo no cambia
+        if self._journal is not None:
+            self._seq = self._journal.put(animal)
+
+    def _log(self):
+        """
+        Número de la última entrada del diario (0 si no hay diario); pide una
+        instantánea si toca. Se llama con el cerrojo tomado.
+        """
+        if self._journal is None:
+            return 0
+        if self._journal.should_snapshot():
+            generation = self._journal.rotate()
+            self._journal.snapshot_async(generation, list(self._animals.values()), self._next_id)
+        return self._seq
+
+    def _wait(self, seq):
+        if seq:
+            self._journal.wait(seq)
+
+    def close(self):
+        if self._journal is not None:
+            self._journal.close()
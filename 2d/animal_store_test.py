@@ -0,0 +1,53 @@
+import threading
+
+from animal_store import AnimalStore
+from journal import Journal
+
+INITIAL = [{"id": 1, "name": "León", "species": "Panthera leo"},
+           {"id": 2, "name": "Jirafa", "species": "Giraffa camelopardalis"}]
+
+
+def test_add_get_delete():
+    store = AnimalStore(INITIAL)
+    assert store.list() == INITIAL
+    tigre = store.add({"name": "Tigre", "species": "Panthera tigris"})
+    assert tigre == {"name": "Tigre", "species": "Panthera tigris", "id": 3}
+    assert store.add({"name": "León", "species": "otra"}) is None, "Los nombres no se repiten"
+    assert store.delete(1)
+    assert not store.delete(1)
+    assert store.get(1) is None
+    assert store.add({"name": "León", "species": "Panthera leo"})["id"] == 4
+    assert INITIAL[0] == {"id": 1, "name": "León", "species": "Panthera leo"}, "La lista inicial no cambia"
+
+
+def test_concurrent_add_same_name():
+    """
+    Con varios hilos añadiendo el mismo nombre solo uno lo consigue
+    """
+    store = AnimalStore()
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(store.add({"name": "Oso", "species": "x"})))
+               for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert sum(result is not None for result in results) == 1
+    assert len(store) == 1
+
+
+def test_journal_restart(tmp_path):
+    """
+    Con diario el catálogo sobrevive al reinicio y los animales iniciales
+    solo se añaden la primera vez
+    """
+    store = AnimalStore(INITIAL, Journal(str(tmp_path), snapshot_every=2))
+    store.add({"name": "Tigre", "species": "Panthera tigris"})
+    store.delete(1)
+    store.close()
+
+    store = AnimalStore(INITIAL, Journal(str(tmp_path)))
+    assert [animal["name"] for animal in store.list()] == ["Jirafa", "Tigre"]
+    assert store.add({"name": "Tigre", "species": "otra"}) is None
+    assert store.add({"name": "Oso", "species": "Ursus arctos"})["id"] == 4
+    store.close()
@@ -19,12 +19,14 @@ una habilidad crucial para el desarrollo y depuración de aplicaciones web.
 """
 
 from flask import Flask, jsonify, request, Response
+from json_provider import FastJSONProvider
 
 def create_app():
     """
     Crea y configura la aplicación Flask
     """
     app = Flask(__name__)
+    app.json = FastJSONProvider(app)
 
     # Configuración básica del logger
     # Por defecto, los mensajes se registrarán en la consola
@@ -22,12 +22,14 @@ situaciones de error comunes en aplicaciones web.
 """
 
 from flask import Flask, request, abort, jsonify
+from json_provider import FastJSONProvider
 
 def create_app():
     """
     Crea y configura la aplicación Flask
     """
     app = Flask(__name__)
+    app.json = FastJSONProvider(app)
 
     @app.route('/resource/<resource_id>', methods=['GET'])
     def get_resource(resource_id):
@@ -32,27 +32,40 @@ Tu tarea es implementar esta API en Flask con el manejo adecuado de errores.
 """
 
 from flask import Flask, jsonify, request, abort
+from animal_store import AnimalStore
+from journal import Journal
+from json_provider import FastJSONProvider
 import logging
 
 # Configuración del registro (logging)
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Lista de animales predefinida
+# Lista de animales predefinida, con la que empieza el catálogo de cada aplicación
 animals = [
     {"id": 1, "name": "León", "species": "Panthera leo"},
     {"id": 2, "name": "Elefante", "species": "Loxodonta africana"},
     {"id": 3, "name": "Jirafa", "species": "Giraffa camelopardalis"}
 ]
 
-# Este contador se usará para asignar IDs únicos
-next_id = 4
+# Cambios en el diario entre instantáneas
+JOURNAL_SNAPSHOT_EVERY = 100_000
 
-def create_app():
+def create_app(journal=None):
     """
     Crea y configura la aplicación Flask con manejadores de errores personalizados
+
+    Los animales se guardan en memoria. Si se indica 'journal', un
+    directorio, cada cambio se guarda además en un diario en ese directorio
+    y el catálogo se recupera de él al reiniciar.
     """
     app = Flask(__name__)
+    app.json = FastJSONProvider(app)
+    # Catálogo indexado por id y por nombre, seguro con varios hilos
+    if journal is not None:
+        journal = Journal(journal, snapshot_every=JOURNAL_SNAPSHOT_EVERY)
+    store = AnimalStore(animals, journal)
+    app.extensions['animal_store'] = store
     
     # Manejador de errores 400 - Bad Request
     @app.errorhandler(400)
@@ -114,7 +127,7 @@ def create_app():
         Devuelve la lista completa de animales
         """
         # Implementa este endpoint para devolver la lista de animales
-        return jsonify(animals)
+        return jsonify(store.list())
 
     @app.route('/animals/<int:animal_id>', methods=['GET'])
     def get_animal(animal_id):
@@ -122,7 +135,7 @@ def create_app():
         Devuelve la información de un animal específico por su ID
         Si el animal no existe, debe activar un error 404
         """
-        animal = next((animal for animal in animals if animal['id'] == animal_id), None)
+        animal = store.get(animal_id)
         if animal:
             return jsonify(animal)
 
@@ -141,8 +154,6 @@ def create_app():
         # 2. Verifica que los campos "name" y "species" estén presentes
         # 3. Si falta algún campo, usa abort(400) para lanzar un error
         # 4. Si todo está correcto, agrega el nuevo animal a la lista y devuelve una respuesta adecuada (código 201)
-        global next_id
-
         # Verificamos si la solicitud tiene datos en formato JSON
         if not request.is_json:
         # Abort(400) Bad Request
@@ -150,20 +161,16 @@ def create_app():
         # Recuperamos el cuerpo de la solicitud
         data = request.get_json()
         # Comprobamos si falta algún dato
-        if not data or 'name' not in data or 'species' not in data:
+        if not isinstance(data, dict) or 'name' not in data or 'species' not in data:
             abort(400)
-        # Comprobamos si el animal ya existe
-        if 'name' in data:
-            for animal in animals:
-                if animal['name'] == data['name']:
-                    # Abort(400) Bad Request
-                    abort(400, description="El animal que se quiere añadir, ya existe")
-
-        # Si todo es OK, añadimos el 'id' al nuevo animal
-        data['id'] = next_id
-        # Agregamos el nuevo animal a la lista
-        animals.append(data)
-        next_id += 1
+        # El nombre es la clave del índice del catálogo: tiene que ser una cadena
+        if not isinstance(data['name'], str):
+            abort(400, description="El nombre del animal debe ser una cadena de texto")
+        # Agregamos el nuevo animal con un 'id' nuevo, si no existe ya uno con ese nombre
+        data = store.add(data)
+        if data is None:
+            # Abort(400) Bad Request
+            abort(400, description="El animal que se quiere añadir, ya existe")
         return jsonify({f'message': 'Animal añadido con éxito',
                         'id':data['id'],
                         'name':data['name'],
@@ -181,15 +188,8 @@ def create_app():
         # 2. Si no existe, usa abort(404) para lanzar un error 404
         # 3. Si existe, elimínalo de la lista y devuelve una respuesta adecuada
 
-        animal_encontrado = None
-        # Buscamos el animal en la lista por su 'id'
-        for animal in animals:
-            if animal['id'] == animal_id:
-                animal_encontrado = animal
-                break
-        # Si existe, lo borramos de la lista
-        if animal_encontrado:
-            animals.remove(animal_encontrado)
+        # Si existe, lo borramos del catálogo
+        if store.delete(animal_id):
             return jsonify({'message': 'Animal eliminado con éxito'}), 204
         # Si no existe, abort(404)
         else:
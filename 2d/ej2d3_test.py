@@ -81,6 +81,12 @@ def test_add_animal_invalid(client):
     logs = client.log_capture.get_logs()
     assert "WARNING:" in logs, "Debe registrarse un mensaje de nivel WARNING para errores 400"
 
+def test_add_animal_name_not_string(client):
+    """Test POST /animals with a non-string name - should return 400 error"""
+    response = client.post("/animals", json={"name": ["León"], "species": "x"})
+    assert response.status_code == 400
+    assert client.post("/animals", json=["name", "species"]).status_code == 400
+
 def test_delete_animal(client):
     """Test DELETE /animals/2 - should delete the animal with ID 2"""
     response = client.delete("/animals/2")
@@ -121,3 +127,16 @@ def test_method_not_allowed(client):
 #     assert "ERROR:" in logs, "Debe registrarse un mensaje de nivel ERROR para errores 500"
 #     assert "test-error" in logs, "El log debe incluir información de la ruta que causó el error"
 
+
+def test_journal_restart(tmp_path):
+    """Test create_app with a journal - animals survive a restart"""
+    app = create_app(journal=str(tmp_path))
+    client = app.test_client()
+    assert client.post("/animals", json={"name": "Tigre", "species": "Panthera tigris"}).status_code == 201
+    assert client.delete("/animals/1").status_code == 204
+    app.extensions["animal_store"].close()
+
+    app = create_app(journal=str(tmp_path))
+    response = app.test_client().get("/animals")
+    assert [animal["name"] for animal in response.json] == ["Elefante", "Jirafa", "Tigre"]
+    app.extensions["animal_store"].close()
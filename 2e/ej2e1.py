@@ -32,6 +32,7 @@ una habilidad fundamental para crear APIs robustas y aplicaciones web interactiv
 """
 
 from flask import Flask, jsonify, request
+from json_provider import FastJSONProvider
 import re
 
 def create_app():
@@ -39,6 +40,7 @@ def create_app():
     Crea y configura la aplicación Flask
     """
     app = Flask(__name__)
+    app.json = FastJSONProvider(app)
 
     @app.route('/headers', methods=['GET'])
     def get_headers():
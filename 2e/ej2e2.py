@@ -36,6 +36,7 @@ una habilidad esencial para el desarrollo de APIs y servicios web que manejan di
 """
 
 from flask import Flask, jsonify, Response, send_file, make_response
+from json_provider import FastJSONProvider
 import os
 import io
 
@@ -44,6 +45,7 @@ def create_app():
     Crea y configura la aplicación Flask
     """
     app = Flask(__name__)
+    app.json = FastJSONProvider(app)
 
     # Crear un directorio, si no existe, para guardar el archivo
     uploads_dir = os.path.join(app.instance_path, 'uploads')
@@ -35,6 +35,7 @@ una habilidad esencial para desarrollar APIs web que interactúan con diversos c
 """
 
 from flask import Flask, jsonify, request, Response
+from json_provider import FastJSONProvider
 import os
 
 def create_app():
@@ -42,6 +43,7 @@ def create_app():
     Crea y configura la aplicación Flask
     """
     app = Flask(__name__)
+    app.json = FastJSONProvider(app)
 
     # Crear un directorio para guardar archivos subidos si no existe
     uploads_dir = os.path.join(app.instance_path, 'uploads')
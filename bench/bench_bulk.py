@@ -0,0 +1,117 @@
+"""
+Benchmark: 10.000 operaciones sobre las tareas de ej2c2 (60% crear, 30%
+actualizar, 10% eliminar), una petición por operación frente a una sola
+petición POST /tasks/bulk (lista JSON y NDJSON).
+
+Se mide con el cliente de pruebas de Flask (sin red) y por HTTP contra el
+servidor de werkzeug arrancado en el mismo proceso (bench/loadgen.py), donde
+se suma el coste de cada conexión.
+
+Uso:
+    python bench/bench_bulk.py [--ops 10000] [--no-http]
+"""
+
+import argparse
+import http.client
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '2c'))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import ej2c2  # noqa: E402
+import loadgen  # noqa: E402
+
+
+def operations(count, seed=1):
+    """
+    Operaciones sobre ids que existen: se crean primero las tareas que luego se modifican
+    """
+    rng = random.Random(seed)
+    ops, created = [], 0
+    for kind in rng.choices(['create', 'update', 'delete'], [60, 30, 10], k=count):
+        if kind == 'create' or created == 0:
+            created += 1
+            ops.append({'op': 'create', 'name': f'Tarea {created}'})
+        elif kind == 'update':
+            ops.append({'op': 'update', 'id': rng.randint(1, created), 'name': 'Cambiada'})
+        else:
+            ops.append({'op': 'delete', 'id': rng.randint(1, created)})
+    return ops
+
+
+def as_request(op):
+    """
+    (método, ruta, cuerpo) de la petición individual equivalente
+    """
+    if op['op'] == 'create':
+        return 'POST', '/tasks', {'name': op['name']}
+    if op['op'] == 'update':
+        return 'PUT', f"/tasks/{op['id']}", {'name': op['name']}
+    return 'DELETE', f"/tasks/{op['id']}", None
+
+
+def timed(function):
+    start = time.perf_counter()
+    function()
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--ops', type=int, default=10000)
+    parser.add_argument('--no-http', dest='http', action='store_false')
+    args = parser.parse_args()
+
+    ops = operations(args.ops)
+    requests = [as_request(op) for op in ops]
+    ndjson = ''.join(json.dumps(op) + '\n' for op in ops)
+
+    def per_request(client):
+        for method, path, body in requests:
+            client.open(path, method=method, json=body)
+
+    rows = []
+    app = ej2c2.create_app()
+    rows.append(("cliente de pruebas, una a una", timed(lambda: per_request(app.test_client()))))
+    app = ej2c2.create_app()
+    rows.append(("cliente de pruebas, bulk JSON", timed(lambda: app.test_client().post('/tasks/bulk', json=ops))))
+    app = ej2c2.create_app()
+    rows.append(("cliente de pruebas, bulk NDJSON", timed(lambda: app.test_client().post(
+        '/tasks/bulk', data=ndjson, content_type='application/x-ndjson'))))
+
+    if args.http:
+        def over_http(send):
+            port, stop = loadgen.start_server(ej2c2, {})
+            try:
+                return timed(lambda: send(port))
+            finally:
+                stop()
+
+        def send_each(port):
+            for method, path, body in requests:
+                conn = http.client.HTTPConnection('localhost', port)
+                headers = {'Content-Type': 'application/json'} if body is not None else {}
+                conn.request(method, path, body=None if body is None else json.dumps(body), headers=headers)
+                conn.getresponse().read()
+                conn.close()
+
+        def send_bulk(port):
+            conn = http.client.HTTPConnection('localhost', port)
+            conn.request('POST', '/tasks/bulk', body=json.dumps(ops), headers={'Content-Type': 'application/json'})
+            assert conn.getresponse().read()
+            conn.close()
+
+        rows.append(("HTTP, una a una", over_http(send_each)))
+        rows.append(("HTTP, bulk JSON", over_http(send_bulk)))
+
+    print(f"{args.ops} operaciones")
+    for label, seconds in rows:
+        print(f"{label:<34}{seconds * 1000:>10.1f} ms{args.ops / seconds:>12.0f} op/s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,81 @@
+"""
+Benchmark: coste de resolver GET /product/<id> en ej2a2 según el tamaño del catálogo.
+
+Compara, sobre catálogos sintéticos de 10^3 a 10^6 productos:
+
+- antes: re.search sobre la ruta, reconstrucción de la ruta esperada y
+  recorrido lineal de la lista de productos.
+- después: Router.match con los patrones precompilados y búsqueda en el
+  índice de ProductCatalog.
+
+Los ids buscados se eligen al azar, así que el recorrido lineal revisa de
+media la mitad de la lista.
+
+Uso:
+    python bench/bench_catalog.py [--lookups 2000]
+"""
+
+import argparse
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '2a'))
+
+from catalog import ProductCatalog  # noqa: E402
+from ej2a2 import ROUTES  # noqa: E402
+
+
+def synthetic_products(size):
+    return [{"id": i, "name": f"Producto {i}", "price": round(i * 0.37, 2)} for i in range(1, size + 1)]
+
+
+def lookup_before(products, path):
+    """
+    Búsqueda tal y como la hacía ProductAPIHandler.do_GET
+    """
+    id_str = re.search(r'\d+', path)
+    id = id_str.group(0) if id_str is not None else None
+    ruta = '/product/' + id if id is not None else ''
+    if path == ruta:
+        for product in products:
+            if int(id) == product['id']:
+                return product
+    return None
+
+
+def lookup_after(catalog, path):
+    endpoint, params = ROUTES.match(path)
+    if endpoint is None:
+        return None
+    return catalog.get(params['product_id'])
+
+
+def per_lookup_us(func, source, paths):
+    start = time.perf_counter()
+    for path in paths:
+        func(source, path)
+    return (time.perf_counter() - start) / len(paths) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--lookups', type=int, default=2000)
+    args = parser.parse_args()
+
+    print(f"{'productos':>10}{'antes (µs)':>14}{'después (µs)':>16}")
+    for size in (10 ** 3, 10 ** 4, 10 ** 5, 10 ** 6):
+        products = synthetic_products(size)
+        catalog = ProductCatalog(products)
+        paths = [f"/product/{random.randint(1, size)}" for _ in range(args.lookups)]
+        # El recorrido lineal es muy lento con catálogos grandes: menos repeticiones
+        slow_paths = paths[:max(20, args.lookups * 1000 // size)]
+        before = per_lookup_us(lookup_before, products, slow_paths)
+        after = per_lookup_us(lookup_after, catalog, paths)
+        print(f"{size:>10}{before:>14.2f}{after:>16.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,85 @@
+"""
+Benchmark: coste por petición y tamaño de las respuestas JSON de las
+aplicaciones Flask con el proveedor por defecto de Flask y con
+FastJSONProvider (json_provider.py).
+
+Cada endpoint se llama con el cliente de pruebas de Flask (sin red); la única
+diferencia entre las dos columnas es app.json. Al final se mide también
+jsonify() sobre una lista grande de productos, donde la serialización pesa
+más que el resto de la petición.
+
+Uso:
+    python bench/bench_flask_json.py [--requests 2000] [--items 5000]
+"""
+
+import argparse
+import importlib
+import os
+import sys
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+
+from flask import jsonify  # noqa: E402
+from flask.json.provider import DefaultJSONProvider  # noqa: E402
+
+# (ejercicio, método, ruta, cuerpo JSON)
+ENDPOINTS = [
+    ('2b/ej2b3', 'POST', '/json', {"nombre": "Ana", "edad": 30, "tags": ["a", "b", "c"]}),
+    ('2c/ej2c1', 'GET', '/product/1', None),
+    ('2c/ej2c1', 'GET', '/products?ids=1,2,3', None),
+    ('2c/ej2c2', 'GET', '/tasks', None),
+    ('2c/ej2c3', 'GET', '/products', None),
+    ('2d/ej2d3', 'GET', '/animals', None),
+    ('2e/ej2e2', 'GET', '/json', None),
+]
+
+
+def load(target):
+    directory, name = target.split('/')
+    path = os.path.join(ROOT, directory)
+    if path not in sys.path:
+        sys.path.insert(0, path)
+    return importlib.import_module(name)
+
+
+def per_request(client, method, path, body, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        response = client.open(path, method=method, json=body)
+    return (time.perf_counter() - start) / repeat * 1e6, len(response.data)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--items', type=int, default=5000)
+    args = parser.parse_args()
+
+    print(f"{'endpoint':<32}{'Flask (µs)':>12}{'rápido (µs)':>13}{'Flask (B)':>11}{'rápido (B)':>12}")
+    for target, method, path, body in ENDPOINTS:
+        fast_app = load(target).create_app()
+        default_app = load(target).create_app()
+        default_app.json = DefaultJSONProvider(default_app)
+        default_us, default_size = per_request(default_app.test_client(), method, path, body, args.requests)
+        fast_us, fast_size = per_request(fast_app.test_client(), method, path, body, args.requests)
+        label = f"{target.split('/')[1]} {method} {path}"
+        print(f"{label:<32}{default_us:>12.1f}{fast_us:>13.1f}{default_size:>11}{fast_size:>12}")
+
+    products = [{"id": i, "name": f"Producto {i}", "price": i * 1.5, "tags": ["nuevo", "oferta"]}
+                for i in range(args.items)]
+    app = load('2c/ej2c1').create_app()
+    repeat = max(1, args.requests // 100)
+    print()
+    for label, provider in [("Flask", DefaultJSONProvider(app)), ("rápido", app.json)]:
+        app.json = provider
+        with app.app_context():
+            start = time.perf_counter()
+            for _ in range(repeat):
+                jsonify(products)
+            elapsed = (time.perf_counter() - start) / repeat * 1e3
+        print(f"jsonify({args.items} productos) {label:<10}{elapsed:>10.2f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,90 @@
+"""
+Benchmark: memoria máxima y tiempo por petición al enviar a la aplicación de
+ej2b3 un formulario multipart con un campo de texto grande, leyendo con
+request.form y con el lector en streaming de form_parser. Las dos rutas de
+prueba devuelven solo la longitud de cada campo, para medir la lectura del
+formulario y no la respuesta (/form devuelve los campos completos).
+
+request.form guarda en memoria los campos de texto completos (hasta
+MAX_FORM_MEMORY_SIZE); parse_multipart los pasa a un fichero temporal al
+superar FORM_FIELD_MEMORY_LIMIT, así que la memoria máxima no debería crecer
+con el tamaño del campo.
+
+Uso:
+    python bench/bench_forms.py [--sizes 1,8,32] [--repeat 3]
+"""
+
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '2b'))
+
+from flask import jsonify, request  # noqa: E402
+from werkzeug.test import EnvironBuilder, encode_multipart  # noqa: E402
+import ej2b3  # noqa: E402
+from form_parser import parse_multipart  # noqa: E402
+
+
+def create_app():
+    app = ej2b3.create_app()
+    # Sin límite de memoria para que request.form acepte campos grandes
+    app.config['MAX_FORM_MEMORY_SIZE'] = None
+
+    @app.route('/form-werkzeug', methods=['POST'])
+    def form_werkzeug():
+        return jsonify({name: len(value) for name, value in request.form.items()})
+
+    @app.route('/form-streaming', methods=['POST'])
+    def form_streaming():
+        parts = parse_multipart(request.stream, request.mimetype_params['boundary'],
+                                memory_limit=app.config['FORM_FIELD_MEMORY_LIMIT'])
+        for part in parts:
+            part.close()
+        return jsonify({part.name: part.size for part in parts})
+
+    return app
+
+
+def build(size):
+    # Cuerpo ya codificado, fuera de la medición
+    boundary, body = encode_multipart({'name': 'Ana', 'text': 'x' * size})
+    return body, f'multipart/form-data; boundary={boundary}'
+
+
+def measure(app, path, body, content_type, trace=False):
+    environ = EnvironBuilder(path=path, method='POST', data=body, content_type=content_type).get_environ()
+    if trace:
+        tracemalloc.start()
+    start = time.perf_counter()
+    with app.request_context(environ):
+        response = app.full_dispatch_request()
+    return time.perf_counter() - start, response.status_code
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', default='1,8,32', help='tamaños del campo en MiB')
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    app = create_app()
+    print(f"{'campo (MiB)':<12}{'lector':<12}{'tiempo (ms)':>12}{'memoria máx. (MB)':>19}")
+    for size in (int(s) for s in args.sizes.split(',')):
+        body, content_type = build(size * 1024 * 1024)
+        for label, path in [("werkzeug", '/form-werkzeug'), ("streaming", '/form-streaming')]:
+            times = []
+            for _ in range(args.repeat):
+                elapsed, status = measure(app, path, body, content_type)
+                assert status == 200, status
+                times.append(elapsed)
+            measure(app, path, body, content_type, trace=True)
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            print(f"{size:<12}{label:<12}{min(times) * 1000:>12.1f}{peak / 1e6:>19.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,101 @@
+"""
+Benchmark: coste del diario (journal.py) en el almacén de tareas de ej2c2 y
+tiempo de arranque con muchas tareas.
+
+- Modificaciones por segundo (actualizar tareas) en memoria sin diario, con
+  diario sin fsync y con diario y fsync, en un hilo y en --threads hilos.
+  Con fsync y un hilo cada cambio espera a su propio fsync; con varios hilos
+  los cambios que llegan durante un fsync comparten el siguiente (group
+  commit).
+- Tiempo de arranque (TaskStore(Journal(...))) con --tasks tareas: solo
+  desde el diario, y desde una instantánea más --tail cambios en el diario.
+
+Uso:
+    python bench/bench_journal.py [--tasks 1000000] [--tail 10000] [--ops 2000] [--threads 8]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, '2c'))
+
+from journal import Journal  # noqa: E402
+from task_store import TaskStore  # noqa: E402
+
+
+def updates(store, count, first):
+    for i in range(count):
+        store.update(first + i % 1000, {'name': f'cambiada {i}'})
+
+
+def rate(store, ops, threads):
+    per_thread = ops // threads
+    workers = [threading.Thread(target=updates, args=(store, per_thread, n * 1000 + 1)) for n in range(threads)]
+    start = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    return per_thread * threads / (time.perf_counter() - start)
+
+
+def restart(directory):
+    start = time.perf_counter()
+    store = TaskStore(Journal(directory, fsync=False))
+    elapsed = time.perf_counter() - start
+    count = len(store)
+    store.close()
+    return elapsed, count
+
+
+def size(directory):
+    return sum(os.path.getsize(os.path.join(directory, name)) for name in os.listdir(directory))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--tasks', type=int, default=1_000_000)
+    parser.add_argument('--tail', type=int, default=10_000)
+    parser.add_argument('--ops', type=int, default=2000)
+    parser.add_argument('--threads', type=int, default=8)
+    args = parser.parse_args()
+    tasks = [('create', None, {'name': f'Tarea {i}', 'done': False}) for i in range(args.tasks)]
+
+    print('actualizaciones por segundo')
+    print(f"{'almacén':<20}{'1 hilo':>10}{f'{args.threads} hilos':>10}")
+    with tempfile.TemporaryDirectory() as directory:
+        for label, journal in (('memoria', None),
+                               ('diario sin fsync', Journal(os.path.join(directory, 'a'), fsync=False)),
+                               ('diario con fsync', Journal(os.path.join(directory, 'b')))):
+            store = TaskStore(journal)
+            store.apply(tasks[:args.threads * 1000])
+            single = rate(store, args.ops, 1)
+            multi = rate(store, args.ops, args.threads)
+            store.close()
+            print(f"{label:<20}{single:>10.0f}{multi:>10.0f}")
+
+    print(f"\narranque con {args.tasks} tareas")
+    with tempfile.TemporaryDirectory() as directory:
+        store = TaskStore(Journal(directory, fsync=False, snapshot_every=10 ** 12))
+        store.apply(tasks)
+        store.close()
+        elapsed, count = restart(directory)
+        print(f"{'solo diario':<28}{elapsed:>8.2f} s  {count} tareas, {size(directory) / 2 ** 20:.0f} MiB")
+
+        store = TaskStore(Journal(directory, fsync=False, snapshot_every=10 ** 12))
+        store.snapshot()
+        store.apply([('update', i + 1, {'done': True}) for i in range(args.tail)])
+        store.close()
+        elapsed, count = restart(directory)
+        print(f"{f'instantánea + {args.tail} cambios':<28}{elapsed:>8.2f} s  {count} tareas, "
+              f"{size(directory) / 2 ** 20:.0f} MiB")
+
+
+if __name__ == '__main__':
+    main()
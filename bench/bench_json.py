@@ -0,0 +1,88 @@
+"""
+Benchmark: bytes enviados y CPU por petición de GET /product/<id> en ej2a2
+según el modo de codificación JSON.
+
+Las peticiones se ejecutan dentro del proceso, sin red: el manejador lee la
+petición de un búfer y escribe la respuesta en otro, así que se mide solo el
+trabajo del servidor (análisis de la petición, codificación y cabeceras).
+
+Modos:
+- pretty sin caché: json.dumps(indent=4) en cada petición (comportamiento original).
+- compacto sin caché: separadores compactos en cada petición.
+- pretty / compacto con caché: bytes guardados por ProductCatalog.encoded().
+
+Uso:
+    python bench/bench_json.py [--requests 20000]
+"""
+
+import argparse
+import io
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '2a'))
+
+import ej2a2  # noqa: E402
+from ej2a2 import ProductAPIHandler, create_server, encode_product  # noqa: E402
+
+
+class QuietHandler(ProductAPIHandler):
+    def log_message(self, format, *args):
+        pass
+
+
+class UncachedHandler(QuietHandler):
+    """
+    get_product codificando el producto en cada petición
+    """
+
+    def get_product(self, product_id):
+        product = ej2a2.catalog.get(product_id)
+        body = encode_product(product, self.server.json_indent)
+        self.send_body(200, "application/json", body)
+
+
+def run_request(server, handler_class, raw):
+    """
+    Ejecuta una petición completa en memoria y devuelve los bytes de la respuesta
+    """
+    handler = handler_class.__new__(handler_class)
+    handler.server = server
+    handler.request = None
+    handler.client_address = ("localhost", 0)
+    handler.rfile = io.BytesIO(raw)
+    handler.wfile = io.BytesIO()
+    handler.close_connection = True
+    handler.handle_one_request()
+    return handler.wfile.getvalue()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--requests', type=int, default=20000)
+    args = parser.parse_args()
+
+    raw = b"GET /product/1 HTTP/1.1\r\nHost: localhost\r\n\r\n"
+    print(f"{'modo':<24}{'cuerpo (B)':>12}{'respuesta (B)':>16}{'CPU (µs/pet)':>16}")
+    for label, pretty, handler_class in [
+        ("pretty sin caché", True, UncachedHandler),
+        ("compacto sin caché", False, UncachedHandler),
+        ("pretty con caché", True, QuietHandler),
+        ("compacto con caché", False, QuietHandler),
+    ]:
+        server = create_server(port=0, pretty=pretty)
+        try:
+            response = run_request(server, handler_class, raw)
+            body = response.partition(b"\r\n\r\n")[2]
+            start = time.process_time()
+            for _ in range(args.requests):
+                run_request(server, handler_class, raw)
+            cpu = (time.process_time() - start) / args.requests * 1e6
+        finally:
+            server.server_close()
+        print(f"{label:<24}{len(body):>12}{len(response):>16}{cpu:>16.2f}")
+
+
+if __name__ == '__main__':
+    main()
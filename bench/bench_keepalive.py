@@ -0,0 +1,106 @@
+"""
+Benchmark: peticiones por segundo con y sin reutilizar la conexión HTTP/1.1.
+
+Un único cliente hace --requests peticiones GET / a ej2a1 (con grupo de hilos
+para que las conexiones sean persistentes) de tres formas:
+
+- una conexión nueva por petición,
+- una sola conexión persistente reutilizada,
+- una conexión persistente enviando las peticiones encadenadas (pipelining)
+  en bloques de --depth.
+
+Uso:
+    python bench/bench_keepalive.py [--requests 2000] [--depth 16]
+"""
+
+import argparse
+import http.client
+import os
+import socket
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '2a'))
+
+from ej2a1 import MyHTTPRequestHandler, create_server  # noqa: E402
+
+
+class QuietHandler(MyHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+
+def new_connection_per_request(port, total):
+    for _ in range(total):
+        conn = http.client.HTTPConnection("localhost", port)
+        conn.request("GET", "/", headers={"Connection": "close"})
+        conn.getresponse().read()
+        conn.close()
+
+
+def reused_connection(port, total):
+    conn = http.client.HTTPConnection("localhost", port)
+    for _ in range(total):
+        conn.request("GET", "/")
+        conn.getresponse().read()
+    conn.close()
+
+
+def pipelined(port, total, depth):
+    request = b"GET / HTTP/1.1\r\nHost: localhost\r\n\r\n"
+    with socket.create_connection(("localhost", port)) as sock:
+        reader = sock.makefile('rb')
+        for _ in range(total // depth):
+            sock.sendall(request * depth)
+            for _ in range(depth):
+                read_response(reader)
+
+
+def read_response(reader):
+    """
+    Lee una respuesta completa (cabeceras y cuerpo según Content-Length)
+    """
+    length = 0
+    reader.readline()
+    while (line := reader.readline()) not in (b"\r\n", b""):
+        name, _, value = line.partition(b":")
+        if name.lower() == b"content-length":
+            length = int(value)
+    reader.read(length)
+
+
+def measure(func, *args):
+    start = time.perf_counter()
+    func(*args)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--depth', type=int, default=16)
+    args = parser.parse_args()
+
+    server = create_server(port=0, workers=4)
+    server.RequestHandlerClass = QuietHandler
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    port = server.server_port
+    try:
+        results = [
+            ("conexión nueva por petición", measure(new_connection_per_request, port, args.requests)),
+            ("conexión reutilizada", measure(reused_connection, port, args.requests)),
+            (f"pipelining (profundidad {args.depth})", measure(pipelined, port, args.requests, args.depth)),
+        ]
+    finally:
+        server.shutdown()
+        server.server_close()
+        thread.join(1)
+
+    for label, elapsed in results:
+        print(f"{label:<32}{args.requests / elapsed:>10.0f} r/s")
+
+
+if __name__ == '__main__':
+    main()
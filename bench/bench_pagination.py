@@ -0,0 +1,68 @@
+"""
+Benchmark: coste de GET /tasks en ej2c2 según el tamaño de la colección y la
+posición de la página.
+
+Para cada tamaño se mide, con el cliente de pruebas de Flask:
+
+- la lista completa serializada de una vez (GET /tasks sin limit ni cursor),
+- la primera página de --limit tareas,
+- una página a mitad de la colección (cursor de la tarea n/2),
+- la última página.
+
+Con la paginación por cursor las tres últimas columnas no deberían crecer
+con el tamaño de la colección.
+
+Uso:
+    python bench/bench_pagination.py [--sizes 1000,100000,1000000] [--limit 100]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '2c'))
+
+from flask import jsonify  # noqa: E402
+import ej2c2  # noqa: E402
+
+
+def timed(function, repeat):
+    function()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        function()
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', default='1000,100000,1000000')
+    parser.add_argument('--limit', type=int, default=100)
+    parser.add_argument('--repeat', type=int, default=200)
+    args = parser.parse_args()
+
+    print(f"{'tareas':>10}{'completa (ms)':>15}{'primera (ms)':>14}{'mitad (ms)':>12}{'última (ms)':>13}")
+    for size in (int(s) for s in args.sizes.split(',')):
+        app = ej2c2.create_app()
+        store = app.extensions['task_store']
+        for i in range(size):
+            store.create({'name': f'Tarea {i}'})
+        client = app.test_client()
+
+        def full():
+            with app.app_context():
+                jsonify(store.list()).get_data()
+
+        pages = {}
+        for label, after_id in (('primera', None), ('mitad', size // 2), ('última', size - args.limit)):
+            url = f'/tasks?limit={args.limit}'
+            if after_id:
+                url += f'&cursor={ej2c2.encode_cursor(after_id)}'
+            pages[label] = timed(lambda: client.get(url), args.repeat)
+        full_ms = timed(full, max(1, args.repeat // 100))
+        print(f"{size:>10}{full_ms:>15.2f}{pages['primera']:>14.3f}{pages['mitad']:>12.3f}{pages['última']:>13.3f}")
+
+
+if __name__ == '__main__':
+    main()
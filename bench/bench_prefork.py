@@ -0,0 +1,91 @@
+"""
+Benchmark: peticiones por segundo de una ruta que consume CPU (el XML de
+ej2a3, generado en cada petición) con uno o varios procesos servidores.
+
+El manejador no usa la caché del catálogo y devuelve un catálogo de --items
+productos en XML, así que cada petición es trabajo de CPU en Python y un solo
+proceso queda limitado a un núcleo por el GIL. Los clientes se ejecutan en
+procesos aparte para que no compitan por el GIL del servidor.
+
+Uso:
+    python bench/bench_prefork.py [--requests 400] [--clients 8] [--items 50]
+"""
+
+import argparse
+import http.client
+import multiprocessing
+import os
+import sys
+import threading
+import time
+import xml.etree.ElementTree as ET
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '2a'))
+
+from ej2a3 import ProductAPIHandler, create_server, dict_to_xml, prettify  # noqa: E402
+
+
+class RenderHandler(ProductAPIHandler):
+    """
+    Manejador de ej2a3 que genera un catálogo XML completo en cada petición
+    """
+    items = 50
+
+    def do_GET(self):
+        root = ET.Element('catalog')
+        for i in range(self.items):
+            root.append(dict_to_xml('product', {"id": i, "name": f"Producto {i}", "price": i * 1.5}))
+        self.send_body(200, 'application/xml', prettify(root))
+
+    def log_message(self, format, *args):
+        pass
+
+
+def client(port, count):
+    for _ in range(count):
+        conn = http.client.HTTPConnection("localhost", port)
+        conn.request("GET", "/")
+        conn.getresponse().read()
+        conn.close()
+
+
+def bench(processes, clients, total_requests):
+    server = create_server(port=0, processes=processes)
+    server.RequestHandlerClass = RenderHandler
+    thread = threading.Thread(target=server.serve_forever)
+    thread.daemon = True
+    thread.start()
+    time.sleep(0.5)
+    try:
+        per_client = total_requests // clients
+        workers = [multiprocessing.Process(target=client, args=(server.server_port, per_client))
+                   for _ in range(clients)]
+        start = time.perf_counter()
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        return per_client * clients / (time.perf_counter() - start)
+    finally:
+        server.shutdown()
+        server.server_close()
+        thread.join(1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--requests', type=int, default=400)
+    parser.add_argument('--clients', type=int, default=8)
+    parser.add_argument('--items', type=int, default=50)
+    args = parser.parse_args()
+
+    RenderHandler.items = args.items
+    cores = os.cpu_count() or 1
+    print(f"Núcleos: {cores}, peticiones: {args.requests}, clientes: {args.clients}")
+    for processes in sorted({1, 2, 4, cores}):
+        rate = bench(processes, args.clients, args.requests)
+        print(f"processes={processes:<6}{rate:>10.0f} r/s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,128 @@
+"""
+Benchmark: respuestas estáticas de ej2a1 ya codificadas frente a construirlas
+en cada petición, comparadas con un servidor que solo escribe bytes en el socket.
+
+Se mide con un cliente que envía las peticiones encadenadas (pipelining) sobre
+una conexión persistente, para que el coste del cliente pese lo menos posible:
+
+- antes: do_GET construye línea de estado, cabeceras y cuerpo en cada petición
+  (send_response + send_header + end_headers + write).
+- después: do_GET escribe la respuesta codificada en create_server (send_raw).
+- socket: un StreamRequestHandler mínimo que lee la petición y escribe bytes
+  fijos, como referencia del máximo alcanzable.
+
+Uso:
+    python bench/bench_static.py [--requests 20000] [--depth 16]
+"""
+
+import argparse
+import os
+import socket
+import socketserver
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '2a'))
+
+from bench_keepalive import read_response  # noqa: E402
+from ej2a1 import MyHTTPRequestHandler, create_server  # noqa: E402
+from server_utils import encode_response  # noqa: E402
+
+
+class StaticHandler(MyHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+
+class DynamicHandler(StaticHandler):
+    """
+    do_GET tal y como era antes de la tabla de respuestas codificadas
+    """
+
+    def do_GET(self):
+        if self.path == '/':
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain")
+            self.send_header("Content-Length", "11")
+            self.end_headers()
+            self.wfile.write(b"Hola mundo!")
+        else:
+            self.send_response(404)
+            self.send_header("Content-Type", "text/plain")
+            self.send_header("Content-Length", "19")
+            self.end_headers()
+            self.wfile.write(b"Ruta no encontrada.")
+
+
+RAW_RESPONSE = encode_response(200, {'Content-Type': 'text/plain'}, b"Hola mundo!")
+
+
+class RawSocketHandler(socketserver.StreamRequestHandler):
+    """
+    Lee cada petición hasta la línea en blanco y escribe bytes fijos
+    """
+    disable_nagle_algorithm = True
+
+    def handle(self):
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            while line not in (b"\r\n", b""):
+                line = self.rfile.readline()
+            self.wfile.write(RAW_RESPONSE)
+
+
+class RawSocketServer(socketserver.ThreadingTCPServer):
+    allow_reuse_address = True
+    daemon_threads = True
+
+
+def pipelined(port, total, depth, path):
+    request = f"GET {path} HTTP/1.1\r\nHost: localhost\r\n\r\n".encode()
+    with socket.create_connection(("localhost", port)) as sock:
+        reader = sock.makefile('rb')
+        start = time.perf_counter()
+        for _ in range(total // depth):
+            sock.sendall(request * depth)
+            for _ in range(depth):
+                read_response(reader)
+        return total / (time.perf_counter() - start)
+
+
+def bench(server, total, depth, path):
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        return pipelined(server.server_address[1], total, depth, path)
+    finally:
+        server.shutdown()
+        server.server_close()
+        thread.join(1)
+
+
+def ej2a1_server(handler_class):
+    server = create_server(port=0, workers=2)
+    server.RequestHandlerClass = handler_class
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--requests', type=int, default=20000)
+    parser.add_argument('--depth', type=int, default=16)
+    args = parser.parse_args()
+
+    print(f"{'':<28}{'GET /':>16}{'GET /x (404)':>16}")
+    for label, factory in [
+        ("antes (send_response)", lambda: ej2a1_server(DynamicHandler)),
+        ("después (send_raw)", lambda: ej2a1_server(StaticHandler)),
+        ("socket (bytes fijos)", lambda: RawSocketServer(("localhost", 0), RawSocketHandler)),
+    ]:
+        results = [bench(factory(), args.requests, args.depth, path) for path in ("/", "/x")]
+        print(f"{label:<28}" + ''.join(f"{r:>12.0f} r/s" for r in results))
+
+
+if __name__ == '__main__':
+    main()
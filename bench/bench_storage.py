@@ -0,0 +1,105 @@
+"""
+Benchmark: rendimiento de los dos almacenes de tareas de ej2c2, en memoria
+(TaskStore) y SQLite (SQLiteTaskStore).
+
+Para cada almacén, con --tasks tareas ya creadas:
+
+- operaciones sueltas sobre el almacén (20% crear, 30% leer, 30% actualizar,
+  20% eliminar), en un hilo y en --threads hilos,
+- lectura de páginas de 100 tareas,
+- un lote de --ops operaciones con apply() (una sola transacción en SQLite),
+- las mismas operaciones como peticiones a la aplicación Flask (cliente de
+  pruebas).
+
+Uso:
+    python bench/bench_storage.py [--tasks 100000] [--ops 5000] [--threads 4]
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '2c'))
+
+import ej2c2  # noqa: E402
+
+
+def operations(count, max_id, seed):
+    rng = random.Random(seed)
+    names = rng.choices(['create', 'get', 'update', 'delete'], [20, 30, 30, 20], k=count)
+    return [(name, rng.randint(1, max_id)) for name in names]
+
+
+def run(store, ops):
+    for name, task_id in ops:
+        if name == 'create':
+            store.create({'name': 'nueva'})
+        elif name == 'get':
+            store.get(task_id)
+        elif name == 'update':
+            store.update(task_id, {'name': 'cambiada'})
+        else:
+            store.delete(task_id)
+
+
+def run_requests(client, ops):
+    for name, task_id in ops:
+        if name == 'create':
+            client.post('/tasks', json={'name': 'nueva'})
+        elif name == 'get':
+            client.get(f'/tasks?limit=1&cursor={ej2c2.encode_cursor(task_id - 1)}')
+        elif name == 'update':
+            client.put(f'/tasks/{task_id}', json={'name': 'cambiada'})
+        else:
+            client.delete(f'/tasks/{task_id}')
+
+
+def rate(count, function):
+    start = time.perf_counter()
+    function()
+    return count / (time.perf_counter() - start)
+
+
+def threaded(store, per_thread):
+    threads = [threading.Thread(target=run, args=(store, ops)) for ops in per_thread]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--tasks', type=int, default=100_000)
+    parser.add_argument('--ops', type=int, default=5000)
+    parser.add_argument('--threads', type=int, default=4)
+    args = parser.parse_args()
+
+    ops = operations(args.ops, args.tasks, seed=1)
+    per_thread = [operations(args.ops // args.threads, args.tasks, seed=n + 2) for n in range(args.threads)]
+    batch = [('create', None, {'name': 'lote'}) if name == 'create' else
+             (name, task_id, {'name': 'lote'} if name == 'update' else None)
+             for name, task_id in ops if name != 'get']
+    pages = [random.Random(3).randint(0, args.tasks) for _ in range(args.ops)]
+
+    print(f"{args.tasks} tareas; operaciones por segundo")
+    print(f"{'almacén':<10}{'sueltas':>10}{f'{args.threads} hilos':>10}{'páginas':>10}{'lote':>10}{'Flask':>10}")
+    with tempfile.TemporaryDirectory() as directory:
+        for storage in ('memory', 'sqlite'):
+            app = ej2c2.create_app(storage=storage, database=os.path.join(directory, 'tasks.db'))
+            store = app.extensions['task_store']
+            store.apply([('create', None, {'name': f'Tarea {i}'}) for i in range(args.tasks)])
+            single = rate(len(ops), lambda: run(store, ops))
+            multi = rate(sum(map(len, per_thread)), lambda: threaded(store, per_thread))
+            paged = rate(len(pages), lambda: [store.page(after_id, 100) for after_id in pages])
+            bulk = rate(len(batch), lambda: store.apply(batch))
+            flask = rate(len(ops), lambda: run_requests(app.test_client(), ops))
+            print(f"{storage:<10}{single:>10.0f}{multi:>10.0f}{paged:>10.0f}{bulk:>10.0f}{flask:>10.0f}")
+
+
+if __name__ == '__main__':
+    main()
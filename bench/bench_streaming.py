@@ -0,0 +1,97 @@
+"""
+Benchmark: tiempo hasta el primer byte y memoria máxima por petición al
+renderizar una página grande de ej2b4, con y sin streaming.
+
+Se registra una plantilla de listado sintética ('list.html', una fila por
+elemento) y una ruta /list que la renderiza con ej2b4.render(). La petición se
+ejecuta con la interfaz WSGI directamente, sin red:
+
+- primer byte: tiempo hasta que la aplicación entrega el primer bloque,
+- total: tiempo hasta consumir la respuesta completa,
+- memoria máxima: pico de memoria reservada durante la petición (tracemalloc).
+
+Uso:
+    python bench/bench_streaming.py [--rows 20000] [--repeat 5]
+"""
+
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '2b'))
+
+from werkzeug.test import EnvironBuilder, run_wsgi_app  # noqa: E402
+import ej2b4  # noqa: E402
+
+LIST_TEMPLATE = """<!doctype html>
+<html>
+<head><meta charset="UTF-8"><title>Listado</title></head>
+<body>
+<table>
+{% for item in items %}  <tr><td>{{ item.id }}</td><td>{{ item.name }}</td><td>{{ item.description }}</td></tr>
+{% endfor %}</table>
+</body>
+</html>
+"""
+
+
+def create_list_app(stream, rows):
+    ej2b4.TEMPLATES['list.html'] = LIST_TEMPLATE
+    app = ej2b4.create_app(stream=stream)
+    items = [{'id': i, 'name': f'Producto {i}', 'description': 'Descripción <larga> & detallada ' * 3}
+             for i in range(rows)]
+
+    @app.route('/list')
+    def list_page():
+        return ej2b4.render('list.html', items=items)
+
+    return app
+
+
+def measure(app):
+    """
+    Devuelve (segundos hasta el primer bloque, segundos en total, bytes enviados)
+    """
+    environ = EnvironBuilder(path='/list').get_environ()
+    start = time.perf_counter()
+    app_iter, status, headers = run_wsgi_app(app, environ, buffered=False)
+    first = None
+    size = 0
+    try:
+        for chunk in app_iter:
+            if first is None:
+                first = time.perf_counter() - start
+            size += len(chunk)
+    finally:
+        if hasattr(app_iter, 'close'):
+            app_iter.close()
+    return first, time.perf_counter() - start, size
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=20000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'modo':<12}{'tamaño (MB)':>12}{'primer byte (ms)':>18}{'total (ms)':>12}{'memoria máx. (MB)':>19}")
+    for label, stream in [("completo", False), ("streaming", True)]:
+        app = create_list_app(stream, args.rows)
+        measure(app)
+        firsts, totals = [], []
+        for _ in range(args.repeat):
+            first, total, size = measure(app)
+            firsts.append(first)
+            totals.append(total)
+        tracemalloc.start()
+        measure(app)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        print(f"{label:<12}{size / 1e6:>12.2f}{min(firsts) * 1000:>18.2f}{min(totals) * 1000:>12.2f}"
+              f"{peak / 1e6:>19.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,132 @@
+"""
+Benchmark: operaciones CRUD mezcladas sobre el almacén de tareas de ej2c2
+con 10^5 tareas o más.
+
+Compara TaskStore (2c/task_store.py) con la lista que usaba antes ej2c2:
+buscar con un recorrido lineal, actualizar recorriendo la lista y eliminar
+reconstruyéndola entera. La mezcla es 20% crear, 30% leer, 30% actualizar y
+20% eliminar, con ids al azar entre los existentes. Después se repite la
+mezcla de TaskStore con varios hilos y a través de la aplicación Flask
+(PUT y DELETE con el cliente de pruebas).
+
+Uso:
+    python bench/bench_tasks.py [--tasks 100000] [--ops 2000] [--threads 4]
+"""
+
+import argparse
+import os
+import random
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '2c'))
+
+from task_store import TaskStore  # noqa: E402
+import ej2c2  # noqa: E402
+
+
+class ListTasks:
+    """
+    Las operaciones de ej2c2 antes de TaskStore, sobre una lista
+    """
+
+    def __init__(self):
+        self.tasks = []
+        self.next_id = 1
+
+    def create(self, data):
+        task = {'id': self.next_id, **data}
+        self.tasks.append(task)
+        self.next_id += 1
+        return task
+
+    def get(self, task_id):
+        return next((task for task in self.tasks if task['id'] == task_id), None)
+
+    def update(self, task_id, changes):
+        task = self.get(task_id)
+        if task is not None:
+            task.update(changes)
+        return task
+
+    def delete(self, task_id):
+        if self.get(task_id) is None:
+            return False
+        self.tasks = [task for task in self.tasks if task['id'] != task_id]
+        return True
+
+
+def operations(count, max_id, seed):
+    """
+    Secuencia de operaciones (nombre, id) con la mezcla del enunciado
+    """
+    rng = random.Random(seed)
+    names = rng.choices(['create', 'get', 'update', 'delete'], [20, 30, 30, 20], k=count)
+    return [(name, rng.randint(1, max_id)) for name in names]
+
+
+def run(store, ops):
+    start = time.perf_counter()
+    for name, task_id in ops:
+        if name == 'create':
+            store.create({'name': 'nueva'})
+        elif name == 'get':
+            store.get(task_id)
+        elif name == 'update':
+            store.update(task_id, {'name': 'cambiada'})
+        else:
+            store.delete(task_id)
+    return time.perf_counter() - start
+
+
+def fill(store, count):
+    for i in range(count):
+        store.create({'name': f'Tarea {i}'})
+    return store
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--tasks', type=int, default=100_000)
+    parser.add_argument('--ops', type=int, default=2000)
+    parser.add_argument('--threads', type=int, default=4)
+    args = parser.parse_args()
+
+    ops = operations(args.ops, args.tasks, seed=1)
+    print(f"{args.tasks} tareas, {args.ops} operaciones")
+    for label, store in [("lista", ListTasks()), ("TaskStore", TaskStore())]:
+        fill(store, args.tasks)
+        elapsed = run(store, ops)
+        print(f"{label:<22}{elapsed / len(ops) * 1e6:>10.1f} µs/op{len(ops) / elapsed:>12.0f} op/s")
+
+    # TaskStore con varios hilos a la vez
+    store = fill(TaskStore(), args.tasks)
+    per_thread = [operations(args.ops * 10, args.tasks, seed=n) for n in range(args.threads)]
+    threads = [threading.Thread(target=run, args=(store, ops)) for ops in per_thread]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    total = args.ops * 10 * args.threads
+    print(f"{f'TaskStore {args.threads} hilos':<22}{elapsed / total * 1e6:>10.1f} µs/op{total / elapsed:>12.0f} op/s")
+
+    # A través de la aplicación (PUT y DELETE)
+    app = ej2c2.create_app()
+    fill(app.extensions['task_store'], args.tasks)
+    client = app.test_client()
+    requests = [(name, task_id) for name, task_id in ops if name in ('update', 'delete')]
+    start = time.perf_counter()
+    for name, task_id in requests:
+        if name == 'update':
+            client.put(f'/tasks/{task_id}', json={'name': 'cambiada'})
+        else:
+            client.delete(f'/tasks/{task_id}')
+    elapsed = time.perf_counter() - start
+    print(f"{'ej2c2 PUT/DELETE':<22}{elapsed / len(requests) * 1e6:>10.1f} µs/op{len(requests) / elapsed:>12.0f} op/s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,78 @@
+"""
+Benchmark: coste de renderizar la plantilla de ej2b4 por petición y coste de
+arranque de la aplicación.
+
+Por petición (dentro de un contexto de petición de Flask, sin red):
+- render_template_string(TEMPLATE): compila el código fuente en cada llamada
+  (comportamiento original).
+- render_template('greet.html'): usa la plantilla compilada al crear la app.
+También se mide la petición completa GET /greet/<nombre> con el cliente de
+pruebas de Flask en ambos casos.
+
+Arranque: create_app() compilando la plantilla, y con template_cache_dir ya
+poblado (el código compilado se lee de disco).
+
+Uso:
+    python bench/bench_templates.py [--requests 5000]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '2b'))
+
+from flask import render_template, render_template_string  # noqa: E402
+from ej2b4 import TEMPLATE, create_app  # noqa: E402
+
+
+def per_call(func, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat * 1e6
+
+
+def create_original_app():
+    """
+    Aplicación equivalente a la original, con render_template_string en cada petición
+    """
+    app = create_app()
+    app.view_functions['greet'] = lambda nombre: render_template_string(TEMPLATE, nombre=nombre)
+    return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--requests', type=int, default=5000)
+    args = parser.parse_args()
+    n = args.requests
+
+    app = create_app()
+    with app.test_request_context('/greet/Ana'):
+        string_us = per_call(lambda: render_template_string(TEMPLATE, nombre='Ana'), n)
+        compiled_us = per_call(lambda: render_template('greet.html', nombre='Ana'), n)
+
+    original_client = create_original_app().test_client()
+    client = app.test_client()
+    original_request_us = per_call(lambda: original_client.get('/greet/Ana'), n)
+    request_us = per_call(lambda: client.get('/greet/Ana'), n)
+
+    print(f"{'':<34}{'render (µs)':>14}{'petición (µs)':>16}")
+    print(f"{'render_template_string':<34}{string_us:>14.1f}{original_request_us:>16.1f}")
+    print(f"{'plantilla compilada':<34}{compiled_us:>14.1f}{request_us:>16.1f}")
+
+    repeat = max(1, n // 50)
+    with tempfile.TemporaryDirectory() as cache_dir:
+        create_app(template_cache_dir=cache_dir)
+        cold_us = per_call(create_app, repeat)
+        cached_us = per_call(lambda: create_app(template_cache_dir=cache_dir), repeat)
+    print()
+    print(f"{'create_app() compilando':<34}{cold_us:>14.1f} µs")
+    print(f"{'create_app() con bytecode en disco':<34}{cached_us:>14.1f} µs")
+
+
+if __name__ == '__main__':
+    main()
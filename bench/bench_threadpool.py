@@ -0,0 +1,94 @@
+"""
+Benchmark: rendimiento del servidor de ej2a1 con y sin grupo de hilos.
+
+Cada cliente abre una conexión nueva por petición. Para simular clientes o
+backends lentos, el manejador espera --delay segundos antes de responder; así se
+ve cómo el HTTPServer original atiende una petición cada vez mientras que el
+modo workers=N escala con el número de clientes concurrentes.
+
+Uso:
+    python bench/bench_threadpool.py [--requests 200] [--delay 0.01] [--workers 16]
+"""
+
+import argparse
+import http.client
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '2a'))
+
+from ej2a1 import MyHTTPRequestHandler, create_server  # noqa: E402
+
+
+class DelayedHandler(MyHTTPRequestHandler):
+    """
+    Manejador de ej2a1 con una espera fija por petición
+    """
+    delay = 0.0
+
+    def do_GET(self):
+        time.sleep(self.delay)
+        super().do_GET()
+
+    def log_message(self, format, *args):
+        pass
+
+
+def run_clients(port, clients, total_requests):
+    """
+    Lanza 'clients' hilos que hacen en total 'total_requests' peticiones GET /
+    y devuelve las peticiones por segundo conseguidas
+    """
+    per_client = total_requests // clients
+
+    def client():
+        for _ in range(per_client):
+            conn = http.client.HTTPConnection("localhost", port)
+            conn.request("GET", "/")
+            conn.getresponse().read()
+            conn.close()
+
+    threads = [threading.Thread(target=client) for _ in range(clients)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    return per_client * clients / elapsed
+
+
+def bench(workers, clients_list, total_requests):
+    server = create_server(port=0, backlog=128, workers=workers)
+    server.RequestHandlerClass = DelayedHandler
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        return [run_clients(server.server_port, clients, total_requests) for clients in clients_list]
+    finally:
+        server.shutdown()
+        server.server_close()
+        thread.join(1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--requests', type=int, default=200)
+    parser.add_argument('--delay', type=float, default=0.01)
+    parser.add_argument('--workers', type=int, default=16)
+    args = parser.parse_args()
+
+    DelayedHandler.delay = args.delay
+    clients_list = [1, 2, 4, 8, 16]
+
+    print(f"Peticiones: {args.requests}, espera por petición: {args.delay * 1000:.1f} ms")
+    print(f"{'modo':<16}" + ''.join(f"{c:>10} cli" for c in clients_list))
+    for label, workers in [("HTTPServer", None), (f"workers={args.workers}", args.workers)]:
+        results = bench(workers, clients_list, args.requests)
+        print(f"{label:<16}" + ''.join(f"{r:>10.0f} r/s" for r in results))
+
+
+if __name__ == '__main__':
+    main()
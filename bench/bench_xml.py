@@ -0,0 +1,71 @@
+"""
+Benchmark: serialización XML de ej2a3, ida y vuelta por minidom frente al
+serializador de una sola pasada (xml_writer).
+
+Cargas:
+- pequeña: un producto como los del ejercicio (dict_to_xml).
+- grande: un catálogo anidado de --items productos con varios campos cada uno.
+
+Uso:
+    python bench/bench_xml.py [--repeat 2000] [--items 500]
+"""
+
+import argparse
+import os
+import sys
+import time
+import xml.etree.ElementTree as ET
+from xml.dom import minidom
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '2a'))
+
+from ej2a3 import dict_to_xml  # noqa: E402
+from xml_writer import serialize  # noqa: E402
+
+
+def minidom_prettify(elem):
+    """
+    Camino original: ElementTree -> texto -> DOM de minidom -> texto
+    """
+    rough_string = ET.tostring(elem, 'utf-8')
+    return minidom.parseString(rough_string).toprettyxml(indent="  ").encode()
+
+
+def large_payload(items):
+    root = ET.Element('catalog')
+    for i in range(items):
+        product = dict_to_xml('product', {"id": i, "name": f"Producto <{i}> & cía", "price": i * 1.5})
+        tags = ET.SubElement(product, 'tags')
+        for tag in ('nuevo', 'oferta', 'envío gratis'):
+            ET.SubElement(tags, 'tag').text = tag
+        root.append(product)
+    return root
+
+
+def measure(func, elem, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func(elem)
+    return (time.perf_counter() - start) / repeat * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=2000)
+    parser.add_argument('--items', type=int, default=500)
+    args = parser.parse_args()
+
+    payloads = [
+        ("pequeña", dict_to_xml('product', {"id": 1, "name": "Laptop", "price": 999.99}), args.repeat),
+        (f"grande ({args.items} productos)", large_payload(args.items), max(1, args.repeat // 100)),
+    ]
+    print(f"{'carga':<28}{'minidom (µs)':>16}{'xml_writer (µs)':>18}{'iguales':>10}")
+    for label, elem, repeat in payloads:
+        same = minidom_prettify(elem) == serialize(elem)
+        before = measure(minidom_prettify, elem, repeat)
+        after = measure(serialize, elem, repeat)
+        print(f"{label:<28}{before:>16.1f}{after:>18.1f}{'sí' if same else 'no':>10}")
+
+
+if __name__ == '__main__':
+    main()
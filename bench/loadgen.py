@@ -0,0 +1,356 @@
+"""
+Generador de carga para cualquier ejercicio del tema: arranca en el mismo
+proceso el servidor de un create_server (2a) o la aplicación de un create_app
+(2b-2f), lo somete a carga con una concurrencia y una mezcla de peticiones
+configurables e informa de:
+
+- peticiones por segundo,
+- latencias p50 / p95 / p99 / p99.9,
+- porcentaje de errores (fallos de conexión y respuestas 5xx) y recuento de
+  códigos de estado.
+
+Los resultados se pueden guardar en JSON (--output) y comparar con una
+ejecución anterior (--compare): el programa termina con código 1 si las
+peticiones por segundo bajan, o la p99 o el porcentaje de errores suben, más
+de --tolerance.
+
+Los clientes son hilos repartidos entre --client-processes procesos; con el
+valor por defecto (1) comparten el GIL con el servidor, así que para medir
+servidores que consumen CPU conviene usar varios procesos cliente.
+
+Mezcla de peticiones: cada --request es "MÉTODO /ruta" con un peso opcional
+("GET /product/1 *3"); --mix lee un fichero JSON con una lista de objetos
+{"method", "path", "weight", "json", "body", "headers"}. Sin ninguna de las
+dos se usa "GET /".
+
+Uso:
+    python bench/loadgen.py 2a/ej2a2 --request "GET /product/1 *9" --request "GET /product/999"
+    python bench/loadgen.py 2a/ej2a1 --option workers=8 --concurrency 1,8,32 --duration 5
+    python bench/loadgen.py 2c/ej2c2 --mix tareas.json --output hoy.json --compare ayer.json
+"""
+
+import argparse
+import ast
+import http.client
+import importlib
+import json
+import logging
+import math
+import multiprocessing
+import os
+import random
+import sys
+import threading
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+
+
+def load_target(target):
+    """
+    Importa el ejercicio ('2a/ej2a2', '2a/ej2a2.py' o 'ej2a2') y devuelve su módulo
+    """
+    name = os.path.splitext(os.path.basename(target))[0]
+    directory = os.path.dirname(target) or name[2:4]
+    sys.path.insert(0, os.path.join(ROOT, directory))
+    return importlib.import_module(name)
+
+
+def start_server(module, options):
+    """
+    Arranca el servidor del ejercicio en un hilo y devuelve (puerto, función para pararlo)
+    """
+    if hasattr(module, 'create_server'):
+        server = module.create_server(host="localhost", port=0, **options)
+        handler_class = server.RequestHandlerClass
+        server.RequestHandlerClass = type(handler_class.__name__, (handler_class,),
+                                          {'log_message': lambda self, format, *args: None})
+    else:
+        from werkzeug.serving import make_server
+        logging.getLogger('werkzeug').setLevel(logging.ERROR)
+        app = module.create_app(**options)
+        server = make_server("localhost", 0, app, threaded=True)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    time.sleep(0.3)
+
+    def stop():
+        server.shutdown()
+        server.server_close()
+        thread.join(1)
+
+    return server.server_port, stop
+
+
+def parse_request(spec):
+    """
+    Convierte "MÉTODO /ruta *peso" en una entrada de la mezcla
+    """
+    parts = spec.split()
+    weight = 1
+    if len(parts) == 3 and parts[2].startswith('*'):
+        weight = float(parts[2][1:])
+        parts = parts[:2]
+    if len(parts) != 2:
+        raise argparse.ArgumentTypeError(f'Petición no válida: {spec!r}')
+    return {'method': parts[0].upper(), 'path': parts[1], 'weight': weight}
+
+
+def prepare_mix(entries):
+    """
+    Codifica el cuerpo y las cabeceras de cada entrada una sola vez
+    """
+    mix = []
+    for entry in entries:
+        headers = dict(entry.get('headers', {}))
+        body = entry.get('body')
+        if 'json' in entry:
+            body = json.dumps(entry['json'])
+            headers.setdefault('Content-Type', 'application/json')
+        if isinstance(body, str):
+            body = body.encode('utf-8')
+        mix.append((entry.get('method', 'GET').upper(), entry['path'], body, headers,
+                    float(entry.get('weight', 1))))
+    return mix
+
+
+def client(port, mix, deadline, max_requests, keepalive, seed):
+    """
+    Bucle de un cliente: hace peticiones hasta 'deadline' o 'max_requests'.
+    Devuelve (latencias en segundos de las peticiones correctas, códigos de
+    estado, número de errores de conexión).
+    """
+    rng = random.Random(seed)
+    weights = [entry[4] for entry in mix]
+    latencies, statuses, failures = [], {}, 0
+    conn = None
+    count = 0
+    while time.perf_counter() < deadline and (max_requests is None or count < max_requests):
+        method, path, body, headers, _ = rng.choices(mix, weights)[0]
+        count += 1
+        start = time.perf_counter()
+        try:
+            if conn is None:
+                conn = http.client.HTTPConnection("localhost", port, timeout=10)
+            conn.request(method, path, body=body, headers=headers)
+            response = conn.getresponse()
+            response.read()
+        except (OSError, http.client.HTTPException):
+            failures += 1
+            if conn is not None:
+                conn.close()
+            conn = None
+            continue
+        latencies.append(time.perf_counter() - start)
+        statuses[response.status] = statuses.get(response.status, 0) + 1
+        if not keepalive or response.will_close:
+            conn.close()
+            conn = None
+    if conn is not None:
+        conn.close()
+    return latencies, statuses, failures
+
+
+def client_process(port, mix, deadline, max_requests, keepalive, seeds, results):
+    """
+    Ejecuta varios clientes en hilos dentro de un proceso y envía sus resultados por la cola
+    """
+    outputs = [None] * len(seeds)
+
+    def run(i):
+        outputs[i] = client(port, mix, deadline, max_requests, keepalive, seeds[i])
+
+    threads = [threading.Thread(target=run, args=(i,)) for i in range(len(seeds))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    results.put(outputs)
+
+
+def percentile(sorted_values, p):
+    """
+    Percentil p (0-100) por el método del rango más cercano
+    """
+    if not sorted_values:
+        return None
+    rank = max(1, math.ceil(p / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def run_level(port, mix, concurrency, duration, total_requests, keepalive, client_processes):
+    """
+    Somete el servidor a carga con 'concurrency' clientes y devuelve las métricas
+    """
+    max_requests = None if total_requests is None else math.ceil(total_requests / concurrency)
+    deadline = time.perf_counter() + (duration if total_requests is None else 3600)
+    seeds = list(range(concurrency))
+    processes = max(1, min(client_processes, concurrency))
+    groups = [seeds[i::processes] for i in range(processes)]
+
+    start = time.perf_counter()
+    if processes == 1:
+        queue = _LocalQueue()
+        client_process(port, mix, deadline, max_requests, keepalive, seeds, queue)
+        outputs = queue.get()
+    else:
+        context = multiprocessing.get_context('fork')
+        queue = context.Queue()
+        workers = [context.Process(target=client_process,
+                                   args=(port, mix, deadline, max_requests, keepalive, group, queue))
+                   for group in groups]
+        for worker in workers:
+            worker.start()
+        outputs = [output for _ in workers for output in queue.get()]
+        for worker in workers:
+            worker.join()
+    elapsed = time.perf_counter() - start
+
+    latencies = sorted(latency for output in outputs for latency in output[0])
+    statuses = {}
+    for output in outputs:
+        for status, count in output[1].items():
+            statuses[status] = statuses.get(status, 0) + count
+    failures = sum(output[2] for output in outputs)
+    completed = len(latencies)
+    errors = failures + sum(count for status, count in statuses.items() if status >= 500)
+    attempted = completed + failures
+    return {
+        'concurrency': concurrency,
+        'requests': attempted,
+        'seconds': round(elapsed, 3),
+        'throughput': round(completed / elapsed, 1) if elapsed else 0.0,
+        'latency_ms': {name: None if value is None else round(value * 1000, 3)
+                       for name, value in (('p50', percentile(latencies, 50)),
+                                           ('p95', percentile(latencies, 95)),
+                                           ('p99', percentile(latencies, 99)),
+                                           ('p99.9', percentile(latencies, 99.9)))},
+        'error_rate': round(errors / attempted, 4) if attempted else 0.0,
+        'connection_errors': failures,
+        'statuses': {str(status): count for status, count in sorted(statuses.items())},
+    }
+
+
+class _LocalQueue:
+    """
+    Cola mínima para reutilizar client_process sin crear procesos
+    """
+
+    def put(self, item):
+        self.item = item
+
+    def get(self):
+        return self.item
+
+
+def print_results(results):
+    print(f"{'clientes':>8}{'peticiones':>12}{'r/s':>10}{'p50':>9}{'p95':>9}{'p99':>9}{'p99.9':>9}{'errores':>9}")
+    for level in results:
+        latency = level['latency_ms']
+        cells = ''.join(f"{'-' if latency[p] is None else f'{latency[p]:.2f}':>9}"
+                        for p in ('p50', 'p95', 'p99', 'p99.9'))
+        print(f"{level['concurrency']:>8}{level['requests']:>12}{level['throughput']:>10.0f}"
+              f"{cells}{level['error_rate'] * 100:>8.2f}%")
+    print("latencias en ms")
+
+
+def compare(results, baseline, tolerance):
+    """
+    Compara con una ejecución anterior nivel a nivel de concurrencia.
+    Devuelve la lista de regresiones encontradas.
+    """
+    previous = {level['concurrency']: level for level in baseline['results']}
+    regressions = []
+    for level in results:
+        old = previous.get(level['concurrency'])
+        if old is None:
+            continue
+        c = level['concurrency']
+        if old['throughput'] and level['throughput'] < old['throughput'] * (1 - tolerance):
+            regressions.append(f"{c} clientes: r/s {old['throughput']:.0f} -> {level['throughput']:.0f}")
+        old_p99, new_p99 = old['latency_ms']['p99'], level['latency_ms']['p99']
+        if old_p99 and new_p99 and new_p99 > old_p99 * (1 + tolerance):
+            regressions.append(f"{c} clientes: p99 {old_p99:.2f} ms -> {new_p99:.2f} ms")
+        if level['error_rate'] > old['error_rate'] + tolerance / 100:
+            regressions.append(f"{c} clientes: errores {old['error_rate']:.2%} -> {level['error_rate']:.2%}")
+    return regressions
+
+
+def parse_option(text):
+    """
+    Convierte "nombre=valor" en (nombre, valor), interpretando el valor como literal de Python si se puede
+    """
+    name, sep, value = text.partition('=')
+    if not sep:
+        raise argparse.ArgumentTypeError(f'Opción no válida: {text!r}')
+    try:
+        value = ast.literal_eval(value)
+    except (ValueError, SyntaxError):
+        pass
+    return name, value
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('target', help="ejercicio a probar, por ejemplo 2a/ej2a2 o 2c/ej2c1")
+    parser.add_argument('--request', action='append', type=parse_request, default=[],
+                        help='"MÉTODO /ruta [*peso]"; se puede repetir')
+    parser.add_argument('--mix', help='fichero JSON con la mezcla de peticiones')
+    parser.add_argument('--concurrency', default='1,8,32',
+                        help='niveles de concurrencia separados por comas (por defecto 1,8,32)')
+    parser.add_argument('--duration', type=float, default=5.0, help='segundos por nivel')
+    parser.add_argument('--requests', type=int, help='peticiones por nivel (en lugar de --duration)')
+    parser.add_argument('--no-keepalive', dest='keepalive', action='store_false',
+                        help='abrir una conexión nueva por petición')
+    parser.add_argument('--client-processes', type=int, default=1)
+    parser.add_argument('--option', action='append', type=parse_option, default=[],
+                        help='nombre=valor para create_server/create_app; se puede repetir')
+    parser.add_argument('--output', help='guardar los resultados en este fichero JSON')
+    parser.add_argument('--compare', help='fichero JSON de una ejecución anterior')
+    parser.add_argument('--tolerance', type=float, default=0.10,
+                        help='variación relativa admitida al comparar (por defecto 0.10)')
+    args = parser.parse_args(argv)
+
+    entries = list(args.request)
+    if args.mix:
+        with open(args.mix, encoding='utf-8') as f:
+            entries.extend(json.load(f))
+    mix = prepare_mix(entries or [{'method': 'GET', 'path': '/'}])
+    levels = [int(level) for level in args.concurrency.split(',')]
+    options = dict(args.option)
+
+    module = load_target(args.target)
+    port, stop = start_server(module, options)
+    try:
+        results = [run_level(port, mix, level, args.duration, args.requests, args.keepalive,
+                             args.client_processes) for level in levels]
+    finally:
+        stop()
+
+    print_results(results)
+    report = {
+        'target': args.target,
+        'options': options,
+        'mix': [{'method': m, 'path': p, 'weight': w} for m, p, _, _, w in mix],
+        'keepalive': args.keepalive,
+        'client_processes': args.client_processes,
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'results': results,
+    }
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        if regressions:
+            print("Regresiones respecto a", args.compare)
+            for regression in regressions:
+                print("  " + regression)
+            return 1
+        print("Sin regresiones respecto a", args.compare)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
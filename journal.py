@@ -0,0 +1,351 @@
+"""
+Diario de solo escritura al final con instantáneas, para que las
+colecciones en memoria sobrevivan a los reinicios sin dejar de leerse desde
+memoria.
+
+Cada cambio (guardar o eliminar un registro) se añade al diario como una
+entrada binaria: longitud, CRC32, tipo y el registro en JSON. Cada entrada
+se escribe directamente en el fichero (sin búfer de Python), así que un
+fallo del proceso no pierde cambios ya confirmados. Para sobrevivir también
+a un corte de corriente hace falta fsync: un hilo hace fsync de todo lo
+escrito hasta el momento y wait(seq) espera a que la entrada seq esté en
+disco. Mientras dura un fsync se acumulan las entradas siguientes, que
+comparten el siguiente (group commit): con muchos escritores a la vez se
+hace un fsync por grupo, no uno por cambio.
+
+Cada snapshot_every entradas el almacén pide una instantánea: rotate() cierra
+el diario actual y abre el de la generación siguiente, y en segundo plano se
+escribe el estado completo en snapshot-<generación>.bin. Cuando la
+instantánea está en disco se borran los diarios y las instantáneas
+anteriores, así que el diario no crece sin límite.
+
+Al arrancar, load() abre con mmap la última instantánea válida y aplica
+encima los diarios de su generación en adelante. Una entrada incompleta o
+con el CRC mal al final del último diario (un fallo a mitad de escritura)
+se descarta y el fichero se trunca en ese punto. Los diarios anteriores se
+cerraron con fsync, así que una entrada mal en ellos no es una escritura a
+medias sino un fichero dañado: load() lanza ValueError en lugar de aplicar
+los diarios siguientes sobre un estado incompleto.
+
+Los registros son diccionarios con una clave 'id' entera.
+"""
+
+import json
+import mmap
+import os
+import re
+import struct
+import threading
+import zlib
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depende del entorno
+    orjson = None
+
+# Entrada del diario: longitud del contenido, CRC32 del contenido y tipo
+ENTRY = struct.Struct('<IIB')
+PUT = 1
+DELETE = 2
+# Marca (en el tipo de la entrada y en la cabecera de la instantánea) de un
+# contenido escrito con json porque orjson no lo admite, por ejemplo enteros
+# de más de 64 bits; orjson los leería como float, así que se lee con json
+STDLIB_JSON = 0x80
+# Cabecera de la instantánea: generación, siguiente id, número de registros,
+# longitud y CRC32 del contenido (una lista JSON con los registros) y marcas
+SNAPSHOT_MAGIC = b'SNAPSHT2'
+SNAPSHOT_HEADER = struct.Struct('<QQQQIB')
+FILE_NAME = re.compile(r'^(journal|snapshot)-(\d{8})\.(log|bin)$')
+
+
+def _dumps(value):
+    """
+    Devuelve (contenido, marcas): el JSON de value y STDLIB_JSON si se ha
+    escrito con json
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS), 0
+        except TypeError:
+            pass
+    return json.dumps(value, ensure_ascii=False, separators=(',', ':')).encode('utf-8'), STDLIB_JSON
+
+
+def _loads(data, flags):
+    # orjson lee directamente de la memoria del mmap; json necesita una copia
+    if orjson is not None and not flags & STDLIB_JSON:
+        return orjson.loads(data)
+    return json.loads(bytes(data))
+
+
+class Journal:
+    """
+    Diario con instantáneas de una colección de registros, en un directorio
+    """
+
+    def __init__(self, directory, fsync=True, snapshot_every=100_000):
+        self.directory = directory
+        self.fsync = fsync
+        self.snapshot_every = snapshot_every
+        self.generation = 0
+        self.entries_since_snapshot = 0
+        # True si load() no ha encontrado ningún dato anterior
+        self.is_new = True
+        self._fd = None
+        self._written = 0
+        self._synced = 0
+        self._closed = False
+        self._snapshotting = False
+        self._snapshot_thread = None
+        self._lock = threading.Lock()
+        self._pending = threading.Condition(self._lock)
+        self._synced_cond = threading.Condition(self._lock)
+        # Impide cerrar el fichero (rotate, close) durante un fsync
+        self._sync_lock = threading.Lock()
+        self._flusher = None
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, kind, generation):
+        extension = 'log' if kind == 'journal' else 'bin'
+        return os.path.join(self.directory, f'{kind}-{generation:08d}.{extension}')
+
+    def _files(self, kind):
+        """
+        Generaciones de los ficheros de un tipo, en orden
+        """
+        generations = []
+        for name in os.listdir(self.directory):
+            match = FILE_NAME.match(name)
+            if match and match.group(1) == kind:
+                generations.append(int(match.group(2)))
+        return sorted(generations)
+
+    def load(self):
+        """
+        Reconstruye el estado desde la última instantánea y los diarios
+        posteriores y abre el diario para escribir. Devuelve (registros por
+        id, siguiente id).
+        """
+        records, next_id, snapshot_generation = {}, 1, 0
+        for generation in reversed(self._files('snapshot')):
+            state = self._read_snapshot(self._path('snapshot', generation))
+            if state is not None:
+                records, next_id = state
+                snapshot_generation = generation
+                break
+        journals = [g for g in self._files('journal') if g >= snapshot_generation]
+        for generation in journals:
+            next_id = self._replay(self._path('journal', generation), records, next_id,
+                                   last=generation == journals[-1])
+        self.is_new = not snapshot_generation and not journals
+        self.generation = max([snapshot_generation, 1] + journals)
+        self._open(self.generation)
+        return records, next_id
+
+    def _read_snapshot(self, path):
+        with open(path, 'rb') as f:
+            try:
+                mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:  # fichero vacío
+                return None
+        with mm:
+            header_end = len(SNAPSHOT_MAGIC) + SNAPSHOT_HEADER.size
+            if len(mm) < header_end or mm[:len(SNAPSHOT_MAGIC)] != SNAPSHOT_MAGIC:
+                return None
+            _, next_id, count, length, crc, flags = SNAPSHOT_HEADER.unpack_from(mm, len(SNAPSHOT_MAGIC))
+            body = memoryview(mm)[header_end:header_end + length]
+            try:
+                if len(body) != length or zlib.crc32(body) != crc:
+                    return None
+                records = {record['id']: record for record in _loads(body, flags)}
+            finally:
+                body.release()
+        if len(records) != count:
+            return None
+        return records, next_id
+
+    def _replay(self, path, records, next_id, last):
+        """
+        Aplica las entradas de un diario. Si es el último, trunca lo que haya
+        después de la última entrada válida; si no, una entrada no válida es
+        un error.
+        """
+        with open(path, 'r+b') as f:
+            size = os.fstat(f.fileno()).st_size
+            if not size:
+                return next_id
+            offset = 0
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                while offset + ENTRY.size <= size:
+                    length, crc, kind = ENTRY.unpack_from(mm, offset)
+                    flags, kind = kind & STDLIB_JSON, kind & ~STDLIB_JSON
+                    start = offset + ENTRY.size
+                    with memoryview(mm)[start:start + length] as payload:
+                        if len(payload) != length or zlib.crc32(payload) != crc or kind not in (PUT, DELETE):
+                            break
+                        value = _loads(payload, flags)
+                    if kind == PUT:
+                        records[value['id']] = value
+                        next_id = max(next_id, value['id'] + 1)
+                    else:
+                        records.pop(value, None)
+                        next_id = max(next_id, value + 1)
+                    offset = start + length
+            if offset < size:
+                if not last:
+                    raise ValueError(f'Diario dañado: {path}, entrada no válida en el byte {offset}')
+                f.truncate(offset)
+                os.fsync(f.fileno())
+        return next_id
+
+    def _open(self, generation):
+        self._fd = self._create(generation)
+        if self.fsync and self._flusher is None:
+            self._flusher = threading.Thread(target=self._flush_loop, name='journal-fsync', daemon=True)
+            self._flusher.start()
+
+    def _create(self, generation):
+        """
+        Abre (o crea) el diario de 'generation' para añadir entradas
+        """
+        fd = os.open(self._path('journal', generation), os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+        # Sin fsync del directorio un fichero recién creado puede desaparecer
+        # tras un corte de corriente, con las entradas ya confirmadas
+        self._sync_directory()
+        return fd
+
+    def put(self, record):
+        """
+        Añade al diario el registro guardado; devuelve su número de entrada
+        """
+        payload, flags = _dumps(record)
+        return self._append(PUT | flags, payload)
+
+    def delete(self, key):
+        """
+        Añade al diario la eliminación del registro 'key'
+        """
+        payload, flags = _dumps(key)
+        return self._append(DELETE | flags, payload)
+
+    def _append(self, kind, payload):
+        entry = ENTRY.pack(len(payload), zlib.crc32(payload), kind) + payload
+        with self._lock:
+            os.write(self._fd, entry)
+            self._written += 1
+            self.entries_since_snapshot += 1
+            self._pending.notify()
+            return self._written
+
+    def wait(self, seq):
+        """
+        Espera a que la entrada seq esté en disco (con fsync=False no espera)
+        """
+        if not self.fsync:
+            return
+        with self._lock:
+            while self._synced < seq and not self._closed:
+                self._synced_cond.wait()
+
+    def _flush_loop(self):
+        while True:
+            with self._lock:
+                while self._written == self._synced and not self._closed:
+                    self._pending.wait()
+                if self._closed:
+                    return
+            with self._sync_lock:
+                with self._lock:
+                    if self._closed:
+                        return
+                    target = self._written
+                    fd = self._fd
+                # Fuera del cerrojo: mientras tanto se siguen añadiendo entradas
+                os.fsync(fd)
+                with self._lock:
+                    self._synced = max(self._synced, target)
+                    self._synced_cond.notify_all()
+
+    def should_snapshot(self):
+        return self.entries_since_snapshot >= self.snapshot_every and not self._snapshotting
+
+    def rotate(self):
+        """
+        Cierra el diario actual (con fsync) y empieza la generación
+        siguiente. Devuelve la generación nueva: su instantánea debe tener el
+        estado de la colección en el momento de la llamada.
+        """
+        with self._sync_lock, self._lock:
+            os.fsync(self._fd)
+            os.close(self._fd)
+            self._synced = self._written
+            self._synced_cond.notify_all()
+            self.generation += 1
+            self.entries_since_snapshot = 0
+            self._fd = self._create(self.generation)
+            return self.generation
+
+    def write_snapshot(self, generation, records, next_id):
+        """
+        Escribe la instantánea de 'generation' con los registros dados y
+        borra los diarios e instantáneas anteriores, que ya no hacen falta
+        """
+        body, flags = _dumps(records)
+        header = SNAPSHOT_MAGIC + SNAPSHOT_HEADER.pack(generation, next_id, len(records), len(body),
+                                                       zlib.crc32(body), flags)
+        path = self._path('snapshot', generation)
+        temporary = path + '.tmp'
+        with open(temporary, 'wb') as f:
+            f.write(header)
+            f.write(body)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temporary, path)
+        self._sync_directory()
+        for kind in ('journal', 'snapshot'):
+            for old in self._files(kind):
+                if old < generation:
+                    os.remove(self._path(kind, old))
+
+    def snapshot_async(self, generation, records, next_id):
+        """
+        Escribe la instantánea en un hilo aparte; devuelve el hilo
+        """
+        self._snapshotting = True
+
+        def run():
+            try:
+                self.write_snapshot(generation, records, next_id)
+            finally:
+                self._snapshotting = False
+
+        thread = threading.Thread(target=run, name='journal-snapshot', daemon=True)
+        thread.start()
+        self._snapshot_thread = thread
+        return thread
+
+    def _sync_directory(self):
+        # El cambio de nombre solo es definitivo tras hacer fsync del directorio
+        fd = os.open(self.directory, os.O_RDONLY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+    def close(self):
+        """
+        Hace fsync de lo pendiente y cierra el diario, tras esperar a la
+        instantánea en curso
+        """
+        if self._snapshot_thread is not None:
+            self._snapshot_thread.join()
+        with self._sync_lock, self._lock:
+            if self._fd is None:
+                return
+            os.fsync(self._fd)
+            os.close(self._fd)
+            self._fd = None
+            self._synced = self._written
+            self._closed = True
+            self._pending.notify_all()
+            self._synced_cond.notify_all()
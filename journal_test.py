@@ -0,0 +1,161 @@
+import os
+import threading
+import pytest
+from journal import ENTRY, Journal
+
+
+@pytest.fixture
+def directory(tmp_path):
+    return str(tmp_path / "journal")
+
+
+def test_replay(directory):
+    """
+    Al volver a abrir el diario se recuperan los registros y el siguiente id
+    """
+    journal = Journal(directory)
+    assert journal.load() == ({}, 1)
+    assert journal.is_new
+    for i in (1, 2, 3):
+        journal.wait(journal.put({"id": i, "name": str(i)}))
+    journal.wait(journal.put({"id": 2, "name": "x"}))
+    journal.wait(journal.delete(3))
+    journal.close()
+
+    journal = Journal(directory)
+    assert journal.load() == ({1: {"id": 1, "name": "1"}, 2: {"id": 2, "name": "x"}}, 4)
+    assert not journal.is_new
+    journal.close()
+
+
+def test_torn_tail_is_truncated(directory):
+    """
+    Una entrada a medio escribir o con el CRC mal al final se descarta
+    """
+    journal = Journal(directory, fsync=False)
+    journal.load()
+    journal.put({"id": 1})
+    journal.put({"id": 2})
+    journal.close()
+    path = os.path.join(directory, "journal-00000001.log")
+    size = os.path.getsize(path)
+    with open(path, "r+b") as f:
+        f.truncate(size - 1)
+
+    journal = Journal(directory, fsync=False)
+    assert journal.load() == ({1: {"id": 1}}, 2)
+    assert os.path.getsize(path) == size // 2, "El fichero se trunca tras la última entrada válida"
+    journal.put({"id": 3})
+    journal.close()
+
+    with open(path, "r+b") as f:
+        f.seek(ENTRY.size + 1)
+        f.write(b"X")
+    journal = Journal(directory, fsync=False)
+    assert journal.load() == ({}, 1), "Con el CRC mal se descarta desde esa entrada"
+    journal.close()
+
+
+def test_snapshot_compacts(directory):
+    """
+    La instantánea sustituye a los diarios anteriores y se combina con el
+    diario posterior al cargar
+    """
+    journal = Journal(directory, snapshot_every=2)
+    journal.load()
+    journal.put({"id": 1})
+    assert not journal.should_snapshot()
+    journal.put({"id": 2})
+    assert journal.should_snapshot()
+    generation = journal.rotate()
+    journal.snapshot_async(generation, [{"id": 1}, {"id": 2}], 3).join()
+    journal.wait(journal.delete(1))
+    journal.wait(journal.put({"id": 3}))
+    journal.close()
+    assert sorted(os.listdir(directory)) == ["journal-00000002.log", "snapshot-00000002.bin"]
+
+    journal = Journal(directory)
+    assert journal.load() == ({2: {"id": 2}, 3: {"id": 3}}, 4)
+    assert journal.generation == 2
+    journal.close()
+
+
+def test_damaged_snapshot_is_ignored(directory):
+    """
+    Si la instantánea más reciente está dañada se usan los diarios
+    """
+    journal = Journal(directory)
+    journal.load()
+    journal.put({"id": 1})
+    generation = journal.rotate()
+    journal.put({"id": 2})
+    journal.close()
+    with open(os.path.join(directory, f"snapshot-{generation:08d}.bin"), "wb") as f:
+        f.write(b"SNAPSHT1 a medias")
+
+    journal = Journal(directory)
+    assert journal.load() == ({1: {"id": 1}, 2: {"id": 2}}, 3)
+    journal.close()
+
+
+def test_group_commit(directory):
+    """
+    Con varios hilos escribiendo cada uno espera solo a su entrada
+    """
+    journal = Journal(directory)
+    journal.load()
+
+    def writer(start):
+        for i in range(start, start + 50):
+            journal.wait(journal.put({"id": i}))
+
+    threads = [threading.Thread(target=writer, args=(n * 50 + 1,)) for n in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    journal.close()
+
+    records, next_id = Journal(directory, fsync=False).load()
+    assert sorted(records) == list(range(1, 201))
+    assert next_id == 201
+
+
+def test_damaged_older_journal(directory):
+    """
+    Una entrada mal en un diario que no es el último no se trunca: es un error
+    """
+    journal = Journal(directory, fsync=False)
+    journal.load()
+    journal.put({"id": 1})
+    journal.put({"id": 2})
+    journal.rotate()
+    journal.put({"id": 3})
+    journal.close()
+    path = os.path.join(directory, "journal-00000001.log")
+    size = os.path.getsize(path)
+    with open(path, "r+b") as f:
+        f.seek(size - 1)
+        f.write(b"X")
+
+    with pytest.raises(ValueError):
+        Journal(directory, fsync=False).load()
+    assert os.path.getsize(path) == size
+
+
+def test_big_ints_round_trip(directory):
+    """
+    Los enteros de más de 64 bits (que orjson no escribe) se guardan con json
+    y se recuperan exactos, del diario y de la instantánea
+    """
+    journal = Journal(directory)
+    journal.load()
+    journal.wait(journal.put({"id": 1, "priority": 2 ** 70}))
+    journal.close()
+    journal = Journal(directory)
+    assert journal.load() == ({1: {"id": 1, "priority": 2 ** 70}}, 2)
+    journal.write_snapshot(journal.rotate(), [{"id": 1, "priority": 2 ** 70}], 2)
+    journal.close()
+    journal = Journal(directory)
+    assert journal.load() == ({1: {"id": 1, "priority": 2 ** 70}}, 2)
+    journal.close()
@@ -0,0 +1,92 @@
+"""
+Proveedor JSON rápido para las aplicaciones Flask del tema.
+
+El proveedor por defecto de Flask ordena las claves, crea un JSONEncoder
+nuevo en cada llamada a json.dumps y, en modo debug, añade sangría.
+FastJSONProvider:
+
+- no ordena las claves y usa separadores compactos siempre,
+- usa orjson si está instalado y, si no, un único JSONEncoder de la
+  biblioteca estándar creado una vez (con su codificador en C),
+- escapa los caracteres no ASCII como Flask (ensure_ascii). orjson no sabe
+  escaparlos: si su resultado no es ASCII se serializa con el JSONEncoder,
+  así que los bytes enviados son siempre los de Flask. Con
+  ensure_ascii = False se envía UTF-8 directamente, también con orjson,
+- mantiene el tratamiento de Flask para fechas, Decimal, UUID, dataclasses
+  y objetos con __html__.
+
+Solo cambia la serialización de las respuestas: las peticiones se siguen
+leyendo con la biblioteca estándar (loads de Flask), que conserva los
+enteros de cualquier tamaño (orjson los convierte en float).
+
+Se instala en cada create_app con: app.json = FastJSONProvider(app)
+"""
+
+import json
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depende del entorno
+    orjson = None
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """
+    Proveedor JSON compacto, sin ordenar claves y con orjson si está disponible
+    """
+
+    sort_keys = False
+    compact = True
+
+    if orjson is not None:
+        # Las fechas pasan por default() para mantener el formato HTTP de Flask,
+        # y las subclases de dict, list, str e int para que se serialicen como
+        # con la biblioteca estándar (un MultiDict, por ejemplo, con sus items())
+        _orjson_options = (orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+                           | orjson.OPT_PASSTHROUGH_SUBCLASS)
+
+    def __init__(self, app):
+        super().__init__(app)
+        self._encoder = json.JSONEncoder(ensure_ascii=self.ensure_ascii, separators=(',', ':'),
+                                         default=self.default)
+
+    @staticmethod
+    def _orjson_default(o):
+        if hasattr(o, '__html__'):
+            return str(o.__html__())
+        if isinstance(o, dict):
+            return dict(o.items())
+        if isinstance(o, list):
+            return list(o)
+        if isinstance(o, str):
+            return str(o)
+        if isinstance(o, int) and not isinstance(o, bool):
+            return int(o)
+        return DefaultJSONProvider.default(o)
+
+    def dumps_bytes(self, obj):
+        """
+        Serializa obj a JSON en bytes UTF-8
+        """
+        if orjson is not None:
+            try:
+                data = orjson.dumps(obj, default=self._orjson_default, option=self._orjson_options)
+            except TypeError:
+                # Tipos que orjson no admite (por ejemplo enteros de más de 64 bits)
+                pass
+            else:
+                if data.isascii() or not self.ensure_ascii:
+                    return data
+        return self._encoder.encode(obj).encode('utf-8')
+
+    def dumps(self, obj, **kwargs):
+        if kwargs:
+            kwargs.setdefault('default', self.default)
+            kwargs.setdefault('ensure_ascii', self.ensure_ascii)
+            return json.dumps(obj, **kwargs)
+        return self.dumps_bytes(obj).decode('utf-8')
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(self.dumps_bytes(obj) + b'\n', mimetype=self.mimetype)
@@ -0,0 +1,78 @@
+import datetime
+import json
+from flask import Flask, jsonify, request
+from werkzeug.datastructures import MultiDict
+from json_provider import FastJSONProvider
+
+
+def make_app():
+    app = Flask(__name__)
+    app.json = FastJSONProvider(app)
+    return app
+
+
+def test_compact_unsorted_ascii():
+    """
+    La respuesta es compacta, mantiene el orden de las claves y escapa los
+    caracteres no ASCII como el proveedor de Flask
+    """
+    app = make_app()
+    with app.app_context():
+        response = jsonify({"nombre": "Ñandú", "id": 1})
+    assert response.data == b'{"nombre":"\\u00d1and\\u00fa","id":1}\n'
+    assert response.mimetype == "application/json"
+
+
+def test_utf8_when_ensure_ascii_is_disabled():
+    """
+    Con ensure_ascii = False los caracteres no ASCII se envían en UTF-8
+    """
+    class UTF8Provider(FastJSONProvider):
+        ensure_ascii = False
+
+    app = Flask(__name__)
+    app.json = UTF8Provider(app)
+    with app.app_context():
+        response = jsonify({"nombre": "Ñandú", "grande": 2 ** 70})
+    assert response.data == '{"nombre":"Ñandú","grande":1180591620717411303424}\n'.encode("utf-8")
+
+
+def test_same_values_as_default_provider():
+    """
+    Fechas, MultiDict y enteros grandes se serializan igual que con el proveedor de Flask
+    """
+    app = make_app()
+    data = {"fecha": datetime.datetime(2024, 1, 1), "form": MultiDict([("a", "1"), ("a", "2")]),
+            "grande": 2 ** 70}
+    expected = json.loads(Flask(__name__).json.dumps(data))
+    assert json.loads(app.json.dumps(data)) == expected
+    assert app.json.loads(app.json.dumps_bytes(data)) == expected
+
+
+def test_same_bytes_as_default_provider():
+    """
+    Con claves en el mismo orden, los bytes son los del proveedor de Flask, también con texto no ASCII
+    """
+    app = make_app()
+    flask_app = Flask(__name__)
+    flask_app.json.compact = True
+    data = {"a": "Ñandú €", "b": [1, 2.5, None, True]}
+    with app.app_context():
+        fast = jsonify(data).data
+    with flask_app.app_context():
+        default = jsonify(data).data
+    assert fast == default
+
+
+def test_request_keeps_big_ints():
+    """
+    Los enteros grandes de la petición llegan exactos a la vista
+    """
+    app = make_app()
+
+    @app.route("/echo", methods=["POST"])
+    def echo():
+        return jsonify(request.get_json())
+
+    response = app.test_client().post("/echo", json={"n": 2 ** 70})
+    assert json.loads(response.data) == {"n": 2 ** 70}
@@ -0,0 +1,555 @@
+"""
+Servidor de producción para las aplicaciones Flask del tema (2b-2f).
+
+app.run(debug=True) arranca el servidor de desarrollo: un solo proceso, con
+el recargador y el depurador activos. serve.py sirve el create_app de
+cualquier ejercicio con:
+
+- varios procesos (--workers) creados con fork que comparten el socket de
+  escucha, cada uno con un grupo fijo de hilos (--threads),
+- conexiones persistentes HTTP/1.1 (--keepalive segundos de espera entre
+  peticiones; 0 las desactiva),
+- límites de la línea de petición (414), de las cabeceras (431) y del cuerpo
+  (413, a través de MAX_CONTENT_LENGTH de Flask),
+- recarga ordenada con SIGHUP: se arrancan procesos nuevos, que vuelven a
+  importar el ejercicio, y los antiguos terminan las peticiones en curso
+  antes de salir. SIGTERM o Ctrl+C paran el servidor del mismo modo.
+
+El proceso padre no importa el ejercicio: cada hijo lo importa después del
+fork, de modo que una recarga sirve el código que haya en disco.
+
+Con --bench el servidor se arranca en segundo plano y se somete a carga con
+bench/loadgen.py; el programa termina con código 1 si hay errores.
+
+Uso:
+    python serve.py 2c/ej2c2 --workers 4 --threads 8 --port 8000
+    python serve.py 2c/ej2c1 --option MAX_BATCH_IDS=50 --max-body 1M
+    python serve.py 2c/ej2c2 --bench --request "GET /tasks" --concurrency 8,32
+"""
+
+import argparse
+import http.client
+import os
+import signal
+import socket
+import sys
+import threading
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+
+from werkzeug.serving import BaseWSGIServer, WSGIRequestHandler
+
+from bench import loadgen
+
+
+class LimitedRequestHandler(WSGIRequestHandler):
+    """
+    Manejador WSGI de werkzeug con límites de tamaño para la línea de
+    petición y las cabeceras. Mientras el servidor se está parando cierra la
+    conexión después de cada respuesta.
+    """
+
+    protocol_version = "HTTP/1.1"
+    # Las cabeceras y el cuerpo se escriben por separado; sin TCP_NODELAY el
+    # segundo envío espera al ACK retardado del cliente en cada petición
+    disable_nagle_algorithm = True
+    # Segundos de espera de la siguiente petición en una conexión persistente
+    timeout = 5
+    max_request_line = 8190
+    max_header_size = 16384
+    max_headers = 100
+    # Bytes del cuerpo que la aplicación no ha leído y se descartan para
+    # mantener abierta la conexión; si quedan más, se cierra
+    max_drain = 64 * 1024
+    access_log = False
+
+    def handle_one_request(self):
+        self._body = None
+        try:
+            self.raw_requestline = self.rfile.readline(self.max_request_line + 1)
+            if len(self.raw_requestline) > self.max_request_line:
+                self.requestline = ''
+                self.request_version = ''
+                self.command = ''
+                self.send_error(HTTPStatus.REQUEST_URI_TOO_LONG)
+                return
+            if not self.raw_requestline:
+                self.close_connection = True
+                return
+            if not self.parse_request():
+                return
+            self.run_wsgi()
+            self.wfile.flush()
+        except TimeoutError:
+            self.close_connection = True
+
+    def run_wsgi(self):
+        # La aplicación (y el descarte del resto del cuerpo que hace werkzeug
+        # al terminar) solo puede leer el cuerpo de esta petición, no la
+        # siguiente petición de la conexión
+        rfile = self.rfile
+        self.rfile = self._body = _RequestBody(rfile, self._content_length)
+        try:
+            super().run_wsgi()
+        finally:
+            self.rfile = rfile
+        if not self.close_connection and not self._body.drain(self.max_drain):
+            self.close_connection = True
+
+    def send_header(self, keyword, value):
+        # werkzeug envía siempre "Connection: close"; solo se mantiene si la
+        # conexión no puede seguir abierta
+        if keyword.lower() == 'connection' and value.lower() == 'close' and self._can_keep_alive():
+            if self.request_version == 'HTTP/1.0':
+                super().send_header('Connection', 'keep-alive')
+            return
+        super().send_header(keyword, value)
+
+    def _can_keep_alive(self):
+        # Las respuestas de error de http.server (self._body es None) cierran siempre
+        return (self._body is not None and self._body.remaining is not None
+                and self._body.remaining <= self.max_drain and not self.close_connection
+                and not self.server.draining and self.protocol_version >= 'HTTP/1.1')
+
+    def parse_request(self):
+        # http.client lee las cabeceras de self.rfile; el lector limitado
+        # produce los mismos errores que sus límites fijos, que
+        # BaseHTTPRequestHandler convierte en un 431
+        rfile = self.rfile
+        self.rfile = _HeaderReader(rfile, self.max_header_size, self.max_headers)
+        try:
+            if not super().parse_request():
+                return False
+        finally:
+            self.rfile = rfile
+        # Longitud del cuerpo: None si es chunked. Sin un entero no negativo
+        # en ASCII no se sabe dónde acaba el cuerpo ('²' pasa isdigit() pero
+        # no int()), así que se responde 400 y se cierra la conexión.
+        self._content_length = None
+        if 'chunked' not in self.headers.get('Transfer-Encoding', '').lower():
+            length = (self.headers.get('Content-Length') or '0').strip()
+            if not (length.isascii() and length.isdigit()):
+                self.send_error(HTTPStatus.BAD_REQUEST, 'Content-Length no válido')
+                return False
+            self._content_length = int(length)
+        return True
+
+    def log_request(self, code='-', size='-'):
+        if self.access_log:
+            super().log_request(code, size)
+
+
+class _HeaderReader:
+    """
+    Envoltorio de rfile que limita el tamaño total y el número de líneas de cabecera
+    """
+
+    def __init__(self, rfile, max_size, max_lines):
+        self._rfile = rfile
+        self._remaining = max_size
+        self._lines = max_lines + 1  # más la línea vacía final
+
+    def readline(self, limit=-1):
+        self._lines -= 1
+        if self._lines < 0:
+            raise http.client.HTTPException('Too many headers')
+        line = self._rfile.readline(self._remaining + 1)
+        self._remaining -= len(line)
+        if self._remaining < 0:
+            raise http.client.LineTooLong('header block')
+        return line
+
+
+class _RequestBody:
+    """
+    Envoltorio de rfile que entrega como máximo los 'length' bytes del
+    cuerpo de la petición (sin límite si length es None, cuerpo chunked)
+    """
+
+    def __init__(self, rfile, length):
+        self._rfile = rfile
+        self.remaining = length
+
+    def read(self, size=-1):
+        if self.remaining is None:
+            return self._rfile.read(size)
+        if size is None or size < 0 or size > self.remaining:
+            size = self.remaining
+        data = self._rfile.read(size) if size else b''
+        self.remaining -= len(data)
+        return data
+
+    def readline(self, size=-1):
+        if self.remaining is None:
+            return self._rfile.readline(size)
+        if size is None or size < 0 or size > self.remaining:
+            size = self.remaining
+        data = self._rfile.readline(size) if size else b''
+        self.remaining -= len(data)
+        return data
+
+    def drain(self, limit):
+        """
+        Descarta lo que quede del cuerpo si no pasa de 'limit' bytes.
+        Devuelve False si la conexión no puede reutilizarse.
+        """
+        if self.remaining is None or self.remaining > limit:
+            return False
+        while self.remaining:
+            if not self.read(self.remaining):
+                return False
+        return True
+
+
+class PooledWSGIServer(BaseWSGIServer):
+    """
+    Servidor WSGI que atiende cada conexión en un grupo fijo de hilos, en
+    lugar de crear un hilo por conexión como ThreadedWSGIServer
+    """
+
+    multithread = True
+
+    def __init__(self, host, port, app, handler, threads=4, fd=None, multiprocess=False):
+        self.multiprocess = multiprocess
+        self.draining = False
+        self._pool = ThreadPoolExecutor(threads, thread_name_prefix='wsgi')
+        self._free = threading.Semaphore(threads)
+        super().__init__(host, port, app, handler, fd=fd)
+        # Varios procesos esperan en el mismo socket: el que no llegue a
+        # tiempo al accept() no debe quedarse bloqueado en él
+        self.socket.setblocking(False)
+
+    def get_request(self):
+        # Solo se acepta una conexión si hay un hilo libre; mientras tanto la
+        # puede aceptar otro proceso. Un OSError hace que socketserver
+        # vuelva a esperar.
+        if not self._free.acquire(timeout=0.05):
+            raise BlockingIOError
+        try:
+            return super().get_request()
+        except OSError:
+            self._free.release()
+            raise
+
+    def process_request(self, request, client_address):
+        self._pool.submit(self._process_request, request, client_address)
+
+    def _process_request(self, request, client_address):
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+            self._free.release()
+
+    def drain(self):
+        """
+        Deja de aceptar conexiones; las peticiones en curso terminan y sus
+        conexiones se cierran
+        """
+        self.draining = True
+        self.shutdown()
+
+    def serve_forever(self, poll_interval=0.5):
+        try:
+            super().serve_forever(poll_interval)
+        finally:
+            # Espera a las conexiones que se están atendiendo
+            self._pool.shutdown(wait=True)
+
+
+class Arbiter:
+    """
+    Proceso padre: crea el socket de escucha, arranca 'workers' hijos y los
+    supervisa. Vuelve a arrancar los hijos que terminan inesperadamente,
+    recarga con SIGHUP y para con SIGTERM o SIGINT.
+    """
+
+    # Un hijo que termina antes de este número de segundos se vuelve a
+    # arrancar con este mismo retraso, para no entrar en un bucle de forks
+    restart_delay = 1
+    poll_interval = 0.2
+
+    def __init__(self, target, options=None, host='127.0.0.1', port=8000, workers=2, threads=4,
+                 keepalive=5, max_body=None, max_request_line=8190, max_header_size=16384,
+                 max_headers=100, backlog=2048, graceful_timeout=30, access_log=False):
+        self.target = target
+        self.options = options or {}
+        self.host = host
+        self.port = port
+        self.workers = workers
+        self.threads = threads
+        self.max_body = max_body
+        self.backlog = backlog
+        self.graceful_timeout = graceful_timeout
+        self.handler_class = type('RequestHandler', (LimitedRequestHandler,), {
+            'protocol_version': 'HTTP/1.1' if keepalive else 'HTTP/1.0',
+            'timeout': keepalive or None,
+            'max_request_line': max_request_line,
+            'max_header_size': max_header_size,
+            'max_headers': max_headers,
+            'access_log': access_log,
+        })
+        self.socket = None
+        self.generation = 0
+        self.restarts = 0
+        self._workers = {}
+        self._pending = {}
+        self._signals = []
+
+    def bind(self):
+        """
+        Crea el socket de escucha; con port=0 el sistema elige el puerto
+        """
+        self.socket = socket.create_server((self.host, self.port), backlog=self.backlog)
+        self.socket.set_inheritable(True)
+        self.port = self.socket.getsockname()[1]
+        return self.port
+
+    def run(self):
+        """
+        Arranca los hijos y los supervisa hasta recibir SIGTERM o SIGINT
+        """
+        if self.socket is None:
+            self.bind()
+        for signum in (signal.SIGTERM, signal.SIGINT, signal.SIGHUP):
+            signal.signal(signum, lambda signum, frame: self._signals.append(signum))
+        self._spawn_generation()
+        while True:
+            while self._signals:
+                signum = self._signals.pop(0)
+                if signum == signal.SIGHUP:
+                    self.reload()
+                else:
+                    self._stop()
+                    return
+            self._reap()
+            now = time.monotonic()
+            for slot, due in list(self._pending.items()):
+                if due <= now:
+                    del self._pending[slot]
+                    self._spawn(slot)
+            time.sleep(self.poll_interval)
+
+    def reload(self):
+        """
+        Arranca una generación nueva de hijos y pide a los anteriores que terminen
+        """
+        old = [pid for pid, (generation, _, _) in self._workers.items() if generation == self.generation]
+        self._pending.clear()
+        self._spawn_generation()
+        self._terminate(old, wait=False)
+
+    @property
+    def worker_pids(self):
+        return [pid for pid, (generation, _, _) in self._workers.items() if generation == self.generation]
+
+    def _spawn_generation(self):
+        self.generation += 1
+        for slot in range(self.workers):
+            self._spawn(slot)
+
+    def _spawn(self, slot):
+        pid = os.fork()
+        if pid == 0:
+            status = 1
+            try:
+                self._run_worker()
+                status = 0
+            except BaseException:
+                traceback.print_exc()
+            finally:
+                os._exit(status)
+        self._workers[pid] = (self.generation, slot, time.monotonic())
+
+    def _run_worker(self):
+        """
+        Cuerpo de cada hijo: importa el ejercicio y sirve peticiones hasta recibir SIGTERM
+        """
+        # Ctrl+C llega a todo el grupo de procesos; la parada la coordina el padre
+        signal.signal(signal.SIGINT, signal.SIG_IGN)
+        signal.signal(signal.SIGHUP, signal.SIG_IGN)
+        # Hasta que el servidor esté creado, SIGTERM termina el hijo sin más
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+        app = loadgen.load_target(self.target).create_app(**self.options)
+        if self.max_body is not None:
+            app.config['MAX_CONTENT_LENGTH'] = self.max_body
+        server = PooledWSGIServer(self.host, self.port, app, self.handler_class, threads=self.threads,
+                                  fd=self.socket.fileno(), multiprocess=self.workers > 1)
+        self.socket.close()
+        # shutdown() espera a que termine serve_forever, así que no puede
+        # llamarse desde el manejador de la señal, que se ejecuta en este hilo
+        signal.signal(signal.SIGTERM, lambda signum, frame: threading.Thread(
+            target=server.drain, daemon=True).start())
+        server.serve_forever()
+
+    def _reap(self):
+        """
+        Recoge los hijos que han terminado y programa el nuevo arranque de
+        los de la generación actual
+        """
+        while self._workers:
+            try:
+                pid, _ = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                return
+            if not pid:
+                return
+            if pid not in self._workers:
+                continue
+            generation, slot, started = self._workers.pop(pid)
+            if generation != self.generation:
+                continue
+            self.restarts += 1
+            if time.monotonic() - started < self.restart_delay:
+                self._pending[slot] = time.monotonic() + self.restart_delay
+            else:
+                self._spawn(slot)
+
+    def _terminate(self, pids, wait=True):
+        """
+        Envía SIGTERM a los hijos indicados; con wait=True espera a que
+        terminen y mata los que no lo hagan en graceful_timeout segundos
+        """
+        for pid in pids:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+        if not wait:
+            return
+        deadline = time.monotonic() + self.graceful_timeout
+        remaining = set(pids)
+        while remaining and time.monotonic() < deadline:
+            for pid in list(remaining):
+                try:
+                    done, _ = os.waitpid(pid, os.WNOHANG)
+                except ChildProcessError:
+                    done = pid
+                if done:
+                    remaining.discard(pid)
+                    self._workers.pop(pid, None)
+            time.sleep(0.05)
+        for pid in remaining:
+            try:
+                os.kill(pid, signal.SIGKILL)
+                os.waitpid(pid, 0)
+            except (ProcessLookupError, ChildProcessError):
+                pass
+            self._workers.pop(pid, None)
+
+    def _stop(self):
+        self._pending.clear()
+        self.generation += 1
+        self._terminate(list(self._workers))
+        self.socket.close()
+
+
+def parse_size(text):
+    """
+    Convierte "512", "64K" o "16M" en bytes
+    """
+    units = {'K': 1024, 'M': 1024 ** 2, 'G': 1024 ** 3}
+    text = text.strip().upper()
+    if text and text[-1] in units:
+        return int(text[:-1]) * units[text[-1]]
+    return int(text)
+
+
+def wait_ready(port, path, timeout=10):
+    """
+    Espera a que algún hijo responda a una petición
+    """
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            conn = http.client.HTTPConnection('127.0.0.1', port, timeout=1)
+            conn.request('GET', path)
+            conn.getresponse().read()
+            conn.close()
+            return
+        except (OSError, http.client.HTTPException):
+            if time.monotonic() > deadline:
+                raise
+            time.sleep(0.1)
+
+
+def bench(arbiter, args):
+    """
+    Arranca el servidor en un proceso hijo, lo somete a carga con loadgen y
+    lo para. Devuelve 1 si alguna petición ha fallado.
+    """
+    port = arbiter.bind()
+    pid = os.fork()
+    if pid == 0:
+        status = 1
+        try:
+            arbiter.run()
+            status = 0
+        finally:
+            os._exit(status)
+    arbiter.socket.close()
+    mix = loadgen.prepare_mix(args.request or [{'method': 'GET', 'path': '/'}])
+    try:
+        wait_ready(port, mix[0][1])
+        results = [loadgen.run_level(port, mix, int(level), args.duration, args.requests, True,
+                                     args.client_processes)
+                   for level in args.concurrency.split(',')]
+    finally:
+        os.kill(pid, signal.SIGTERM)
+        os.waitpid(pid, 0)
+    print(f"{args.target}: {arbiter.workers} procesos x {arbiter.threads} hilos")
+    loadgen.print_results(results)
+    failed = any(level['error_rate'] or not level['throughput'] for level in results)
+    return 1 if failed else 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('target', help="ejercicio a servir, por ejemplo 2c/ej2c2")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help='procesos hijos')
+    parser.add_argument('--threads', type=int, default=4, help='hilos por proceso')
+    parser.add_argument('--keepalive', type=float, default=5,
+                        help='segundos de espera en conexiones persistentes (0 las desactiva)')
+    parser.add_argument('--max-body', type=parse_size, help='tamaño máximo del cuerpo (por ejemplo 16M)')
+    parser.add_argument('--max-request-line', type=int, default=8190)
+    parser.add_argument('--max-header-size', type=parse_size, default=16384,
+                        help='tamaño máximo del bloque de cabeceras')
+    parser.add_argument('--max-headers', type=int, default=100)
+    parser.add_argument('--backlog', type=int, default=2048)
+    parser.add_argument('--graceful-timeout', type=float, default=30,
+                        help='segundos que se espera a las peticiones en curso al parar o recargar')
+    parser.add_argument('--access-log', action='store_true', help='registrar cada petición')
+    parser.add_argument('--option', action='append', type=loadgen.parse_option, default=[],
+                        help='nombre=valor para create_app; se puede repetir')
+    parser.add_argument('--bench', action='store_true', help='someter el servidor a carga y salir')
+    parser.add_argument('--request', action='append', type=loadgen.parse_request, default=[],
+                        help='con --bench: "MÉTODO /ruta [*peso]"; se puede repetir')
+    parser.add_argument('--concurrency', default='1,8,32', help='con --bench: niveles de concurrencia')
+    parser.add_argument('--duration', type=float, default=3.0, help='con --bench: segundos por nivel')
+    parser.add_argument('--requests', type=int, help='con --bench: peticiones por nivel')
+    parser.add_argument('--client-processes', type=int, default=1)
+    args = parser.parse_args(argv)
+
+    arbiter = Arbiter(args.target, dict(args.option), host=args.host, port=0 if args.bench else args.port,
+                      workers=args.workers, threads=args.threads, keepalive=args.keepalive,
+                      max_body=args.max_body, max_request_line=args.max_request_line,
+                      max_header_size=args.max_header_size, max_headers=args.max_headers,
+                      backlog=args.backlog, graceful_timeout=args.graceful_timeout,
+                      access_log=args.access_log)
+    if args.bench:
+        return bench(arbiter, args)
+    arbiter.bind()
+    print(f"Sirviendo {args.target} en http://{args.host}:{arbiter.port}/ con {args.workers} procesos x "
+          f"{args.threads} hilos (pid {os.getpid()}; SIGHUP recarga, Ctrl+C para)", flush=True)
+    arbiter.run()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,163 @@
+import http.client
+import os
+import signal
+import socket
+import time
+import pytest
+from serve import Arbiter, wait_ready
+
+APP = """
+import os
+from flask import Flask, request
+
+VERSION = {version!r}
+
+def create_app():
+    app = Flask(__name__)
+
+    @app.route('/')
+    def index():
+        return f'{{VERSION}} {{os.getpid()}}'
+
+    @app.route('/echo', methods=['POST'])
+    def echo():
+        return request.get_data()
+
+    return app
+"""
+
+
+def write_app(path, version):
+    # Versiones de distinta longitud para que no se reutilice el .pyc anterior
+    path.write_text(APP.format(version=version), encoding='utf-8')
+
+
+def start(arbiter):
+    port = arbiter.bind()
+    pid = os.fork()
+    if pid == 0:
+        try:
+            arbiter.run()
+        finally:
+            os._exit(0)
+    arbiter.socket.close()
+    wait_ready(port, '/')
+    return port, pid
+
+
+def stop(pid):
+    os.kill(pid, signal.SIGTERM)
+    _, status = os.waitpid(pid, 0)
+    return status
+
+
+@pytest.fixture
+def server(tmp_path):
+    """
+    Servidor con dos procesos sobre una aplicación de prueba; devuelve (puerto, pid del padre, ruta de la aplicación)
+    """
+    app_path = tmp_path / 'serve_app.py'
+    write_app(app_path, 'v1')
+    arbiter = Arbiter(str(app_path), port=0, workers=2, threads=2, keepalive=2, max_body=1024,
+                      max_request_line=256, max_header_size=1024, max_headers=10, graceful_timeout=5)
+    port, pid = start(arbiter)
+    yield port, pid, app_path
+    stop(pid)
+
+
+def get(port, path, headers=None):
+    conn = http.client.HTTPConnection('127.0.0.1', port, timeout=5)
+    conn.request('GET', path, headers=headers or {})
+    response = conn.getresponse()
+    body = response.read()
+    conn.close()
+    return response.status, body
+
+
+def test_keepalive(server):
+    """
+    Varias peticiones se atienden por la misma conexión
+    """
+    port, _, _ = server
+    conn = http.client.HTTPConnection('127.0.0.1', port, timeout=5)
+    for _ in range(3):
+        conn.request('GET', '/')
+        response = conn.getresponse()
+        assert response.status == 200
+        assert response.read().startswith(b'v1 ')
+        assert not response.will_close
+    conn.close()
+
+
+def test_request_line_limit(server):
+    port, _, _ = server
+    assert get(port, '/' + 'a' * 300)[0] == 414
+
+
+def test_header_limits(server):
+    port, _, _ = server
+    assert get(port, '/', {f'X-H{i}': 'x' for i in range(20)})[0] == 431
+    assert get(port, '/', {'X-Big': 'x' * 2000})[0] == 431
+    assert get(port, '/', {'X-Ok': 'x' * 100})[0] == 200
+
+
+def test_body_limit(server):
+    port, _, _ = server
+    conn = http.client.HTTPConnection('127.0.0.1', port, timeout=5)
+    conn.request('POST', '/echo', body=b'x' * 100)
+    response = conn.getresponse()
+    assert (response.status, response.read()) == (200, b'x' * 100)
+    conn.close()
+    conn = http.client.HTTPConnection('127.0.0.1', port, timeout=5)
+    conn.request('POST', '/echo', body=b'x' * 4096)
+    assert conn.getresponse().status == 413
+    conn.close()
+
+
+def test_invalid_content_length(server):
+    """
+    Un Content-Length no numérico, negativo o con dígitos no ASCII se responde con 400
+    """
+    port, _, _ = server
+    for length in (b'abc', b'-5', b'\xb2'):
+        with socket.create_connection(('127.0.0.1', port), timeout=5) as sock:
+            sock.sendall(b'POST /echo HTTP/1.1\r\nHost: localhost\r\nContent-Length: ' + length + b'\r\n\r\n')
+            data = b''
+            while chunk := sock.recv(4096):
+                data += chunk
+        assert data.startswith(b'HTTP/1.1 400')
+
+
+def test_graceful_reload(server):
+    """
+    Con SIGHUP los hijos nuevos vuelven a importar la aplicación y los antiguos terminan
+    """
+    port, pid, app_path = server
+    old_pids = {get(port, '/')[1].split()[1] for _ in range(10)}
+    write_app(app_path, 'version2')
+    os.kill(pid, signal.SIGHUP)
+    deadline = time.monotonic() + 10
+    while time.monotonic() < deadline:
+        status, body = get(port, '/')
+        assert status == 200
+        version, worker = body.decode().split()
+        if version == 'version2':
+            assert worker not in old_pids
+            break
+        time.sleep(0.1)
+    else:
+        pytest.fail('La recarga no ha servido la nueva versión')
+
+
+def test_stop_closes_socket(tmp_path):
+    """
+    Con SIGTERM el padre para a los hijos y termina
+    """
+    app_path = tmp_path / 'serve_app.py'
+    write_app(app_path, 'v1')
+    arbiter = Arbiter(str(app_path), port=0, workers=1, threads=1)
+    port, pid = start(arbiter)
+    assert get(port, '/')[0] == 200
+    assert stop(pid) == 0
+    with pytest.raises(OSError):
+        socket.create_connection(('127.0.0.1', port), timeout=1)